@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+
+import argparse
+import inspect
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from edid import Edid, EdidDescriptor, EdidBatch, EdidReader, EdidCache, \
+    EdidRecordTable, EdidGenerator, EdidTimingGenerator, EdidValidator
+from testEdid import EdidTests
+
+
+# arguments for getters that take any
+GETTER_ARGUMENTS = {
+    'getStandardTimingInformation': (0,),
+    'getDescriptor': (0,),
+    'getExtension': (0,),
+    'getGamutCoverage': ('sRGB',),
+}
+
+SETTER_ARGUMENTS = {
+    'setManufacturerID': ('SAM',),
+    'setManufacturerProductCode': (956,),
+    'setSerialNumber': (12345678,),
+    'setWeekOfManufacture': (15,),
+    'setYearOfManufacture': (2016,),
+    'setMonitorName': ('BENCH',),
+    'setEdidVersion': (1,),
+    'setEdidRevision': (3,),
+    'setVideoInputParametersBitmap': (0x80,),
+    'setMaximumHorizontalImageSize': (60,),
+    'setMaximumVerticalImageSize': (34,),
+    'setDisplayGamma': (2.2,),
+    'setSupportedFeaturesBitmap': (0x0A,),
+    'setChromaticityCoordinatesRed': (0.64, 0.33),
+    'setChromaticityCoordinatesGreen': (0.3, 0.6),
+    'setChromaticityCoordinatesBlue': (0.15, 0.06),
+    'setChromaticityCoordinatesWhite': (0.3125, 0.329),
+    'setEstablishedTimingBitmap': (0x210800,),
+    'setStandardTimingInformation': (0, 1920, 16.0 / 9.0, 60),
+    'setNumberOfExtensions': (1,),
+    'setAutoChecksum': (False,),
+    'setDetailedTiming': (0, EdidTimingGenerator.getCvtTiming(1920, 1080, 60)),
+}
+
+
+def makeCorpus(size):
+    # synthetic corpus: the test samples with distinct serial numbers
+    corpus = []
+    for index in range(0, size):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[
+            index % len(EdidTests.VALID_EDID_DATA)])
+        edid.setSerialNumber(index)
+        edid.calculateChecksum()
+        corpus.append(edid)
+
+    return corpus
+
+
+def getMethodArguments(prefix, arguments):
+    methods = []
+    for name, method in sorted(inspect.getmembers(Edid, inspect.isfunction)):
+        if not name.startswith(prefix):
+            continue
+
+        parameters = list(inspect.signature(method).parameters)[1:]
+        if not parameters:
+            methods.append((name, ()))
+        elif name in arguments:
+            methods.append((name, arguments[name]))
+        else:
+            print('no arguments for {}, skipped'.format(name),
+                  file=sys.stderr)
+
+    return methods
+
+
+def getBenchmarks(corpusSize):
+    corpus = makeCorpus(corpusSize)
+    edid = Edid(data=corpus[0])
+    raw = bytes(corpus[0])
+    dump = b''.join(corpus)
+    baseBlocks = b''.join(bytes(edid[0:Edid.BLOCK_SIZE]) for edid in corpus)
+    edidBatch = EdidBatch(baseBlocks)
+    edidDescriptor = EdidDescriptor(edid, Edid.DESCRIPTOR_OFFSETS[0])
+    edidCache = EdidCache()
+    edidValidator = EdidValidator()
+    edidCache.get(raw)
+    autoChecksumEdid = Edid(data=corpus[0])
+    autoChecksumEdid.setAutoChecksum(True)
+    edidGenerator = EdidGenerator(corpus[0], ('serialNumber',))
+    variants = [(serialNumber,) for serialNumber in range(0, corpusSize)]
+    fleet = {index: edid for index, edid in enumerate(corpus)}
+    changedFleet = dict(fleet)
+    changedFleet[0] = edid
+
+    # (name, function, operations per call)
+    benchmarks = []
+
+    for name, arguments in getMethodArguments('get', GETTER_ARGUMENTS):
+        method = getattr(edid, name)
+        benchmarks.append(
+            ('Edid.' + name, lambda m=method, a=arguments: m(*a), 1))
+
+    for name, arguments in getMethodArguments('set', SETTER_ARGUMENTS):
+        method = getattr(edid, name)
+        benchmarks.append(
+            ('Edid.' + name, lambda m=method, a=arguments: m(*a), 1))
+
+    benchmarks += [
+        ('Edid.__init__(data)', lambda: Edid(data=raw), 1),
+        ('Edid.__init__(version)', lambda: Edid(version=1.3), 1),
+        ('Edid.calculateChecksum', edid.calculateChecksum, 1),
+        ('Edid.checkChecksum', edid.checkChecksum, 1),
+        ('Edid.calculateChecksums', edid.calculateChecksums, 1),
+        ('Edid.checkChecksums', edid.checkChecksums, 1),
+        ('Edid.setSerialNumber(autoChecksum)',
+         lambda: autoChecksumEdid.setSerialNumber(12345678), 1),
+        ('Edid.findInvalidChecksums', lambda: Edid.findInvalidChecksums(
+            dump), len(dump) // Edid.BLOCK_SIZE),
+        ('EdidDescriptor.__getitem__(int)',
+         lambda: edidDescriptor[5], 1),
+        ('EdidDescriptor.__getitem__(slice)',
+         lambda: edidDescriptor[5:13], 1),
+        ('EdidDescriptor.__setitem__(int)',
+         lambda: edidDescriptor.__setitem__(5, 0), 1),
+        ('EdidDescriptor.getBytes', edidDescriptor.getBytes, 1),
+        ('EdidDescriptor.getDetailedTiming',
+         edidDescriptor.getDetailedTiming, 1),
+        ('EdidTimingGenerator.getCvtTiming(cached)',
+         lambda: EdidTimingGenerator.getCvtTiming(1920, 1080, 60), 1),
+        ('EdidTimingGenerator.getCvtTiming(uncached)',
+         lambda: EdidTimingGenerator.getCvtTiming.__wrapped__(
+             1920, 1080, 60), 1),
+        ('EdidBatch.getManufacturerIDs', edidBatch.getManufacturerIDs,
+         corpusSize),
+        ('EdidBatch.getSerialNumbers', edidBatch.getSerialNumbers,
+         corpusSize),
+        ('EdidBatch.getChromaticityCoordinatesReds',
+         edidBatch.getChromaticityCoordinatesReds, corpusSize),
+        ('EdidBatch.getChromaticityArrays',
+         edidBatch.getChromaticityArrays, corpusSize),
+        ('EdidBatch.getGamutCoverages', edidBatch.getGamutCoverages,
+         corpusSize),
+        ('EdidBatch.findInvalidChecksums', edidBatch.findInvalidChecksums,
+         corpusSize),
+        ('EdidValidator.validate',
+         lambda: [edidValidator.validate(data) for data in corpus],
+         corpusSize),
+        ('EdidReader', lambda: list(EdidReader(io.BytesIO(dump))),
+         corpusSize),
+        ('EdidCache.get(hit)', lambda: edidCache.get(raw), 1),
+        ('EdidRecordTable.extend', lambda: EdidRecordTable(corpus),
+         corpusSize),
+        ('Edid.diff', lambda: corpus[0].diff(corpus[1]), 1),
+        ('Edid.diffFleet', lambda: Edid.diffFleet(fleet, changedFleet),
+         corpusSize),
+        ('EdidGenerator.render', lambda: edidGenerator.render(variants),
+         corpusSize),
+    ]
+
+    return benchmarks
+
+
+def measure(function, operations, minTime):
+    # build lazily created tables and caches before timing
+    function()
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(0, number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minTime:
+            break
+        number *= 2
+
+    # peak of memory allocated while running one call
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'opsPerSecond': number * operations / elapsed,
+        'peakBytesPerOp': peak / operations,
+    }
+
+
+def compare(results, baseline):
+    baselineResults = {result['name']: result
+                       for result in baseline['results']}
+    for result in results['results']:
+        old = baselineResults.get(result['name'])
+        if old is None:
+            continue
+        print('{:<50} {:>7.2f}x'.format(
+            result['name'],
+            result['opsPerSecond'] / old['opsPerSecond']), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark EDID parsing and generation.')
+    parser.add_argument(
+        '-f', '--filter', default='',
+        help='only run benchmarks whose name contains FILTER')
+    parser.add_argument(
+        '-t', '--min-time', type=float, default=0.2,
+        help='minimum measuring time per benchmark in seconds')
+    parser.add_argument(
+        '-n', '--corpus-size', type=int, default=1000,
+        help='number of EDIDs in the synthetic corpus')
+    parser.add_argument(
+        '-c', '--compare', metavar='BASELINE',
+        help='print speedups against the JSON output of an earlier run')
+    args = parser.parse_args(argv)
+
+    results = {
+        'python': platform.python_version(),
+        'corpusSize': args.corpus_size,
+        'results': [],
+    }
+    for name, function, operations in getBenchmarks(args.corpus_size):
+        if args.filter not in name:
+            continue
+
+        result = {'name': name}
+        result.update(measure(function, operations, args.min_time))
+        results['results'].append(result)
+
+    json.dump(results, sys.stdout, indent=2, sort_keys=True)
+    print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,455 @@
 #!/usr/bin/env python3
 
+import argparse
+import asyncio
+import array
+import collections
+import concurrent.futures
+import functools
+import glob
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
 import re
+import struct
+import sys
+import threading
+import time
+import weakref
+import zlib
+
+
+class EdidTiming(collections.namedtuple('EdidTiming', (
+        'pixelClock', 'horizontalActive', 'horizontalBlanking',
+        'horizontalSyncOffset', 'horizontalSyncWidth', 'verticalActive',
+        'verticalBlanking', 'verticalSyncOffset', 'verticalSyncWidth',
+        'interlaced', 'horizontalSyncPositive', 'verticalSyncPositive'))):
+    # Video timing with the pixel clock in Hz and all sizes in pixels or
+    # lines (per field for interlaced timings). The sync polarities are None
+    # if the timing does not use separate digital syncs.
+    __slots__ = ()
+
+    def getHorizontalTotal(self):
+        return self.horizontalActive + self.horizontalBlanking
+
+    def getVerticalTotal(self):
+        return self.verticalActive + self.verticalBlanking
+
+    def getHorizontalFrequency(self):
+        # in Hz
+        return self.pixelClock / self.getHorizontalTotal()
+
+    def getRefreshRate(self):
+        # field rate in Hz
+        return self.pixelClock / \
+            (self.getHorizontalTotal() * self.getVerticalTotal())
+
+    def getMode(self):
+        # (width, height, refresh rate in Hz or None without a pixel
+        # clock or totals) as used by EdidModeSet
+        height = self.verticalActive * (2 if self.interlaced else 1)
+        if self.getHorizontalTotal() * self.getVerticalTotal() == 0:
+            return self.horizontalActive, height, None
+
+        return self.horizontalActive, height, int(round(self.getRefreshRate()))
+
+
+class EdidTimingGenerator:
+    # Timings following the VESA Coordinated Video Timings (CVT 1.1, normal
+    # and reduced blanking) and Generalized Timing Formula (GTF, default
+    # parameters) for progressive modes. Results are memoized by their
+    # arguments.
+
+    CELL_GRANULARITY = 8
+    CLOCK_STEP = 250000
+    # GTF/CVT blanking formula parameters C' and M'
+    C_PRIME = 30
+    M_PRIME = 300
+
+    CVT_MIN_VSYNC_BACK_PORCH = 550
+    CVT_MIN_VERTICAL_FRONT_PORCH = 3
+    CVT_MIN_VERTICAL_BACK_PORCH = 6
+    CVT_HORIZONTAL_SYNC_PERCENT = 8
+
+    CVT_RB_MIN_VERTICAL_BLANKING = 460
+    CVT_RB_HORIZONTAL_BLANKING = 160
+    CVT_RB_HORIZONTAL_SYNC = 32
+
+    GTF_MIN_VSYNC_BACK_PORCH = 550
+    GTF_MIN_PORCH = 1
+    GTF_VERTICAL_SYNC = 3
+    GTF_HORIZONTAL_SYNC_PERCENT = 8
+
+    # CVT vertical sync width by aspect ratio
+    CVT_VERTICAL_SYNCS = ((4, 3, 4), (16, 9, 5), (16, 10, 6), (5, 4, 7),
+                          (15, 9, 7))
+    CVT_DEFAULT_VERTICAL_SYNC = 10
+
+    @staticmethod
+    def _round(value):
+        # round half up as the VESA formulas do
+        return int(value + 0.5)
+
+    @classmethod
+    def _getCvtVerticalSync(cls, width, height):
+        for ratioX, ratioY, verticalSync in cls.CVT_VERTICAL_SYNCS:
+            if width == (height * ratioX // ratioY) // \
+                    cls.CELL_GRANULARITY * cls.CELL_GRANULARITY:
+                return verticalSync
+
+        return cls.CVT_DEFAULT_VERTICAL_SYNC
+
+    @classmethod
+    def _checkMode(cls, width, height, refreshRate):
+        if not isinstance(width, int) or not isinstance(height, int) or \
+                not isinstance(refreshRate, (int, float)):
+            raise TypeError
+        if not (width > 0 and height > 0 and refreshRate > 0):
+            raise ValueError
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024, typed=True)
+    def getCvtTiming(width, height, refreshRate):
+        cls = EdidTimingGenerator
+        cls._checkMode(width, height, refreshRate)
+
+        width = width // cls.CELL_GRANULARITY * cls.CELL_GRANULARITY
+        verticalSync = cls._getCvtVerticalSync(width, height)
+
+        # estimated line period in us
+        horizontalPeriod = (1000000.0 / refreshRate -
+                            cls.CVT_MIN_VSYNC_BACK_PORCH) / \
+            (height + cls.CVT_MIN_VERTICAL_FRONT_PORCH)
+        verticalSyncBackPorch = max(
+            int(cls.CVT_MIN_VSYNC_BACK_PORCH / horizontalPeriod) + 1,
+            verticalSync + cls.CVT_MIN_VERTICAL_BACK_PORCH)
+
+        dutyCycle = max(cls.C_PRIME - cls.M_PRIME * horizontalPeriod / 1000,
+                        20)
+        cell = 2 * cls.CELL_GRANULARITY
+        horizontalBlanking = int(
+            width * dutyCycle / (100 - dutyCycle) / cell) * cell
+        horizontalTotal = width + horizontalBlanking
+        horizontalSync = int(horizontalTotal *
+                             cls.CVT_HORIZONTAL_SYNC_PERCENT / 100 /
+                             cls.CELL_GRANULARITY) * cls.CELL_GRANULARITY
+        pixelClock = int(horizontalTotal / horizontalPeriod * 1000000 /
+                         cls.CLOCK_STEP) * cls.CLOCK_STEP
+
+        return EdidTiming(
+            pixelClock, width, horizontalBlanking,
+            horizontalBlanking // 2 - horizontalSync, horizontalSync,
+            height, verticalSyncBackPorch + cls.CVT_MIN_VERTICAL_FRONT_PORCH,
+            cls.CVT_MIN_VERTICAL_FRONT_PORCH, verticalSync,
+            False, False, True)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024, typed=True)
+    def getCvtReducedBlankingTiming(width, height, refreshRate):
+        cls = EdidTimingGenerator
+        cls._checkMode(width, height, refreshRate)
+
+        width = width // cls.CELL_GRANULARITY * cls.CELL_GRANULARITY
+        verticalSync = cls._getCvtVerticalSync(width, height)
+
+        horizontalPeriod = (1000000.0 / refreshRate -
+                            cls.CVT_RB_MIN_VERTICAL_BLANKING) / height
+        verticalBlanking = max(
+            int(cls.CVT_RB_MIN_VERTICAL_BLANKING / horizontalPeriod) + 1,
+            cls.CVT_MIN_VERTICAL_FRONT_PORCH + verticalSync +
+            cls.CVT_MIN_VERTICAL_BACK_PORCH)
+
+        horizontalTotal = width + cls.CVT_RB_HORIZONTAL_BLANKING
+        verticalTotal = height + verticalBlanking
+        pixelClock = int(refreshRate * horizontalTotal * verticalTotal /
+                         cls.CLOCK_STEP) * cls.CLOCK_STEP
+
+        return EdidTiming(
+            pixelClock, width, cls.CVT_RB_HORIZONTAL_BLANKING,
+            cls.CVT_RB_HORIZONTAL_BLANKING // 2 - cls.CVT_RB_HORIZONTAL_SYNC,
+            cls.CVT_RB_HORIZONTAL_SYNC, height, verticalBlanking,
+            cls.CVT_MIN_VERTICAL_FRONT_PORCH, verticalSync,
+            False, True, False)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024, typed=True)
+    def getGtfTiming(width, height, refreshRate):
+        cls = EdidTimingGenerator
+        cls._checkMode(width, height, refreshRate)
+
+        width = cls._round(width / cls.CELL_GRANULARITY) * \
+            cls.CELL_GRANULARITY
+
+        horizontalPeriod = (1000000.0 / refreshRate -
+                            cls.GTF_MIN_VSYNC_BACK_PORCH) / \
+            (height + cls.GTF_MIN_PORCH)
+        verticalSyncBackPorch = cls._round(
+            cls.GTF_MIN_VSYNC_BACK_PORCH / horizontalPeriod)
+        verticalTotal = height + verticalSyncBackPorch + cls.GTF_MIN_PORCH
+        # correct the line period for the actual number of lines
+        horizontalPeriod *= 1000000.0 / horizontalPeriod / verticalTotal / \
+            refreshRate
+
+        dutyCycle = cls.C_PRIME - cls.M_PRIME * horizontalPeriod / 1000
+        cell = 2 * cls.CELL_GRANULARITY
+        horizontalBlanking = cls._round(
+            width * dutyCycle / (100 - dutyCycle) / cell) * cell
+        horizontalTotal = width + horizontalBlanking
+        horizontalSync = cls._round(
+            cls.GTF_HORIZONTAL_SYNC_PERCENT / 100 * horizontalTotal /
+            cls.CELL_GRANULARITY) * cls.CELL_GRANULARITY
+
+        return EdidTiming(
+            cls._round(horizontalTotal / horizontalPeriod * 1000000),
+            width, horizontalBlanking,
+            horizontalBlanking // 2 - horizontalSync, horizontalSync,
+            height, verticalSyncBackPorch + cls.GTF_MIN_PORCH,
+            cls.GTF_MIN_PORCH, cls.GTF_VERTICAL_SYNC,
+            False, False, True)
 
 
 class EdidDescriptor:
     SIZE = 18
 
+    # descriptor tags, DETAILED_TIMING stands for any detailed timing
+    # descriptor, all others are display descriptor tags (byte 3)
+    DETAILED_TIMING = -1
+    SERIAL_STRING = 0xFF
+    UNSPECIFIED_TEXT = 0xFE
+    RANGE_LIMITS = 0xFD
+    MONITOR_NAME = 0xFC
+    COLOR_POINT = 0xFB
+    STANDARD_TIMINGS = 0xFA
+    DUMMY = 0x10
+
+    # The descriptor is a memoryview window over its parent, so reads and
+    # writes go straight to the parent without copying. As long as the
+    # window exists the parent cannot be resized; call release() (or use the
+    # descriptor as a context manager) to drop it early.
+
     def __init__(self, parent, offset):
         self.parent = parent
         self.offset = offset
+        self.view = memoryview(parent)[offset:offset + self.SIZE]
 
-    def __getitem__(self, key):
-        if isinstance(key, int):
-            if key >= 0 and key < self.SIZE:
-                newKey = key + self.offset
-            elif key < 0 and key >= -self.SIZE:
-                newKey = key + self.SIZE + self.offset
-            else:
-                raise IndexError
-
-            return self.parent[newKey]
-        elif isinstance(key, slice):
-            if key.start is None:
-                newStart = self.offset
-            elif key.start >= 0:
-                newStart = min(key.start, self.SIZE) + self.offset
-            elif key.start < 0:
-                newStart = max(0, key.start + self.SIZE) + self.offset
-            else:
-                raise IndexError
-
-            if key.stop is None:
-                newStop = self.offset + self.SIZE
-            elif key.stop >= 0:
-                newStop = min(key.stop, self.SIZE) + self.offset
-            elif key.stop < 0:
-                newStop = max(0, key.stop + self.SIZE) + self.offset
-            else:
-                raise IndexError
+    def __len__(self):
+        return len(self.view)
 
-            return self.parent[slice(newStart, newStop, key.step)]
-        else:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.release()
+
+    def release(self):
+        self.view.release()
+
+    def __getitem__(self, key):
+        if not isinstance(key, (int, slice)):
             raise TypeError
 
+        return self.view[key]
+
     def __setitem__(self, key, value):
-        if isinstance(key, int):
-            if key >= 0 and key < self.SIZE:
-                newKey = key + self.offset
-            elif key < 0 and key >= -self.SIZE:
-                newKey = key + self.SIZE + self.offset
-            else:
-                raise IndexError
+        if not isinstance(key, (int, slice)):
+            raise TypeError
 
-            self.parent[newKey] = value
+        if isinstance(self.parent, Edid):
+            # write through the parent so it can keep its caches current
+            positions = range(self.offset, self.offset + len(self.view))[key]
+            if isinstance(positions, int):
+                self.parent[positions] = value
+            else:
+                if len(value) != len(positions):
+                    raise ValueError
+                self.parent[positions.start:positions.stop:
+                            positions.step] = value
         else:
-            raise TypeError
+            self.view[key] = value
+
+    def getView(self):
+        return self.view
+
+    def getBytes(self):
+        return self.view.tobytes()
 
     def getHeader(self):
         return self[0:2]
 
+    def isDetailedTiming(self):
+        return self[0] != 0 or self[1] != 0
+
+    def getTag(self):
+        if self.isDetailedTiming():
+            return self.DETAILED_TIMING
+
+        return self[3]
+
+    def setDisplayDescriptorTag(self, tag):
+        if not isinstance(tag, int):
+            raise TypeError
+        if not (tag >= 0 and tag <= 0xFF):
+            raise ValueError
+
+        self[0:5] = bytes((0, 0, 0, tag, 0))
+
+    def getText(self):
+        return self[5:18].tobytes().decode(
+            'ascii', 'replace').split('\x0a')[0]
+
+    def setText(self, text):
+        clipped = text + "\x0a             "
+
+        self[5:18] = clipped[:13].encode()
+
+    def isInterlaced(self):
+        return bool(self[17] & 0x80)
+
+    def getDetailedTimingMode(self):
+        # (width, height, refresh rate in Hz) of a detailed timing descriptor
+        return self.getDetailedTiming().getMode()
+
+    def getDetailedTiming(self):
+        pixelClock = (self[0] | (self[1] << 8)) * 10000
+        flags = self[17]
+        if flags & 0x18 == 0x18:
+            horizontalSyncPositive = bool(flags & 0x02)
+            verticalSyncPositive = bool(flags & 0x04)
+        else:
+            horizontalSyncPositive = None
+            verticalSyncPositive = None
+
+        return EdidTiming(
+            pixelClock,
+            self[2] | ((self[4] & 0xF0) << 4),
+            self[3] | ((self[4] & 0x0F) << 8),
+            self[8] | ((self[11] & 0xC0) << 2),
+            self[9] | ((self[11] & 0x30) << 4),
+            self[5] | ((self[7] & 0xF0) << 4),
+            self[6] | ((self[7] & 0x0F) << 8),
+            (self[10] >> 4) | ((self[11] & 0x0C) << 2),
+            (self[10] & 0x0F) | ((self[11] & 0x03) << 4),
+            bool(flags & 0x80), horizontalSyncPositive, verticalSyncPositive)
+
+    def getImageSize(self):
+        # horizontal and vertical image size of a detailed timing in mm
+        return self[12] | ((self[14] & 0xF0) << 4), \
+            self[13] | ((self[14] & 0x0F) << 8)
+
+    def setDetailedTiming(self, timing, horizontalImageSize=0,
+                          verticalImageSize=0):
+        if not isinstance(timing, EdidTiming):
+            raise TypeError
+
+        pixelClock = int(round(timing.pixelClock / 10000))
+        if not (pixelClock > 0 and pixelClock <= 0xFFFF):
+            raise ValueError
+        for value, maximum in (
+                (timing.horizontalActive, 0xFFF),
+                (timing.horizontalBlanking, 0xFFF),
+                (timing.verticalActive, 0xFFF),
+                (timing.verticalBlanking, 0xFFF),
+                (timing.horizontalSyncOffset, 0x3FF),
+                (timing.horizontalSyncWidth, 0x3FF),
+                (timing.verticalSyncOffset, 0x3F),
+                (timing.verticalSyncWidth, 0x3F),
+                (horizontalImageSize, 0xFFF),
+                (verticalImageSize, 0xFFF)):
+            if not (value >= 0 and value <= maximum):
+                raise ValueError
+
+        # digital separate sync
+        flags = 0x18
+        if timing.interlaced:
+            flags |= 0x80
+        if timing.verticalSyncPositive:
+            flags |= 0x04
+        if timing.horizontalSyncPositive:
+            flags |= 0x02
+
+        self[0:18] = bytes((
+            pixelClock & 0xFF, pixelClock >> 8,
+            timing.horizontalActive & 0xFF, timing.horizontalBlanking & 0xFF,
+            ((timing.horizontalActive >> 8) << 4) |
+            (timing.horizontalBlanking >> 8),
+            timing.verticalActive & 0xFF, timing.verticalBlanking & 0xFF,
+            ((timing.verticalActive >> 8) << 4) |
+            (timing.verticalBlanking >> 8),
+            timing.horizontalSyncOffset & 0xFF,
+            timing.horizontalSyncWidth & 0xFF,
+            ((timing.verticalSyncOffset & 0x0F) << 4) |
+            (timing.verticalSyncWidth & 0x0F),
+            ((timing.horizontalSyncOffset >> 8) << 6) |
+            ((timing.horizontalSyncWidth >> 8) << 4) |
+            ((timing.verticalSyncOffset >> 4) << 2) |
+            (timing.verticalSyncWidth >> 4),
+            horizontalImageSize & 0xFF, verticalImageSize & 0xFF,
+            ((horizontalImageSize >> 8) << 4) | (verticalImageSize >> 8),
+            0, 0, flags))
+
+    def getRangeLimits(self):
+        # minimum and maximum vertical rate in Hz, minimum and maximum
+        # horizontal rate in kHz and maximum pixel clock in MHz
+        offsets = self[4]
+        minVerticalRate = self[5] + (255 if offsets & 0x03 == 0x03 else 0)
+        maxVerticalRate = self[6] + (255 if offsets & 0x02 else 0)
+        minHorizontalRate = self[7] + (255 if offsets & 0x0C == 0x0C else 0)
+        maxHorizontalRate = self[8] + (255 if offsets & 0x08 else 0)
+
+        return minVerticalRate, maxVerticalRate, minHorizontalRate, \
+            maxHorizontalRate, self[9] * 10
+
 
 class Edid(bytearray):
     HEADER = bytearray.fromhex('00 FF FF FF FF FF FF 00')
+    BLOCK_SIZE = 128
+    DESCRIPTOR_OFFSETS = (54, 72, 90, 108)
+
+    # base block fields, each readable through the matching get<Field>()
+    FIELDS = (
+        'manufacturerID', 'manufacturerProductCode', 'serialNumber',
+        'weekOfManufacture', 'yearOfManufacture', 'edidVersion',
+        'edidRevision', 'videoInputParametersBitmap',
+        'maximumHorizontalImageSize', 'maximumVerticalImageSize',
+        'displayGamma', 'supportedFeaturesBitmap',
+        'chromaticityCoordinatesRed', 'chromaticityCoordinatesGreen',
+        'chromaticityCoordinatesBlue', 'chromaticityCoordinatesWhite',
+        'establishedTimingBitmap', 'numberOfExtensions')
+
+    # (start, stop, fields) of the base block regions compared by diff(),
+    # the fields of a region are only decoded if its bytes differ
+    DIFF_REGIONS = (
+        (8, 18, ('manufacturerID', 'manufacturerProductCode', 'serialNumber',
+                 'weekOfManufacture', 'yearOfManufacture')),
+        (18, 20, ('edidVersion', 'edidRevision')),
+        (20, 25, ('videoInputParametersBitmap', 'maximumHorizontalImageSize',
+                  'maximumVerticalImageSize', 'displayGamma',
+                  'supportedFeaturesBitmap')),
+        (25, 35, ('chromaticityCoordinatesRed', 'chromaticityCoordinatesGreen',
+                  'chromaticityCoordinatesBlue',
+                  'chromaticityCoordinatesWhite')),
+        (35, 38, ('establishedTimingBitmap',)),
+        (38, 54, ('standardTimingInformations',)),
+        (126, 127, ('numberOfExtensions',)),
+    )
+
+    # (high byte, low bits byte, low bits shift) of the x and y coordinate
+    CHROMATICITY_LAYOUT = {
+        'Red': ((27, 25, 6), (28, 25, 4)),
+        'Green': ((29, 25, 2), (30, 25, 0)),
+        'Blue': ((31, 26, 6), (32, 26, 4)),
+        'White': ((33, 26, 2), (34, 26, 0)),
+    }
 
     def __init__(self, data=None, version=None):
+        # (block bytes, parser) by extension index, a parser is reused as
+        # long as its block still holds the same bytes
+        self._extensions = {}
+        # (descriptor bytes, descriptor index), built on first access
+        self._descriptorIndex = None
+
         if data:
             self[:] = data
             return
@@ -79,20 +465,144 @@ class Edid(bytearray):
         for index in range(0, 8):
             self.setStandardTimingInformation(index, None, None, None)
 
-    def calculateChecksum(self):
-        val = 0
+    def __reduce_ex__(self, protocol):
+        # cached parsers are rebuilt on demand, only the data is kept
+        return Edid, (bytes(self),), \
+            {'autoChecksum': self.getAutoChecksum()}
+
+    def __setstate__(self, state):
+        self.setAutoChecksum(state['autoChecksum'])
+
+    def _getWriteRange(self, key, length):
+        if isinstance(key, int):
+            if key < 0:
+                key += length
+            return key, key + 1
+
+        start, stop, step = key.indices(length)
+        if len(self) != length:
+            # resized, everything from start on has moved
+            return start, max(length, len(self))
+        if step < 0:
+            return stop + 1, start + 1
+
+        return start, stop
+
+    def setAutoChecksum(self, autoChecksum):
+        if not isinstance(autoChecksum, bool):
+            raise TypeError
+
+        if autoChecksum and not self.getAutoChecksum():
+            self.calculateChecksums()
+        # only EDIDs that maintain their checksums route writes through
+        # Python, plain Edids keep the bytearray item assignment
+        self.__class__ = _AutoChecksumEdid if autoChecksum else Edid
+
+    def getAutoChecksum(self):
+        return isinstance(self, _AutoChecksumEdid)
+
+    def _updateChecksums(self, key, old, length):
+        # Adjusts the checksum byte of every block touched by a write by the
+        # change of the byte sum, so the cost only depends on the number of
+        # bytes written. Writes that resize the data, use extended slices or
+        # cover a checksum byte recalculate the touched blocks instead.
+        if isinstance(key, int):
+            pos = key + length if key < 0 else key
+            if pos % self.BLOCK_SIZE == self.BLOCK_SIZE - 1:
+                # the checksum byte itself, restore it
+                self._setChecksum(pos // self.BLOCK_SIZE)
+            else:
+                self._adjustChecksum(pos, self[pos] - old)
+            return
+
+        start, stop = self._getWriteRange(key, length)
+        if len(self) != length or key.indices(length)[2] != 1:
+            lastBlock = min((stop - 1) // self.BLOCK_SIZE,
+                            self.getNumberOfBlocks() - 1)
+            for block in range(start // self.BLOCK_SIZE, lastBlock + 1):
+                self._setChecksum(block)
+            return
+
+        pos = start
+        while pos < stop:
+            checksumPos = (pos // self.BLOCK_SIZE + 1) * self.BLOCK_SIZE - 1
+            end = min(stop, checksumPos + 1)
+            if end > checksumPos:
+                if checksumPos < len(self):
+                    self._setChecksum(pos // self.BLOCK_SIZE)
+            else:
+                self._adjustChecksum(
+                    pos, self._sumBlock(self[pos:end]) -
+                    self._sumBlock(old[pos - start:end - start]))
+            pos = end
+
+    def _adjustChecksum(self, pos, delta):
+        checksumPos = (pos // self.BLOCK_SIZE + 1) * self.BLOCK_SIZE - 1
+        if pos == checksumPos or checksumPos >= len(self):
+            return
+
+        bytearray.__setitem__(
+            self, checksumPos, (self[checksumPos] - delta) & 0xFF)
+
+    def _setChecksum(self, block):
+        offset = block * self.BLOCK_SIZE
+        val = self._sumBlock(self[offset:offset + self.BLOCK_SIZE - 1])
+
+        bytearray.__setitem__(self, offset + self.BLOCK_SIZE - 1, -val & 0xFF)
+
+    @staticmethod
+    def _sumBlock(data):
+        # The lower 16 bits of Adler-32 hold one plus the plain byte sum
+        # modulo 65521, which a single block never reaches. This gives the
+        # exact byte sum without a Python level loop.
+        return (zlib.adler32(data) & 0xFFFF) - 1
+
+    def _getBlockOffset(self, block):
+        if not isinstance(block, int):
+            raise TypeError
+        if not (block >= 0 and block < self.getNumberOfBlocks()):
+            raise IndexError
+
+        return block * self.BLOCK_SIZE
+
+    def getNumberOfBlocks(self):
+        return len(self) // self.BLOCK_SIZE
+
+    def calculateChecksum(self, block=0):
+        self._getBlockOffset(block)
+        self._setChecksum(block)
+
+    def checkChecksum(self, block=0):
+        offset = self._getBlockOffset(block)
+        val = self._sumBlock(self[offset:offset + self.BLOCK_SIZE])
+
+        return val & 0xFF == 0
 
-        for i in self[0:127]:
-            val += i
+    def calculateChecksums(self):
+        for block in range(0, self.getNumberOfBlocks()):
+            self.calculateChecksum(block)
 
-        self[127] = (256 - (val % 256)) % 256
+    def checkChecksums(self):
+        return [self.checkChecksum(block)
+                for block in range(0, self.getNumberOfBlocks())]
 
-    def checkChecksum(self):
-        val = 0
-        for i in self[0:128]:
-            val += i
+    @classmethod
+    def findInvalidChecksums(cls, data):
+        # Validates every block of a buffer holding whole 128-byte blocks.
+        # Returns a bitmap with bit n set if block n has a bad checksum.
+        view = memoryview(data).cast('B')
+        if len(view) % cls.BLOCK_SIZE != 0:
+            raise ValueError
+
+        numberOfBlocks = len(view) // cls.BLOCK_SIZE
+        bitmap = bytearray((numberOfBlocks + 7) // 8)
+        sumBlock = cls._sumBlock
+        for block in range(0, numberOfBlocks):
+            offset = block * cls.BLOCK_SIZE
+            if sumBlock(view[offset:offset + cls.BLOCK_SIZE]) & 0xFF:
+                bitmap[block >> 3] |= 1 << (block & 0x07)
 
-        return val % 256 == 0
+        return int.from_bytes(bitmap, byteorder='little')
 
     # Header information (0-19)
 
@@ -102,29 +612,76 @@ class Edid(bytearray):
     def initHeader(self):
         self[0:8] = self.HEADER
 
+    # lazily built (decode list, encode dict) for all 15-bit IDs
+    _manufacturerIDTables = None
+
+    # lazily loaded PNP ID to vendor name mapping
+    _manufacturerNames = None
+
+    @classmethod
+    def _getManufacturerIDTables(cls):
+        if cls._manufacturerIDTables is None:
+            letters = [chr(value + 64) for value in range(0, 32)]
+            decodeTable = [first + second + third
+                           for first in letters
+                           for second in letters
+                           for third in letters]
+            encodeTable = {manufacturerID: raw
+                           for raw, manufacturerID in enumerate(decodeTable)}
+            cls._manufacturerIDTables = (decodeTable, encodeTable)
+
+        return cls._manufacturerIDTables
+
     def setManufacturerID(self, manufacturerID):
         if not isinstance(manufacturerID, str):
-            return TypeError
-        if not re.match('^[A-Z]{3}$', manufacturerID):
-            return ValueError
-
-        raw = (
-            (ord(
-                manufacturerID[0]) -
-                64) << 10) | (
-            (ord(
-                manufacturerID[1]) -
-                64) << 5) | (
-                    (ord(
-                        manufacturerID[2]) -
-                     64) << 0)
-
-        self[8:10] = (raw.to_bytes(2, byteorder='big'))
+            raise TypeError
+        raw = self._getManufacturerIDTables()[1].get(manufacturerID)
+        # only A-Z are valid letters, '@' and '[' to '_' are not
+        if raw is None or not manufacturerID.isalpha():
+            raise ValueError
+
+        self[8:10] = raw.to_bytes(2, byteorder='big')
+
+    @classmethod
+    def _encodeManufacturerID(cls, manufacturerID):
+        return cls._getManufacturerIDTables()[1][manufacturerID]
+
+    @classmethod
+    def _decodeManufacturerID(cls, raw):
+        return cls._getManufacturerIDTables()[0][raw & 0x7FFF]
 
     def getManufacturerID(self):
-        raw = int.from_bytes(self[8:10], byteorder='big')
-        return chr(((raw >> 10) & 0x1F) + 64) + \
-            chr(((raw >> 5) & 0x1F) + 64) + chr(((raw >> 0) & 0x1F) + 64)
+        return self._getManufacturerIDTables()[0][
+            ((self[8] << 8) | self[9]) & 0x7FFF]
+
+    @classmethod
+    def loadManufacturerNames(cls, filename=None):
+        # hwdata pnp.ids format: three letter ID, tab, vendor name
+        if filename is None:
+            filename = os.path.join(os.path.dirname(
+                os.path.abspath(__file__)), 'pnp.ids')
+
+        manufacturerNames = {}
+        with open(filename, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                manufacturerID, _, name = line.partition('\t')
+                manufacturerNames[manufacturerID.strip()] = name.strip()
+
+        cls._manufacturerNames = manufacturerNames
+        return manufacturerNames
+
+    @classmethod
+    def getManufacturerNames(cls):
+        if cls._manufacturerNames is None:
+            cls.loadManufacturerNames()
+
+        return cls._manufacturerNames
+
+    def getManufacturerName(self):
+        return self.getManufacturerNames().get(self.getManufacturerID())
 
     def setManufacturerProductCode(self, manufacturerProductCode):
         if not isinstance(manufacturerProductCode, int):
@@ -174,14 +731,6 @@ class Edid(bytearray):
     def getYearOfManufacture(self):
         return 1990 + self[17]
 
-    def setMonitorName(self, monitorName):
-        clipped = monitorName + "\x0a             "
-
-        self[113:126] = clipped[:13].encode()
-
-    def getMonitorName(self):
-        return self[113:126].decode().split('\x0a')[0]
-
     def setEdidVersion(self, edidVersion):
         if not isinstance(edidVersion, int):
             raise TypeError
@@ -206,9 +755,13 @@ class Edid(bytearray):
     def getEdidRevision(self):
         return self[19]
 
+    @staticmethod
+    def _decodeVersion(edidVersion, edidRevision):
+        return float(edidVersion) + float(edidRevision) / 10.0
+
     def getVersion(self):
-        return float(self.getEdidVersion()) + \
-            float(self.getEdidRevision()) / 10.0
+        return self._decodeVersion(
+            self.getEdidVersion(), self.getEdidRevision())
 
     # Basic display parameters (20-24)
 
@@ -257,8 +810,12 @@ class Edid(bytearray):
 
         self[23] = int((displayGamma * 100) - 100)
 
+    @staticmethod
+    def _decodeDisplayGamma(raw):
+        return (float(raw) + 100.0) / 100.0
+
     def getDisplayGamma(self):
-        return (float(self[23]) + 100.0) / 100.0
+        return self._decodeDisplayGamma(self[23])
 
     def setSupportedFeaturesBitmap(self, supportedFeaturesBitmap):
         if not isinstance(supportedFeaturesBitmap, int):
@@ -274,93 +831,67 @@ class Edid(bytearray):
 
     # Chromaticity coordinates (25-34)
 
-    def setChromaticityCoordinatesRed(
-            self, X, Y):
+    # decoded coordinate for every 10 bit raw value
+    _CHROMATICITY_TABLE = tuple(
+        round(raw / 1024.0, 3) for raw in range(0, 1024))
+
+    def _setChromaticityCoordinates(self, color, X, Y):
         if ((not isinstance(X, float)) or (not isinstance(Y, float))):
-            return TypeError
+            raise TypeError
 
         if ((not (X >= 0 and X <= 1.0)) or (not (Y >= 0 and Y <= 1.0))):
             raise ValueError
 
-        Xint = int(round(X * 1024, 0))
-        Yint = int(round(Y * 1024, 0))
-
-        self[25] = (((Xint & 0x03) | (Yint & 0x03)) << 4) | (self[25] & 0x0F)
+        for (high, low, shift), value in zip(
+                self.CHROMATICITY_LAYOUT[color], (X, Y)):
+            raw = min(int(round(value * 1024, 0)), 0x3FF)
+            self[low] = (self[low] & ~(0x03 << shift)) | \
+                ((raw & 0x03) << shift)
+            self[high] = raw >> 2
 
-        self[27] = Xint >> 2
-        self[28] = Yint >> 2
+    def setChromaticityCoordinatesRed(
+            self, X, Y):
+        self._setChromaticityCoordinates('Red', X, Y)
 
     def setChromaticityCoordinatesGreen(
             self, X, Y):
-        if ((not isinstance(X, float)) or (not isinstance(Y, float))):
-            return TypeError
-
-        if ((not (X >= 0 and X <= 1.0)) or (not (Y >= 0 and Y <= 1.0))):
-            raise ValueError
-
-        Xint = int(round(X * 1024, 0))
-        Yint = int(round(Y * 1024, 0))
-
-        self[25] = (((Xint & 0x03) | (Yint & 0x03)) << 0) | (self[25] & 0xF0)
-
-        self[29] = Xint >> 2
-        self[30] = Yint >> 2
+        self._setChromaticityCoordinates('Green', X, Y)
 
     def setChromaticityCoordinatesBlue(
             self, X, Y):
-        if ((not isinstance(X, float)) or (not isinstance(Y, float))):
-            return TypeError
-
-        if ((not (X >= 0 and X <= 1.0)) or (not (Y >= 0 and Y <= 1.0))):
-            raise ValueError
-
-        Xint = int(round(X * 1024, 0))
-        Yint = int(round(Y * 1024, 0))
-
-        self[26] = (((Xint & 0x03) | (Yint & 0x03)) << 4) | (self[25] & 0x0F)
-
-        self[31] = Xint >> 2
-        self[32] = Yint >> 2
+        self._setChromaticityCoordinates('Blue', X, Y)
 
     def setChromaticityCoordinatesWhite(
             self, X, Y):
-        if ((not isinstance(X, float)) or (not isinstance(Y, float))):
-            return TypeError
+        self._setChromaticityCoordinates('White', X, Y)
 
-        if ((not (X >= 0 and X <= 1.0)) or (not (Y >= 0 and Y <= 1.0))):
-            raise ValueError
-
-        Xint = int(round(X * 1024, 0))
-        Yint = int(round(Y * 1024, 0))
+    @classmethod
+    def _decodeChromaticity(cls, high, low):
+        return cls._CHROMATICITY_TABLE[(high << 2) | (low & 0x03)]
 
-        self[26] = (((Xint & 0x03) | (Yint & 0x03)) << 0) | (self[25] & 0xF0)
-
-        self[33] = Xint >> 2
-        self[34] = Yint >> 2
+    def _getChromaticityCoordinates(self, color):
+        return tuple(
+            self._decodeChromaticity(self[high], self[low] >> shift)
+            for high, low, shift in self.CHROMATICITY_LAYOUT[color])
 
     def getChromaticityCoordinatesRed(self):
-        X = round(((self[27] << 2) | ((self[25] >> 6) & 0x03)) / 1024.0, 3)
-        Y = round(((self[28] << 2) | ((self[25] >> 4) & 0x03)) / 1024.0, 3)
-
-        return X, Y
+        return self._getChromaticityCoordinates('Red')
 
     def getChromaticityCoordinatesGreen(self):
-        X = round(((self[29] << 2) | ((self[25] >> 2) & 0x03)) / 1024.0, 3)
-        Y = round(((self[30] << 2) | ((self[25] >> 0) & 0x03)) / 1024.0, 3)
-
-        return X, Y
+        return self._getChromaticityCoordinates('Green')
 
     def getChromaticityCoordinatesBlue(self):
-        X = round(((self[31] << 2) | ((self[26] >> 6) & 0x03)) / 1024.0, 3)
-        Y = round(((self[32] << 2) | ((self[26] >> 4) & 0x03)) / 1024.0, 3)
-
-        return X, Y
+        return self._getChromaticityCoordinates('Blue')
 
     def getChromaticityCoordinatesWhite(self):
-        X = round(((self[33] << 2) | ((self[26] >> 2) & 0x03)) / 1024.0, 3)
-        Y = round(((self[34] << 2) | ((self[26] >> 0) & 0x03)) / 1024.0, 3)
+        return self._getChromaticityCoordinates('White')
 
-        return X, Y
+    def getGamutCoverage(self, gamut='sRGB'):
+        # share of the reference gamut covered by the primaries
+        return EdidGamut.getCoverage(
+            (self.getChromaticityCoordinatesRed(),
+             self.getChromaticityCoordinatesGreen(),
+             self.getChromaticityCoordinatesBlue()), gamut)
 
     # Established timing bitmap. Supported bitmap for (formerly) very common
     # timing modes (35-37)
@@ -379,81 +910,182 @@ class Edid(bytearray):
 
     # Standard timing information (38-53)
 
+    # aspect ratios by the upper two bits of the second byte, before and
+    # since EDID 1.3
+    STANDARD_TIMING_RATIOS = {
+        False: (1.0, 4.0 / 3.0, 5.0 / 4.0, 16.0 / 9.0),
+        True: (16.0 / 10.0, 4.0 / 3.0, 5.0 / 4.0, 16.0 / 9.0),
+    }
+    STANDARD_TIMING_UNUSED = 0x0101
+
+    # (decode table, encode dict) per version family, built on first use
+    _standardTimingTables = {}
+
+    @classmethod
+    def _getStandardTimingTables(cls, version13):
+        tables = cls._standardTimingTables.get(version13)
+        if tables is None:
+            ratios = cls.STANDARD_TIMING_RATIOS[version13]
+            decodeTable = [None] * 0x10000
+            encodeTable = {}
+            for high in range(0, 0x100):
+                resolutionX = 8 * (31 + high)
+                for low in range(0, 0x100):
+                    code = (high << 8) | low
+                    entry = (resolutionX, ratios[low >> 6], 60 + (low & 0x3F))
+                    decodeTable[code] = entry
+                    if high > 0:
+                        encodeTable[entry] = code
+
+            decodeTable[cls.STANDARD_TIMING_UNUSED] = (None, None, None)
+
+            tables = decodeTable, encodeTable
+            cls._standardTimingTables[version13] = tables
+
+        return tables
+
+    def _isVersion13(self):
+        # same as getVersion() >= 1.3 without the float arithmetic
+        return self[18] * 10 + self[19] >= 13
+
     def setStandardTimingInformation(
             self, index, resolutionX, ratio, verticalFrequency):
+        if not (index >= 0 and index < 8):
+            raise IndexError
+
         if (resolutionX is None) and (ratio is None) and (
                 verticalFrequency is None):
-            self[38 + 2 * index + 0] = 1
-            self[38 + 2 * index + 1] = 1
-            return
-
-        if not isinstance(resolutionX, int):
-            raise TypeError
-        if not isinstance(ratio, float):
-            raise TypeError
-        if not isinstance(verticalFrequency, int):
-            raise TypeError
+            code = self.STANDARD_TIMING_UNUSED
+        else:
+            if not isinstance(resolutionX, int):
+                raise TypeError
+            if not isinstance(ratio, float):
+                raise TypeError
+            if not isinstance(verticalFrequency, int):
+                raise TypeError
+
+            encodeTable = self._getStandardTimingTables(
+                self._isVersion13())[1]
+            code = encodeTable.get((resolutionX, ratio, verticalFrequency))
+            if code is None:
+                raise ValueError
 
-        if not (resolutionX >= 256
-                and resolutionX <= 2288 and resolutionX % 8 == 0):
-            raise ValueError
-        if not (verticalFrequency >=
-                60 and verticalFrequency <= 123):
-            raise ValueError
+        self[38 + 2 * index:40 + 2 * index] = code.to_bytes(2, byteorder='big')
 
-        self[38 + 2 * index + 0] = (resolutionX >> 3) - 31
+    def getStandardTimingInformation(self, index):
+        if not (index >= 0 and index < 8):
+            raise IndexError
+
+        code = (self[38 + 2 * index] << 8) | self[38 + 2 * index + 1]
+        return self._getStandardTimingTables(self._isVersion13())[0][code]
+
+    def getStandardTimingInformations(self):
+        decodeTable = self._getStandardTimingTables(self._isVersion13())[0]
+        return [decodeTable[code]
+                for code in struct.unpack_from('>8H', self, 38)]
+
+    # Descriptors (54-125)
+
+    def getDescriptor(self, index):
+        return EdidDescriptor(self, self.DESCRIPTOR_OFFSETS[index])
+
+    def getDescriptors(self):
+        return [EdidDescriptor(self, offset)
+                for offset in self.DESCRIPTOR_OFFSETS]
+
+    def getDescriptorIndex(self):
+        # descriptor tag -> list of slots with that tag, classified only
+        # once until the descriptor bytes change
+        descriptors = self[self.DESCRIPTOR_OFFSETS[0]:
+                           self.DESCRIPTOR_OFFSETS[-1] + EdidDescriptor.SIZE]
+        if self._descriptorIndex is None or \
+                self._descriptorIndex[0] != descriptors:
+            descriptorIndex = {}
+            for index, offset in enumerate(self.DESCRIPTOR_OFFSETS):
+                if self[offset] != 0 or self[offset + 1] != 0:
+                    tag = EdidDescriptor.DETAILED_TIMING
+                else:
+                    tag = self[offset + 3]
+                descriptorIndex.setdefault(tag, []).append(index)
+
+            self._descriptorIndex = (bytes(descriptors), descriptorIndex)
+
+        return self._descriptorIndex[1]
+
+    def getDescriptorTags(self):
+        tags = [None] * len(self.DESCRIPTOR_OFFSETS)
+        for tag, indices in self.getDescriptorIndex().items():
+            for index in indices:
+                tags[index] = tag
+
+        return tags
+
+    def findDescriptor(self, tag):
+        indices = self.getDescriptorIndex().get(tag)
+        if not indices:
+            return None
+
+        return self.getDescriptor(indices[0])
+
+    def setDetailedTiming(self, index, timing):
+        # the image size is taken from the base block, which has it in cm
+        with self.getDescriptor(index) as descriptor:
+            descriptor.setDetailedTiming(timing, self[21] * 10, self[22] * 10)
+
+    def getDetailedTimings(self):
+        timings = []
+        for index in self.getDescriptorIndex().get(
+                EdidDescriptor.DETAILED_TIMING, []):
+            with self.getDescriptor(index) as descriptor:
+                timings.append(descriptor.getDetailedTiming())
+
+        return timings
+
+    def _findFreeDescriptor(self):
+        # last slot that holds a dummy descriptor or nothing at all
+        descriptorIndex = self.getDescriptorIndex()
+        for index in reversed(range(0, len(self.DESCRIPTOR_OFFSETS))):
+            offset = self.DESCRIPTOR_OFFSETS[index]
+            if index in descriptorIndex.get(EdidDescriptor.DUMMY, ()) or \
+                    not any(self[offset:offset + EdidDescriptor.SIZE]):
+                return self.getDescriptor(index)
+
+        return None
 
-        if (ratio == 1.0):
-            if (self.getVersion() < 1.3):
-                self[38 + 2 * index + 1] = 0
-            else:
-                raise ValueError
-        elif (ratio == 16.0 / 10.0):
-            if (self.getVersion() >= 1.3):
-                self[38 + 2 * index + 1] = 0
-            else:
+    def setMonitorName(self, monitorName):
+        descriptor = self.findDescriptor(EdidDescriptor.MONITOR_NAME)
+        if descriptor is None:
+            descriptor = self._findFreeDescriptor()
+            if descriptor is None:
                 raise ValueError
-        elif (ratio == 4.0 / 3.0):
-            self[38 + 2 * index + 1] = 1 << 6
-        elif (ratio == 5.0 / 4.0):
-            self[38 + 2 * index + 1] = 2 << 6
-        elif (ratio == 16.0 / 9.0):
-            self[38 + 2 * index + 1] = 3 << 6
-
-        self[
-            38 +
-            2 *
-            index +
-            1] = self[
-            38 +
-            2 *
-            index +
-            1] | (
-            verticalFrequency -
-            60)
+            descriptor.setDisplayDescriptorTag(EdidDescriptor.MONITOR_NAME)
 
-    def getStandardTimingInformation(self, index):
-        # check for invalid entry
-        if (self[38 + 2 * index + 0] == 1) and (self[38 + 2 * index + 1] == 1):
-            return None, None, None
-
-        resolutionX = 8 * (31 + self[38 + 2 * index + 0])
-        ratioRaw = self[38 + 2 * index + 1] >> 6
-        if (ratioRaw == 0) and (self.getVersion() < 1.3):
-            ratio = 1.0
-        elif (ratioRaw == 0):
-            ratio = 16.0 / 10.0
-        elif (ratioRaw == 1):
-            ratio = 4.0 / 3.0
-        elif (ratioRaw == 2):
-            ratio = 5.0 / 4.0
-        elif (ratioRaw == 3):
-            ratio = 16.0 / 9.0
-        else:
-            ratio = None
-        verticalFrequency = 60 + (self[38 + 2 * index + 1] & 0x3F)
+        with descriptor:
+            descriptor.setText(monitorName)
+
+    def getMonitorName(self):
+        descriptor = self.findDescriptor(EdidDescriptor.MONITOR_NAME)
+        if descriptor is None:
+            return None
+
+        with descriptor:
+            return descriptor.getText()
+
+    def getSerialString(self):
+        descriptor = self.findDescriptor(EdidDescriptor.SERIAL_STRING)
+        if descriptor is None:
+            return None
+
+        with descriptor:
+            return descriptor.getText()
+
+    def getRangeLimits(self):
+        descriptor = self.findDescriptor(EdidDescriptor.RANGE_LIMITS)
+        if descriptor is None:
+            return None
 
-        return resolutionX, ratio, verticalFrequency
+        with descriptor:
+            return descriptor.getRangeLimits()
 
     def setNumberOfExtensions(self, numberOfExtensions):
         if not isinstance(numberOfExtensions, int):
@@ -468,42 +1100,2479 @@ class Edid(bytearray):
     def getNumberOfExtensions(self):
         return self[126]
 
+    def getFields(self):
+        return {field: getattr(self, 'get' + field[0].upper() + field[1:])()
+                for field in self.FIELDS}
+
+    # Extension blocks (128-)
+
+    def getExtension(self, index):
+        if not (index >= 0 and index < self.getNumberOfExtensions()):
+            raise IndexError
+        offset = self._getBlockOffset(index + 1)
+
+        block = self[offset:offset + self.BLOCK_SIZE]
+        cached = self._extensions.get(index)
+        if cached is not None and cached[0] == block:
+            return cached[1]
+
+        extension = EdidExtension.create(self, index + 1)
+        self._extensions[index] = (bytes(block), extension)
+
+        return extension
+
+    def getExtensions(self):
+        numberOfExtensions = min(
+            self.getNumberOfExtensions(), self.getNumberOfBlocks() - 1)
+        return [self.getExtension(index)
+                for index in range(0, numberOfExtensions)]
+
+    # Differences
+
+    def _getDescriptorValue(self, index):
+        # (tag, decoded content) of a descriptor slot
+        with self.getDescriptor(index) as descriptor:
+            tag = descriptor.getTag()
+            if tag == EdidDescriptor.DETAILED_TIMING:
+                value = descriptor.getDetailedTimingMode()
+            elif tag in (EdidDescriptor.SERIAL_STRING,
+                         EdidDescriptor.UNSPECIFIED_TEXT,
+                         EdidDescriptor.MONITOR_NAME):
+                value = descriptor.getText()
+            elif tag == EdidDescriptor.RANGE_LIMITS:
+                value = descriptor.getRangeLimits()
+            else:
+                value = descriptor[5:18].tobytes()
+
+        return tag, value
+
+    def diff(self, other):
+        # field -> (value in self, value in other) for all fields that
+        # differ; regions with equal bytes are skipped without decoding
+        if not isinstance(other, Edid):
+            raise TypeError
+
+        differences = collections.OrderedDict()
+
+        for start, stop, fields in self.DIFF_REGIONS:
+            if self[start:stop] == other[start:stop]:
+                continue
+
+            for field in fields:
+                getter = 'get' + field[0].upper() + field[1:]
+                value = getattr(self, getter)()
+                otherValue = getattr(other, getter)()
+                if value != otherValue:
+                    differences[field] = (value, otherValue)
+
+        for index, offset in enumerate(self.DESCRIPTOR_OFFSETS):
+            stop = offset + EdidDescriptor.SIZE
+            if self[offset:stop] == other[offset:stop]:
+                continue
+
+            value = self._getDescriptorValue(index)
+            otherValue = other._getDescriptorValue(index)
+            if value != otherValue:
+                differences['descriptor{}'.format(index)] = \
+                    (value, otherValue)
+
+        # extension blocks are decoded by their parsers and compared field
+        # by field; a missing block or one of another type is reported as
+        # a whole with its decoded fields or None
+        for block in range(1, max(self.getNumberOfBlocks(),
+                                  other.getNumberOfBlocks())):
+            start = block * self.BLOCK_SIZE
+            stop = start + self.BLOCK_SIZE
+            if self[start:stop] == other[start:stop]:
+                continue
+
+            values = self._getExtensionValues(block)
+            otherValues = other._getExtensionValues(block)
+            name = 'extension{}'.format(block - 1)
+            if values is None or otherValues is None or \
+                    list(values) != list(otherValues):
+                differences[name] = (values, otherValues)
+                continue
+
+            found = False
+            for field, value in values.items():
+                if value != otherValues[field]:
+                    differences[name + '.' + field] = \
+                        (value, otherValues[field])
+                    found = True
+            # a change in a part the parser does not decode
+            if not found:
+                differences[name + '.bytes'] = \
+                    (bytes(self[start:stop]), bytes(other[start:stop]))
+
+        return differences
+
+    def _getExtensionValues(self, block):
+        if block >= self.getNumberOfBlocks():
+            return None
+
+        if block - 1 < self.getNumberOfExtensions():
+            extension = self.getExtension(block - 1)
+        else:
+            extension = EdidExtension.create(self, block)
+
+        return extension.getDiffValues()
+
+    @classmethod
+    def diffFleet(cls, previous, current):
+        # previous and current map a key (e.g. a connector) to an EDID
+        # (Edid or bytes); unchanged EDIDs are skipped by comparing their
+        # bytes, the others are only parsed to be diffed
+        added = [key for key in current if key not in previous]
+        removed = [key for key in previous if key not in current]
+        changed = collections.OrderedDict()
+
+        for key, data in current.items():
+            previousData = previous.get(key)
+            if previousData is None or previousData == data:
+                continue
+
+            if not isinstance(previousData, Edid):
+                previousData = cls(data=previousData)
+            if not isinstance(data, Edid):
+                data = cls(data=data)
+
+            changed[key] = previousData.diff(data)
+
+        return {'added': added, 'removed': removed, 'changed': changed}
+
     def writeToFile(self, filename):
         with open(filename, 'wb') as f:
             f.write(self)
 
 
-def main():
-    print(round(0.5, 0))
+class _AutoChecksumEdid(Edid):
+    # Edid with setAutoChecksum(True): every write also updates the
+    # checksums of the blocks it touches.
+
+    def __setitem__(self, key, value):
+        length = len(self)
+        old = bytearray.__getitem__(self, key)
+        bytearray.__setitem__(self, key, value)
+        self._updateChecksums(key, old, length)
+
+
+class EdidExtension:
+    # Parser of one extension block of an Edid or any other buffer. An Edid
+    # caches its parsers, so they only hold a weak reference to it (no
+    # reference cycle); parent raises ReferenceError once the Edid is gone.
+    TAG = None
+
+    # fields compared by Edid.diff()
+    DIFF_FIELDS = ('tag', 'revision', 'bytes')
+
+    def __init__(self, parent, block):
+        if isinstance(parent, Edid):
+            self._parent = weakref.ref(parent)
+        else:
+            self._parent = parent
+        self.block = block
+        self.offset = block * Edid.BLOCK_SIZE
+
+    @property
+    def parent(self):
+        if not isinstance(self._parent, weakref.ref):
+            return self._parent
+
+        parent = self._parent()
+        if parent is None:
+            raise ReferenceError
+
+        return parent
+
+    @staticmethod
+    def create(parent, block):
+        tag = parent[block * Edid.BLOCK_SIZE]
+        for extensionType in EdidExtension.__subclasses__():
+            if extensionType.TAG == tag:
+                return extensionType(parent, block)
+
+        return EdidExtension(parent, block)
+
+    def getTag(self):
+        return self.parent[self.offset]
+
+    def getRevision(self):
+        return self.parent[self.offset + 1]
+
+    def getBytes(self):
+        return bytes(self.parent[self.offset:self.offset + Edid.BLOCK_SIZE])
+
+    def getDiffValues(self):
+        values = collections.OrderedDict()
+        for field in self.DIFF_FIELDS:
+            values[field] = getattr(
+                self, 'get' + field[0].upper() + field[1:])()
+
+        return values
+
+
+class EdidCeaExtension(EdidExtension):
+    TAG = 0x02
+
+    # data block tags
+    AUDIO = 0x01
+    VIDEO = 0x02
+    VENDOR_SPECIFIC = 0x03
+    SPEAKER_ALLOCATION = 0x04
+    VESA_DISPLAY_TRANSFER_CHARACTERISTIC = 0x05
+    EXTENDED = 0x07
+
+    # extended data block tags
+    VIDEO_CAPABILITY = 0x00
+    VENDOR_SPECIFIC_VIDEO = 0x01
+    COLORIMETRY = 0x05
+    HDR_STATIC_METADATA = 0x06
+    HDR_DYNAMIC_METADATA = 0x07
+
+    AUDIO_SAMPLE_RATES = (32000, 44100, 48000, 88200, 96000, 176400, 192000)
+
+    DIFF_FIELDS = ('tag', 'revision', 'supportBitmap',
+                   'numberOfNativeDetailedTimings', 'dataBlockTags',
+                   'videoDataBlock', 'audioDataBlock',
+                   'speakerAllocationDataBlock', 'vendorSpecificDataBlocks',
+                   'hdrStaticMetadataDataBlock', 'detailedTimingModes')
+    AUDIO_BIT_DEPTHS = (16, 20, 24)
+
+    def __init__(self, parent, block):
+        super().__init__(parent, block)
+        # (tag, extended tag, payload offset, payload length) per data block,
+        # built on first access
+        self._index = None
+
+    def getDetailedTimingOffset(self):
+        return self.parent[self.offset + 2]
+
+    def getSupportBitmap(self):
+        return self.parent[self.offset + 3] & 0xF0
+
+    def getNumberOfNativeDetailedTimings(self):
+        return self.parent[self.offset + 3] & 0x0F
+
+    def _getIndex(self):
+        if self._index is not None:
+            return self._index
+
+        index = []
+        detailedTimingOffset = self.getDetailedTimingOffset()
+        if detailedTimingOffset > 4:
+            pos = self.offset + 4
+            end = self.offset + min(detailedTimingOffset,
+                                    Edid.BLOCK_SIZE - 1)
+            while pos < end:
+                tag = self.parent[pos] >> 5
+                length = self.parent[pos] & 0x1F
+                payload = pos + 1
+                pos = payload + length
+                if pos > end:
+                    break
+
+                extendedTag = None
+                if tag == self.EXTENDED and length > 0:
+                    extendedTag = self.parent[payload]
+                    payload += 1
+                    length -= 1
+
+                index.append((tag, extendedTag, payload, length))
+
+        self._index = index
+        return index
+
+    def getDetailedTimingDescriptors(self):
+        detailedTimingDescriptors = []
+        detailedTimingOffset = self.getDetailedTimingOffset()
+        if detailedTimingOffset >= 4:
+            pos = self.offset + detailedTimingOffset
+            end = self.offset + Edid.BLOCK_SIZE - 1
+            while pos + EdidDescriptor.SIZE <= end:
+                descriptor = EdidDescriptor(self.parent, pos)
+                if not descriptor.isDetailedTiming():
+                    descriptor.release()
+                    break
+                detailedTimingDescriptors.append(descriptor)
+                pos += EdidDescriptor.SIZE
+
+        return detailedTimingDescriptors
+
+    def getDetailedTimingModes(self):
+        modes = []
+        for descriptor in self.getDetailedTimingDescriptors():
+            with descriptor:
+                modes.append(descriptor.getDetailedTimingMode())
+
+        return modes
+
+    def getDataBlockTags(self):
+        return [(tag, extendedTag)
+                for tag, extendedTag, _, _ in self._getIndex()]
+
+    def getDataBlocks(self, tag, extendedTag=None):
+        return [bytes(self.parent[payload:payload + length])
+                for blockTag, blockExtendedTag, payload, length
+                in self._getIndex()
+                if blockTag == tag and blockExtendedTag == extendedTag]
+
+    def getDataBlock(self, tag, extendedTag=None):
+        dataBlocks = self.getDataBlocks(tag, extendedTag)
+        return dataBlocks[0] if dataBlocks else None
+
+    def getVideoDataBlock(self):
+        # list of (VIC, native) for all short video descriptors
+        videoDescriptors = []
+        for dataBlock in self.getDataBlocks(self.VIDEO):
+            for raw in dataBlock:
+                if raw >= 129 and raw <= 192:
+                    videoDescriptors.append((raw & 0x7F, True))
+                else:
+                    videoDescriptors.append((raw, False))
+
+        return videoDescriptors
+
+    def getAudioDataBlock(self):
+        # list of (format, channels, sample rates, bit depths or maximum
+        # bit rate in kbit/s) for all short audio descriptors
+        audioDescriptors = []
+        for dataBlock in self.getDataBlocks(self.AUDIO):
+            for pos in range(0, len(dataBlock) - 2, 3):
+                audioFormat = (dataBlock[pos] >> 3) & 0x0F
+                channels = (dataBlock[pos] & 0x07) + 1
+                sampleRates = [
+                    sampleRate for bit, sampleRate
+                    in enumerate(self.AUDIO_SAMPLE_RATES)
+                    if dataBlock[pos + 1] & (1 << bit)]
+                if audioFormat == 1:
+                    detail = [bitDepth for bit, bitDepth
+                              in enumerate(self.AUDIO_BIT_DEPTHS)
+                              if dataBlock[pos + 2] & (1 << bit)]
+                elif audioFormat >= 2 and audioFormat <= 8:
+                    detail = dataBlock[pos + 2] * 8
+                else:
+                    detail = dataBlock[pos + 2]
+
+                audioDescriptors.append(
+                    (audioFormat, channels, sampleRates, detail))
+
+        return audioDescriptors
+
+    def getSpeakerAllocationDataBlock(self):
+        dataBlock = self.getDataBlock(self.SPEAKER_ALLOCATION)
+        if dataBlock is None:
+            return None
+
+        return int.from_bytes(dataBlock[0:3], byteorder='little')
+
+    def getVendorSpecificDataBlocks(self):
+        # list of (IEEE OUI, payload)
+        return [(int.from_bytes(dataBlock[0:3], byteorder='little'),
+                 dataBlock[3:])
+                for dataBlock in self.getDataBlocks(self.VENDOR_SPECIFIC)]
+
+    def getHdrStaticMetadataDataBlock(self):
+        # (EOTF bitmap, static metadata descriptor bitmap, maximum luminance,
+        # maximum frame-average luminance, minimum luminance), luminance
+        # values in cd/m^2 or None if not given
+        dataBlock = self.getDataBlock(self.EXTENDED, self.HDR_STATIC_METADATA)
+        if dataBlock is None or len(dataBlock) < 2:
+            return None
+
+        maxLuminance = None
+        maxFrameAverageLuminance = None
+        minLuminance = None
+        if len(dataBlock) > 2:
+            maxLuminance = 50.0 * 2.0 ** (dataBlock[2] / 32.0)
+        if len(dataBlock) > 3:
+            maxFrameAverageLuminance = 50.0 * 2.0 ** (dataBlock[3] / 32.0)
+        if len(dataBlock) > 4 and maxLuminance is not None:
+            minLuminance = maxLuminance * \
+                (dataBlock[4] / 255.0) ** 2 / 100.0
+
+        return dataBlock[0], dataBlock[1], maxLuminance, \
+            maxFrameAverageLuminance, minLuminance
+
+
+class EdidDisplayIdExtension(EdidExtension):
+    # DisplayID section in an extension block: version, payload length,
+    # product type and extension count, followed by data blocks of a tag,
+    # a revision and a payload length byte, and the section checksum.
+    TAG = 0x70
+
+    SECTION_HEADER_SIZE = 5
+
+    # data block tags, DisplayID 1.x and 2.0
+    DISPLAY_PARAMETERS = 0x01
+    TYPE_I_TIMING = 0x03
+    TILED_DISPLAY_TOPOLOGY = 0x12
+    DISPLAY_PARAMETERS_2 = 0x21
+    TYPE_VII_TIMING = 0x22
+    TILED_DISPLAY_TOPOLOGY_2 = 0x28
+    CONTAINER_ID = 0x29
+
+    TIMING_SIZE = 20
+
+    DIFF_FIELDS = ('tag', 'revision', 'displayIdVersion', 'productType',
+                   'dataBlockTags', 'timings', 'tiledDisplayTopology',
+                   'displayParameters')
+
+    def __init__(self, parent, block):
+        super().__init__(parent, block)
+        # (tag, revision, payload offset, payload length) per data block,
+        # built on first access
+        self._index = None
+
+    def getDisplayIdVersion(self):
+        version = self.parent[self.offset + 1]
+        return version >> 4, version & 0x0F
+
+    def getSectionLength(self):
+        return self.parent[self.offset + 2]
+
+    def getProductType(self):
+        return self.parent[self.offset + 3]
+
+    def _getSectionEnd(self):
+        # offset of the section checksum, clipped to the block
+        return self.offset + min(
+            self.SECTION_HEADER_SIZE + self.getSectionLength(),
+            Edid.BLOCK_SIZE - 2)
+
+    def checkSectionChecksum(self):
+        if self.SECTION_HEADER_SIZE + self.getSectionLength() > \
+                Edid.BLOCK_SIZE - 2:
+            return False
+
+        return Edid._sumBlock(
+            self.parent[self.offset + 1:self._getSectionEnd() + 1]) \
+            & 0xFF == 0
+
+    def calculateSectionChecksum(self):
+        end = self._getSectionEnd()
+        self.parent[end] = -Edid._sumBlock(
+            self.parent[self.offset + 1:end]) & 0xFF
+
+    def _getIndex(self):
+        if self._index is not None:
+            return self._index
+
+        index = []
+        pos = self.offset + self.SECTION_HEADER_SIZE
+        end = self._getSectionEnd()
+        while pos + 3 <= end:
+            tag = self.parent[pos]
+            revision = self.parent[pos + 1]
+            length = self.parent[pos + 2]
+            payload = pos + 3
+            pos = payload + length
+            # zero bytes are padding up to the end of the section
+            if pos > end or (tag == 0 and length == 0):
+                break
+
+            index.append((tag, revision, payload, length))
+
+        self._index = index
+        return index
+
+    def getDataBlockTags(self):
+        return [tag for tag, _, _, _ in self._getIndex()]
+
+    def getDataBlocks(self, tag):
+        return [bytes(self.parent[payload:payload + length])
+                for blockTag, _, payload, length in self._getIndex()
+                if blockTag == tag]
+
+    def getDataBlock(self, tag):
+        dataBlocks = self.getDataBlocks(tag)
+        return dataBlocks[0] if dataBlocks else None
+
+    def getTimings(self):
+        # (pixel clock in Hz, horizontal active, blanking, front porch, sync
+        # width, vertical active, blanking, front porch, sync width,
+        # preferred, interlaced) of all type I and type VII timings
+        timings = []
+        for tag, pixelClockUnit in ((self.TYPE_I_TIMING, 10000),
+                                    (self.TYPE_VII_TIMING, 1000)):
+            for dataBlock in self.getDataBlocks(tag):
+                for pos in range(0, len(dataBlock) - self.TIMING_SIZE + 1,
+                                 self.TIMING_SIZE):
+                    values = struct.unpack_from('<8H', dataBlock, pos + 4)
+                    pixelClock = (int.from_bytes(
+                        dataBlock[pos:pos + 3], byteorder='little') + 1) * \
+                        pixelClockUnit
+                    flags = dataBlock[pos + 3]
+                    # each value is stored minus one, the front porches
+                    # carry the sync polarity in their top bit
+                    timings.append(
+                        (pixelClock,) +
+                        tuple((value & 0x7FFF) + 1 for value in values) +
+                        (bool(flags & 0x80), bool(flags & 0x10)))
+
+        return timings
+
+    def getTimingModes(self):
+        # (width, height, refresh rate in Hz) of all timings
+        modes = []
+        for timing in self.getTimings():
+            totalPixels = (timing[1] + timing[2]) * (timing[5] + timing[6])
+            modes.append((timing[1], timing[5],
+                          int(round(timing[0] / totalPixels))))
+
+        return modes
+
+    def getTiledDisplayTopology(self):
+        # (horizontal tiles, vertical tiles, horizontal tile location,
+        # vertical tile location, tile width, tile height) or None
+        dataBlock = self.getDataBlock(self.TILED_DISPLAY_TOPOLOGY)
+        if dataBlock is None:
+            dataBlock = self.getDataBlock(self.TILED_DISPLAY_TOPOLOGY_2)
+        if dataBlock is None or len(dataBlock) < 8:
+            return None
+
+        highBits = dataBlock[3]
+        horizontalTiles = ((dataBlock[1] >> 4) | (highBits >> 6 << 4)) + 1
+        verticalTiles = ((dataBlock[1] & 0x0F) |
+                         ((highBits >> 4) & 0x03) << 4) + 1
+        horizontalLocation = (dataBlock[2] >> 4) | \
+            ((highBits >> 2) & 0x03) << 4
+        verticalLocation = (dataBlock[2] & 0x0F) | (highBits & 0x03) << 4
+        tileWidth, tileHeight = struct.unpack_from('<2H', dataBlock, 4)
+
+        return horizontalTiles, verticalTiles, horizontalLocation, \
+            verticalLocation, tileWidth + 1, tileHeight + 1
+
+    def getDisplayParameters(self):
+        # (horizontal and vertical image size in mm, horizontal and vertical
+        # pixel count, gamma or None) of the first DisplayID 1.x or 2.0
+        # display parameters block, or None
+        for tag, revision, payload, length in self._getIndex():
+            if tag == self.DISPLAY_PARAMETERS and length >= 10:
+                gammaOffset = 9
+                imageSizeDivisor = 10
+            elif tag == self.DISPLAY_PARAMETERS_2 and length >= 29:
+                gammaOffset = 28
+                # bit 7 of the revision selects 1 mm instead of 0.1 mm steps
+                imageSizeDivisor = 1 if revision & 0x80 else 10
+            else:
+                continue
+
+            horizontalImageSize, verticalImageSize, horizontalPixels, \
+                verticalPixels = struct.unpack_from('<4H', self.parent,
+                                                    payload)
+            gamma = self.parent[payload + gammaOffset]
+            gamma = None if gamma == 0xFF else (gamma + 100) / 100
+
+            return horizontalImageSize / imageSizeDivisor, \
+                verticalImageSize / imageSizeDivisor, \
+                horizontalPixels, verticalPixels, gamma
+
+        return None
+
+
+EdidViolation = collections.namedtuple(
+    'EdidViolation', ('rule', 'block', 'offset', 'message'))
+
+
+class EdidValidator:
+    # Conformance checks compiled once into a flat plan of (rule, scope,
+    # check) entries. The scope selects the blocks a check runs on: None for
+    # the whole EDID, 'base' for the base block, 'block' for every block or
+    # an extension tag. Checks get the raw data and the block offset and
+    # return (offset, message) pairs. validate() returns EdidViolation
+    # records, block is None for rules on the whole EDID; with failFast it
+    # stops at the first violating rule.
+
+    # rule: (scope, check method)
+    RULES = collections.OrderedDict([
+        ('length', (None, '_checkLength')),
+        ('header', ('base', '_checkHeader')),
+        ('checksum', ('block', '_checkChecksum')),
+        ('numberOfExtensions', (None, '_checkNumberOfExtensions')),
+        ('manufacturerID', ('base', '_checkManufacturerID')),
+        ('weekOfManufacture', ('base', '_checkWeekOfManufacture')),
+        ('edidVersion', ('base', '_checkEdidVersion')),
+        ('edidRevision', ('base', '_checkEdidRevision')),
+        ('reservedBits', ('base', '_checkReservedBits')),
+        ('descriptorOrder', ('base', '_checkDescriptorOrder')),
+        ('requiredDescriptors', ('base', '_checkRequiredDescriptors')),
+        ('rangeLimits', ('base', '_checkRangeLimits')),
+        ('standardTimingAspectRatio',
+         ('base', '_checkStandardTimingAspectRatio')),
+        ('ceaDetailedTimingOffset',
+         (EdidCeaExtension.TAG, '_checkCeaDetailedTimingOffset')),
+        ('displayIdChecksum',
+         (EdidDisplayIdExtension.TAG, '_checkDisplayIdChecksum')),
+    ])
+
+    _default = None
+
+    def __init__(self, rules=None, failFast=False):
+        if rules is None:
+            rules = self.RULES.keys()
+        elif not set(rules) <= set(self.RULES):
+            raise ValueError
+
+        self.failFast = failFast
+        self._plan = tuple(
+            (rule, self.RULES[rule][0], getattr(self, self.RULES[rule][1]))
+            for rule in self.RULES if rule in rules)
+
+    @classmethod
+    def getDefault(cls):
+        if cls._default is None:
+            cls._default = cls()
+
+        return cls._default
+
+    def validate(self, data):
+        blockSize = Edid.BLOCK_SIZE
+        if len(data) < blockSize or len(data) % blockSize != 0:
+            # nothing else can be checked
+            return [EdidViolation('length', None, None,
+                                  'length is not a multiple of 128')]
+
+        numberOfBlocks = len(data) // blockSize
+        violations = []
+        for rule, scope, check in self._plan:
+            if scope is None:
+                blocks = (None,)
+            elif scope == 'base':
+                blocks = (0,)
+            elif scope == 'block':
+                blocks = range(0, numberOfBlocks)
+            else:
+                blocks = [block for block in range(1, numberOfBlocks)
+                          if data[block * blockSize] == scope]
+
+            for block in blocks:
+                offset = 0 if block is None else block * blockSize
+                for violationOffset, message in check(data, offset):
+                    violations.append(EdidViolation(
+                        rule, block, violationOffset, message))
+
+            if violations and self.failFast:
+                break
+
+        return violations
+
+    def isValid(self, data):
+        return not self.validate(data)
+
+    # rules on the whole EDID
+
+    @staticmethod
+    def _checkLength(data, offset):
+        # validate() returns early on bad lengths
+        return ()
+
+    @staticmethod
+    def _checkNumberOfExtensions(data, offset):
+        numberOfBlocks = len(data) // Edid.BLOCK_SIZE
+        if data[126] != numberOfBlocks - 1:
+            return ((126, '{} extensions announced, {} present'.format(
+                data[126], numberOfBlocks - 1)),)
+        return ()
+
+    @staticmethod
+    def _checkChecksum(data, offset):
+        if Edid._sumBlock(data[offset:offset + Edid.BLOCK_SIZE]) & 0xFF:
+            return ((offset + 127, 'checksum mismatch'),)
+        return ()
+
+    # base block rules
+
+    @staticmethod
+    def _checkHeader(data, offset):
+        if data[0:8] != Edid.HEADER:
+            return ((0, 'invalid header'),)
+        return ()
+
+    @staticmethod
+    def _checkManufacturerID(data, offset):
+        raw = (data[8] << 8) | data[9]
+        if raw & 0x8000 or not Edid._decodeManufacturerID(raw).isalpha():
+            return ((8, 'manufacturer ID is not three letters A-Z'),)
+        return ()
+
+    @staticmethod
+    def _checkWeekOfManufacture(data, offset):
+        if not (data[16] <= 54 or data[16] == 0xFF):
+            return ((16, 'week of manufacture {}'.format(data[16])),)
+        return ()
+
+    @staticmethod
+    def _checkEdidVersion(data, offset):
+        if data[18] != 1:
+            return ((18, 'EDID version {}'.format(data[18])),)
+        return ()
+
+    @staticmethod
+    def _checkEdidRevision(data, offset):
+        if data[19] > 4:
+            return ((19, 'EDID revision {}'.format(data[19])),)
+        return ()
+
+    @staticmethod
+    def _checkReservedBits(data, offset):
+        violations = []
+        revision = data[19]
+
+        videoInput = data[20]
+        if videoInput & 0x80:
+            if revision < 4 and videoInput & 0x7E:
+                violations.append(
+                    (20, 'reserved digital video input bits set'))
+            elif revision >= 4 and ((videoInput >> 4) & 0x07 == 0x07 or
+                                    videoInput & 0x0F > 5):
+                violations.append(
+                    (20, 'reserved color depth or interface'))
+
+        for descriptorOffset in Edid.DESCRIPTOR_OFFSETS:
+            if data[descriptorOffset] or data[descriptorOffset + 1]:
+                continue
+            # range limit offsets exist since 1.4
+            if data[descriptorOffset + 2] or (
+                    data[descriptorOffset + 4] and not (
+                        revision >= 4 and data[descriptorOffset + 3] ==
+                        EdidDescriptor.RANGE_LIMITS)):
+                violations.append((descriptorOffset,
+                                   'reserved display descriptor bytes set'))
+
+        return violations
+
+    @staticmethod
+    def _getDescriptorTags(data):
+        return [EdidDescriptor.DETAILED_TIMING
+                if data[offset] or data[offset + 1] else data[offset + 3]
+                for offset in Edid.DESCRIPTOR_OFFSETS]
+
+    @classmethod
+    def _checkDescriptorOrder(cls, data, offset):
+        violations = []
+        tags = cls._getDescriptorTags(data)
+
+        # 1.4 allows the preferred timing to be given in an extension
+        if data[19] == 3 and tags[0] != EdidDescriptor.DETAILED_TIMING:
+            violations.append((Edid.DESCRIPTOR_OFFSETS[0],
+                               'first descriptor is not the preferred '
+                               'detailed timing'))
+
+        displayDescriptor = False
+        for index, tag in enumerate(tags):
+            if tag != EdidDescriptor.DETAILED_TIMING:
+                displayDescriptor = True
+            elif displayDescriptor:
+                violations.append((Edid.DESCRIPTOR_OFFSETS[index],
+                                   'detailed timing after a display '
+                                   'descriptor'))
+
+        return violations
+
+    @classmethod
+    def _checkRequiredDescriptors(cls, data, offset):
+        if data[19] != 3:
+            return ()
+
+        violations = []
+        tags = cls._getDescriptorTags(data)
+        for tag, name in ((EdidDescriptor.MONITOR_NAME, 'monitor name'),
+                          (EdidDescriptor.RANGE_LIMITS, 'range limits')):
+            if tag not in tags:
+                violations.append((54, '{} descriptor missing'.format(name)))
+
+        return violations
+
+    @classmethod
+    def _checkRangeLimits(cls, data, offset):
+        tags = cls._getDescriptorTags(data)
+        if EdidDescriptor.RANGE_LIMITS not in tags:
+            return ()
+
+        rangeOffset = Edid.DESCRIPTOR_OFFSETS[
+            tags.index(EdidDescriptor.RANGE_LIMITS)]
+        with EdidDescriptor(data, rangeOffset) as descriptor:
+            minVerticalRate, maxVerticalRate, minHorizontalRate, \
+                maxHorizontalRate, maxPixelClock = descriptor.getRangeLimits()
+
+        violations = []
+        if minVerticalRate > maxVerticalRate:
+            violations.append((rangeOffset + 5, 'vertical rate range empty'))
+        if minHorizontalRate > maxHorizontalRate:
+            violations.append(
+                (rangeOffset + 7, 'horizontal rate range empty'))
+        if maxPixelClock == 0:
+            violations.append((rangeOffset + 9, 'maximum pixel clock zero'))
+
+        # the detailed timings must lie within the limits, rates are given
+        # in whole Hz and kHz
+        for index, tag in enumerate(tags):
+            if tag != EdidDescriptor.DETAILED_TIMING:
+                continue
+            timingOffset = Edid.DESCRIPTOR_OFFSETS[index]
+            with EdidDescriptor(data, timingOffset) as descriptor:
+                timing = descriptor.getDetailedTiming()
+            if timing.getHorizontalTotal() == 0 or \
+                    timing.getVerticalTotal() == 0:
+                continue
+            if not (minVerticalRate - 1 <= timing.getRefreshRate() <=
+                    maxVerticalRate + 1) or \
+                    not (minHorizontalRate - 1 <=
+                         timing.getHorizontalFrequency() / 1000 <=
+                         maxHorizontalRate + 1) or \
+                    timing.pixelClock > maxPixelClock * 1000000:
+                violations.append(
+                    (timingOffset, 'detailed timing outside range limits'))
+
+        return violations
+
+    @staticmethod
+    def _checkStandardTimingAspectRatio(data, offset):
+        # before 1.3 the aspect ratio bits 00 mean 1:1, a value almost only
+        # seen when a 16:10 mode was encoded the 1.3 way
+        if data[19] >= 3:
+            return ()
+
+        return [(pos, '1:1 aspect ratio before EDID 1.3')
+                for pos in range(38, 54, 2)
+                if (data[pos] != 0x01 or data[pos + 1] != 0x01) and
+                data[pos] != 0x00 and data[pos + 1] & 0xC0 == 0x00]
+
+    # extension block rules
+
+    @staticmethod
+    def _checkCeaDetailedTimingOffset(data, offset):
+        detailedTimingOffset = data[offset + 2]
+        if detailedTimingOffset != 0 and not (
+                4 <= detailedTimingOffset <= Edid.BLOCK_SIZE - 1):
+            return ((offset + 2, 'detailed timing offset {}'.format(
+                detailedTimingOffset)),)
+        return ()
+
+    @staticmethod
+    def _checkDisplayIdChecksum(data, offset):
+        extension = EdidDisplayIdExtension(data, offset // Edid.BLOCK_SIZE)
+        if not extension.checkSectionChecksum():
+            return ((offset + 2, 'DisplayID section checksum mismatch'),)
+        return ()
+
+
+class EdidReader:
+    # Streams Edid objects (base block plus the announced extension blocks)
+    # out of a file of concatenated raw EDIDs. The file is read in chunks of
+    # chunkSize bytes, so memory use does not depend on the file size.
+    # Anything that does not frame as a record is skipped up to the next
+    # header.
+
+    def __init__(self, file, chunkSize=65536, checkChecksums=True):
+        if not isinstance(chunkSize, int):
+            raise TypeError
+        if not (chunkSize > 0):
+            raise ValueError
+
+        self.file = file
+        self.chunkSize = chunkSize
+        self.checkChecksums = checkChecksums
+        self.numberOfSkippedBytes = 0
+
+    def __iter__(self):
+        if hasattr(self.file, 'read'):
+            yield from self._read(self.file)
+        else:
+            with open(self.file, 'rb') as f:
+                yield from self._read(f)
+
+    def _fill(self, f, buffer):
+        data = f.read(self.chunkSize)
+        buffer += data
+        return len(data) > 0
+
+    def _read(self, f):
+        buffer = bytearray()
+        pos = 0
+        eof = False
+
+        while True:
+            start = buffer.find(Edid.HEADER, pos)
+
+            if start < 0:
+                # keep what could be the beginning of a header
+                keep = max(pos, len(buffer) - len(Edid.HEADER) + 1)
+                self.numberOfSkippedBytes += keep - pos
+                del buffer[:keep]
+                pos = 0
+
+                if eof:
+                    self.numberOfSkippedBytes += len(buffer)
+                    return
+
+                eof = not self._fill(f, buffer)
+                continue
+
+            self.numberOfSkippedBytes += start - pos
+            pos = start
+
+            available = len(buffer) - start
+            if available < Edid.BLOCK_SIZE:
+                length = Edid.BLOCK_SIZE
+            else:
+                length = Edid.BLOCK_SIZE * (1 + buffer[start + 126])
+
+            if available < length:
+                if not eof:
+                    eof = not self._fill(f, buffer)
+                    continue
+
+                # truncated record, look for another header inside it
+                self.numberOfSkippedBytes += 1
+                pos = start + 1
+                continue
+
+            # a truncated dump announces extensions that are really the
+            # base block of the next EDID, continue from that header
+            nextHeader = None
+            for offset in range(start + Edid.BLOCK_SIZE, start + length,
+                                Edid.BLOCK_SIZE):
+                if buffer[offset:offset + len(Edid.HEADER)] == Edid.HEADER:
+                    nextHeader = offset
+                    break
+            if nextHeader is not None:
+                self.numberOfSkippedBytes += nextHeader - start
+                pos = nextHeader
+                continue
+
+            record = buffer[start:start + length]
+            if self.checkChecksums and Edid.findInvalidChecksums(record):
+                self.numberOfSkippedBytes += 1
+                pos = start + 1
+                continue
+
+            yield Edid(data=record)
+
+            pos = start + length
+            if pos >= self.chunkSize:
+                del buffer[:pos]
+                pos = 0
+
+
+class EdidCorpus:
+    # Packed on-disk collection of EDIDs. The data file holds the raw EDIDs
+    # back to back (so EdidReader can read it as well), the index file
+    # (filename + INDEX_SUFFIX) holds a header of INDEX_MAGIC and the inode
+    # and size of the data file it describes, followed by one
+    # (offset, length) entry per record. Both files are memory-mapped and
+    # records are found by number without reading anything else.
+
+    INDEX_MAGIC = b'EDIDIDX2'
+    INDEX_SUFFIX = '.idx'
+    OPEN_RETRIES = 10
+    _INDEX_HEADER = struct.Struct('<8sQQ')
+    _INDEX_ENTRY = struct.Struct('<QI')
+
+    def __init__(self, filename):
+        self.filename = filename
+
+        # a writer replaces the data file before the index, an index that
+        # does not describe the mapped data file is from before a write
+        # that is still in progress and is mapped again
+        for attempt in range(0, self.OPEN_RETRIES):
+            self.closed = False
+            self._indexMap, _ = self._map(filename + self.INDEX_SUFFIX)
+            self._dataMap, dataStat = self._map(filename)
+            self._index = memoryview(self._indexMap)
+            self._data = memoryview(self._dataMap)
+
+            if len(self._index) < self._INDEX_HEADER.size or \
+                    (len(self._index) - self._INDEX_HEADER.size) % \
+                    self._INDEX_ENTRY.size != 0:
+                self.close()
+                raise ValueError
+            magic, inode, size = self._INDEX_HEADER.unpack_from(self._index)
+            if magic != self.INDEX_MAGIC:
+                self.close()
+                raise ValueError
+
+            if inode == dataStat.st_ino and size == dataStat.st_size:
+                return
+
+            self.close()
+            time.sleep(0.01)
+
+        raise ValueError
+
+    @staticmethod
+    def _map(filename):
+        with open(filename, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size == 0:
+                return b'', stat
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), stat
+
+    @classmethod
+    def write(cls, filename, edids):
+        # returns the number of EDIDs written
+        return EdidWriter(fsync=False).writeCorpus(filename, edids)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+
+        for view, mapping in ((self._data, self._dataMap),
+                              (self._index, self._indexMap)):
+            view.release()
+            if isinstance(mapping, mmap.mmap):
+                # views returned by getRaw() keep the mapping alive, it is
+                # unmapped once the last of them is released
+                try:
+                    mapping.close()
+                except BufferError:
+                    pass
+        self._dataMap = None
+        self._indexMap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+    def __len__(self):
+        return (len(self._index) - self._INDEX_HEADER.size) // \
+            self._INDEX_ENTRY.size
+
+    def __iter__(self):
+        for index in range(0, len(self)):
+            yield self[index]
+
+    def getRaw(self, index):
+        # read-only view directly over the mapped data, it stays valid
+        # after close() until it is released
+        if not isinstance(index, int):
+            raise TypeError
+        if index < 0:
+            index += len(self)
+        if not (index >= 0 and index < len(self)):
+            raise IndexError
+
+        offset, length = self._INDEX_ENTRY.unpack_from(
+            self._index, self._INDEX_HEADER.size + index *
+            self._INDEX_ENTRY.size)
+        return self._data[offset:offset + length]
+
+    def __getitem__(self, index):
+        return Edid(data=self.getRaw(index))
+
+
+class EdidWriter:
+    # Writes many EDIDs in one go, either into an EdidCorpus (the records
+    # of batchSize EDIDs are joined and written with a single call) or as
+    # one file per EDID below a directory using a pool of jobs threads.
+    # Every file is written under a temporary name, optionally fsynced and
+    # then renamed, so readers never see a partially written file. count,
+    # size and seconds describe the last write.
+
+    TEMPORARY_SUFFIX = '.tmp'
+
+    def __init__(self, batchSize=4096, jobs=8, fsync=True):
+        if not isinstance(batchSize, int) or not isinstance(jobs, int):
+            raise TypeError
+        if not (batchSize > 0 and jobs > 0):
+            raise ValueError
+
+        self.batchSize = batchSize
+        self.jobs = jobs
+        self.fsync = fsync
+        self.count = 0
+        self.size = 0
+        self.seconds = 0.0
+
+    def getThroughput(self):
+        # (EDIDs per second, bytes per second) of the last write
+        if not self.seconds:
+            return 0.0, 0.0
+
+        return self.count / self.seconds, self.size / self.seconds
+
+    def _finish(self, f, filename):
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+        f.close()
+        os.replace(filename + self.TEMPORARY_SUFFIX, filename)
+
+    def writeCorpus(self, filename, edids):
+        # returns the number of EDIDs written
+        def getBatches():
+            batch = []
+            for edid in edids:
+                batch.append(edid)
+                if len(batch) == self.batchSize:
+                    yield b''.join(batch), [len(edid) for edid in batch]
+                    batch = []
+
+            yield b''.join(batch), [len(edid) for edid in batch]
+
+        return self._writeCorpusBatches(filename, getBatches())
+
+    def _writeCorpusBatches(self, filename, batches):
+        # batches holds (joined records, record lengths) pairs, each is
+        # written with a single call
+        start = time.perf_counter()
+        count = 0
+        offset = 0
+
+        indexFilename = filename + EdidCorpus.INDEX_SUFFIX
+        dataFile = open(filename + self.TEMPORARY_SUFFIX, 'wb')
+        indexFile = open(indexFilename + self.TEMPORARY_SUFFIX, 'wb')
+        try:
+            indexFile.write(bytes(EdidCorpus._INDEX_HEADER.size))
+            for records, lengths in batches:
+                dataFile.write(records)
+                entries = []
+                for length in lengths:
+                    entries.append(
+                        EdidCorpus._INDEX_ENTRY.pack(offset, length))
+                    offset += length
+                indexFile.write(b''.join(entries))
+                count += len(lengths)
+
+            # the header ties the index to this data file, the inode stays
+            # the same when it is renamed
+            indexFile.seek(0)
+            indexFile.write(EdidCorpus._INDEX_HEADER.pack(
+                EdidCorpus.INDEX_MAGIC, os.fstat(dataFile.fileno()).st_ino,
+                offset))
+
+            # the index goes last, it makes the new records visible
+            self._finish(dataFile, filename)
+            self._finish(indexFile, indexFilename)
+        except BaseException:
+            for f, temporaryFilename in (
+                    (dataFile, filename + self.TEMPORARY_SUFFIX),
+                    (indexFile, indexFilename + self.TEMPORARY_SUFFIX)):
+                f.close()
+                if os.path.exists(temporaryFilename):
+                    os.remove(temporaryFilename)
+            raise
+
+        self.count = count
+        self.size = offset
+        self.seconds = time.perf_counter() - start
+        return count
+
+    def _writeFile(self, item):
+        filename, edid = item
+        f = open(filename + self.TEMPORARY_SUFFIX, 'wb')
+        try:
+            f.write(edid)
+            self._finish(f, filename)
+        except BaseException:
+            f.close()
+            os.remove(filename + self.TEMPORARY_SUFFIX)
+            raise
+
+        return len(edid)
+
+    def writeFiles(self, directory, edids, pathFormat='{index:06d}.bin'):
+        # pathFormat is formatted with index (the position of the EDID) and
+        # edid, or called with both, and gives the path below directory;
+        # returns the number of EDIDs written
+        start = time.perf_counter()
+        count = 0
+        size = 0
+        directories = set()
+
+        def getItems(batch):
+            items = []
+            for index, edid in batch:
+                if callable(pathFormat):
+                    path = pathFormat(index, edid)
+                else:
+                    path = pathFormat.format(index=index, edid=edid)
+                filename = os.path.join(directory, path)
+
+                parent = os.path.dirname(filename)
+                if parent not in directories:
+                    os.makedirs(parent, exist_ok=True)
+                    directories.add(parent)
+
+                items.append((filename, edid))
+
+            return items
+
+        with concurrent.futures.ThreadPoolExecutor(self.jobs) as executor:
+            batch = []
+            for item in enumerate(edids):
+                batch.append(item)
+                if len(batch) == self.batchSize:
+                    size += sum(executor.map(self._writeFile,
+                                             getItems(batch)))
+                    count += len(batch)
+                    batch = []
+
+            size += sum(executor.map(self._writeFile, getItems(batch)))
+            count += len(batch)
+
+        self.count = count
+        self.size = size
+        self.seconds = time.perf_counter() - start
+        return count
+
+
+class EdidCache:
+    # Content-addressed cache of decoded results. The raw EDID bytes are the
+    # key, so byte-identical EDIDs are decoded only once. decoder is called
+    # with an Edid on a miss; its results are shared between callers and
+    # must not be modified. The least recently used entry is evicted once
+    # more than maxSize entries are stored.
+
+    # all live caches, reported by EdidInstrumentation
+    _instances = weakref.WeakSet()
+    _numberOfInstances = 0
+
+    def __init__(self, maxSize=4096, decoder=None, name=None):
+        if not isinstance(maxSize, int):
+            raise TypeError
+        if not (maxSize > 0):
+            raise ValueError
+
+        if name is None:
+            name = 'cache{}'.format(EdidCache._numberOfInstances)
+        EdidCache._numberOfInstances += 1
+        EdidCache._instances.add(self)
+
+        self.name = name
+        self.maxSize = maxSize
+        self.decoder = decoder if decoder is not None else Edid.getFields
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, data):
+        return bytes(data) in self._entries
+
+    def get(self, data):
+        key = bytes(data)
+        entries = self._entries
+
+        if key in entries:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+
+        self.misses += 1
+        edid = data if isinstance(data, Edid) else Edid(data=key)
+        value = self.decoder(edid)
+        entries[key] = value
+        if len(entries) > self.maxSize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+        return value
+
+    def getHitRate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+class EdidInstrumentation:
+    # Optional call counts and cumulative times of the getters and setters
+    # and the per-block checksum methods, plus the hit rates of all live
+    # EdidCaches. enable() replaces the methods with timing wrappers and
+    # disable() puts the originals back, so nothing is added to the calls
+    # while instrumentation is off.
+
+    CLASSES = (Edid, EdidDescriptor, EdidExtension, EdidCeaExtension,
+               EdidDisplayIdExtension)
+    PREFIXES = ('get', 'set')
+    METHODS = ('calculateChecksum', 'checkChecksum', 'calculateChecksums',
+               'checkChecksums')
+
+    # (class, method name) -> original function while enabled
+    _originals = {}
+    # 'Class.method' -> [number of calls, seconds]
+    _calls = {}
+
+    @classmethod
+    def _wrap(cls, name, method):
+        calls = cls._calls
+        perfCounter = time.perf_counter
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = perfCounter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perfCounter() - start
+                stats = calls.get(name)
+                if stats is None:
+                    stats = calls[name] = [0, 0.0]
+                stats[0] += 1
+                stats[1] += elapsed
+
+        return wrapper
+
+    @classmethod
+    def enable(cls):
+        if cls._originals:
+            return
+
+        for instrumentedClass in cls.CLASSES:
+            for name, method in list(vars(instrumentedClass).items()):
+                if not callable(method) or isinstance(
+                        method, (type, staticmethod, classmethod)):
+                    continue
+                if not (name.startswith(cls.PREFIXES)
+                        or name in cls.METHODS):
+                    continue
+
+                cls._originals[(instrumentedClass, name)] = method
+                setattr(instrumentedClass, name, cls._wrap(
+                    instrumentedClass.__name__ + '.' + name, method))
+
+    @classmethod
+    def disable(cls):
+        for (instrumentedClass, name), method in cls._originals.items():
+            setattr(instrumentedClass, name, method)
+        cls._originals.clear()
+
+    @classmethod
+    def isEnabled(cls):
+        return bool(cls._originals)
+
+    @classmethod
+    def reset(cls):
+        cls._calls.clear()
+        for cache in list(EdidCache._instances):
+            cache.hits = 0
+            cache.misses = 0
+            cache.evictions = 0
+
+    @classmethod
+    def getSnapshot(cls):
+        calls = {name: {'count': count, 'seconds': seconds}
+                 for name, (count, seconds) in list(cls._calls.items())}
+        caches = {cache.name: {
+            'entries': len(cache),
+            'maxSize': cache.maxSize,
+            'hits': cache.hits,
+            'misses': cache.misses,
+            'evictions': cache.evictions,
+            'hitRate': cache.getHitRate(),
+        } for cache in list(EdidCache._instances)}
+
+        return {'enabled': cls.isEnabled(), 'calls': calls, 'caches': caches}
+
+    @classmethod
+    def getPrometheusText(cls):
+        snapshot = cls.getSnapshot()
+        lines = []
+
+        def addMetric(metric, metricType, helpText, label, values):
+            lines.append('# HELP {} {}'.format(metric, helpText))
+            lines.append('# TYPE {} {}'.format(metric, metricType))
+            for name, value in sorted(values):
+                lines.append('{}{{{}="{}"}} {}'.format(
+                    metric, label, name, repr(value)))
+
+        calls = snapshot['calls']
+        addMetric('edid_method_calls_total', 'counter',
+                  'Number of calls of an instrumented method.', 'method',
+                  ((name, stats['count']) for name, stats in calls.items()))
+        addMetric('edid_method_seconds_total', 'counter',
+                  'Time spent in an instrumented method.', 'method',
+                  ((name, stats['seconds'])
+                   for name, stats in calls.items()))
+
+        caches = snapshot['caches']
+        for key, metric, metricType, helpText in (
+                ('hits', 'edid_cache_hits_total', 'counter',
+                 'Number of cache hits.'),
+                ('misses', 'edid_cache_misses_total', 'counter',
+                 'Number of cache misses.'),
+                ('evictions', 'edid_cache_evictions_total', 'counter',
+                 'Number of evicted cache entries.'),
+                ('entries', 'edid_cache_entries', 'gauge',
+                 'Number of cached entries.'),
+                ('hitRate', 'edid_cache_hit_ratio', 'gauge',
+                 'Ratio of cache hits to lookups.')):
+            addMetric(metric, metricType, helpText, 'cache',
+                      ((name, stats[key]) for name, stats in caches.items()))
+
+        return '\n'.join(lines) + '\n'
+
+
+class EdidRecord:
+    # Immutable decoded summary of the base block fields in Edid.FIELDS.
+
+    __slots__ = Edid.FIELDS
+
+    def __init__(self, fields):
+        if not isinstance(fields, dict):
+            raise TypeError
+
+        for field in self.__slots__:
+            object.__setattr__(self, field, fields[field])
+
+    @classmethod
+    def fromEdid(cls, edid):
+        return cls(edid.getFields())
+
+    def __setattr__(self, name, value):
+        raise AttributeError(name)
+
+    def __delattr__(self, name):
+        raise AttributeError(name)
+
+    def __reduce__(self):
+        return self.__class__, (self.getFields(),)
+
+    def __eq__(self, other):
+        if not isinstance(other, EdidRecord):
+            return NotImplemented
+
+        return self.getValues() == other.getValues()
+
+    def __hash__(self):
+        return hash(self.getValues())
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.getFields())
+
+    def getValues(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+
+    def getFields(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class EdidRecordTable:
+    # Column-wise store for many EdidRecords: every field is kept in a typed
+    # array instead of one Python object per value. Fields holding tuples
+    # (the chromaticity coordinates) take several consecutive slots per row.
+
+    _UINT32 = 'I' if array.array('I').itemsize >= 4 else 'L'
+
+    # field: (array typecode, values per row)
+    COLUMNS = collections.OrderedDict([
+        ('manufacturerID', ('H', 1)),
+        ('manufacturerProductCode', ('H', 1)),
+        ('serialNumber', (_UINT32, 1)),
+        ('weekOfManufacture', ('B', 1)),
+        ('yearOfManufacture', ('H', 1)),
+        ('edidVersion', ('B', 1)),
+        ('edidRevision', ('B', 1)),
+        ('videoInputParametersBitmap', ('B', 1)),
+        ('maximumHorizontalImageSize', ('B', 1)),
+        ('maximumVerticalImageSize', ('H', 1)),
+        ('displayGamma', ('d', 1)),
+        ('supportedFeaturesBitmap', ('B', 1)),
+        ('chromaticityCoordinatesRed', ('d', 2)),
+        ('chromaticityCoordinatesGreen', ('d', 2)),
+        ('chromaticityCoordinatesBlue', ('d', 2)),
+        ('chromaticityCoordinatesWhite', ('d', 2)),
+        ('establishedTimingBitmap', (_UINT32, 1)),
+        ('numberOfExtensions', ('B', 1)),
+    ])
+
+    def __init__(self, records=None):
+        self.columns = collections.OrderedDict(
+            (field, array.array(typecode))
+            for field, (typecode, _) in self.COLUMNS.items())
+        self._length = 0
+
+        if records is not None:
+            self.extend(records)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for index in range(0, self._length):
+            yield self[index]
+
+    def append(self, record):
+        if isinstance(record, Edid):
+            fields = record.getFields()
+        elif isinstance(record, EdidRecord):
+            fields = record.getFields()
+        else:
+            raise TypeError
+
+        fields['manufacturerID'] = Edid._encodeManufacturerID(
+            fields['manufacturerID'])
+        for field, (_, width) in self.COLUMNS.items():
+            if width == 1:
+                self.columns[field].append(fields[field])
+            else:
+                self.columns[field].extend(fields[field])
+
+        self._length += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def getColumn(self, field):
+        width = self.COLUMNS[field][1]
+        column = self.columns[field]
+
+        if field == 'manufacturerID':
+            return [Edid._decodeManufacturerID(raw) for raw in column]
+        if width == 1:
+            return column.tolist()
+
+        return list(zip(*[column[i::width] for i in range(0, width)]))
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            raise TypeError
+        if index < 0:
+            index += self._length
+        if not (index >= 0 and index < self._length):
+            raise IndexError
+
+        fields = {}
+        for field, (_, width) in self.COLUMNS.items():
+            column = self.columns[field]
+            if width == 1:
+                fields[field] = column[index]
+            else:
+                fields[field] = tuple(
+                    column[index * width:(index + 1) * width])
+
+        fields['manufacturerID'] = Edid._decodeManufacturerID(
+            fields['manufacturerID'])
+
+        return EdidRecord(fields)
+
 
-    edid = Edid(version=1.3)
+class EdidColumnWriter:
+    # Decodes many EDIDs into typed columns and writes every column as a
+    # .npy file (format version 1.0), which numpy.load() reads or memory maps
+    # directly; numpy itself is not needed to write them. The columns are
+    # the EdidRecordTable fields, with the manufacturer IDs as 3 byte
+    # strings, plus the descriptor tags of all slots (-1 for detailed
+    # timings) and the monitor name and serial string texts.
 
-    edid.setHeader()
+    NPY_MAGIC = b'\x93NUMPY\x01\x00'
+    NPY_ALIGNMENT = 64
+
+    TEXT_COLUMNS = ('monitorName', 'serialString')
+    TEXT_SIZE = 13
+
+    def __init__(self, edids=None):
+        self.table = EdidRecordTable()
+        self.descriptorTags = array.array('h')
+        self.texts = collections.OrderedDict(
+            (column, bytearray()) for column in self.TEXT_COLUMNS)
+
+        if edids is not None:
+            self.extend(edids)
+
+    def __len__(self):
+        return len(self.table)
+
+    def append(self, edid):
+        if not isinstance(edid, Edid):
+            raise TypeError
+
+        self.table.append(edid)
+        self.descriptorTags.extend(edid.getDescriptorTags())
+        for column, text in zip(self.TEXT_COLUMNS, (
+                edid.getMonitorName(), edid.getSerialString())):
+            encoded = (text or '').encode('ascii', 'replace')
+            self.texts[column] += encoded.ljust(self.TEXT_SIZE, b'\0')
+
+    def extend(self, edids):
+        for edid in edids:
+            self.append(edid)
+
+    @staticmethod
+    def _getDescr(typecode):
+        itemsize = array.array(typecode).itemsize
+        if typecode in 'fd':
+            kind = 'f'
+        elif typecode.isupper():
+            kind = 'u'
+        else:
+            kind = 'i'
+
+        if itemsize == 1:
+            byteorder = '|'
+        else:
+            byteorder = '<' if sys.byteorder == 'little' else '>'
+
+        return '{}{}{}'.format(byteorder, kind, itemsize)
+
+    @classmethod
+    def _writeNpy(cls, filename, descr, shape, data):
+        header = "{{'descr': '{}', 'fortran_order': False, 'shape': {}, }}" \
+            .format(descr, repr(tuple(shape)))
+        # pad with spaces so the data starts aligned, end with a newline
+        headerSize = len(cls.NPY_MAGIC) + 2 + len(header) + 1
+        header += ' ' * (-headerSize % cls.NPY_ALIGNMENT) + '\n'
+
+        with open(filename, 'wb') as f:
+            f.write(cls.NPY_MAGIC)
+            f.write(struct.pack('<H', len(header)))
+            f.write(header.encode('latin1'))
+            f.write(data)
+
+    def write(self, directory):
+        # one <column>.npy file per column, returns the written filenames
+        os.makedirs(directory, exist_ok=True)
+        length = len(self)
+        filenames = []
+
+        def writeColumn(column, descr, shape, data):
+            filename = os.path.join(directory, column + '.npy')
+            self._writeNpy(filename, descr, shape, data)
+            filenames.append(filename)
+
+        decodeTable = Edid._getManufacturerIDTables()[0]
+        for column, (typecode, width) in self.table.COLUMNS.items():
+            values = self.table.columns[column]
+            if column == 'manufacturerID':
+                writeColumn(column, '|S3', (length,), ''.join(
+                    decodeTable[raw] for raw in values).encode('ascii'))
+                continue
+
+            shape = (length,) if width == 1 else (length, width)
+            writeColumn(column, self._getDescr(typecode), shape, values)
+
+        writeColumn('descriptorTags', self._getDescr('h'),
+                    (length, len(Edid.DESCRIPTOR_OFFSETS)),
+                    self.descriptorTags)
+        for column, data in self.texts.items():
+            writeColumn(column, '|S{}'.format(self.TEXT_SIZE), (length,),
+                        data)
+
+        return filenames
+
+    @classmethod
+    def readColumn(cls, filename):
+        # (shape, values) of a .npy file written by write(): an array for
+        # numeric columns, a list of bytes for string columns
+        with open(filename, 'rb') as f:
+            if f.read(len(cls.NPY_MAGIC)) != cls.NPY_MAGIC:
+                raise ValueError
+            headerSize = struct.unpack('<H', f.read(2))[0]
+            header = f.read(headerSize).decode('latin1')
+            data = f.read()
+
+        match = re.match(
+            r"\{'descr': '([<>|])([uifS])(\d+)', 'fortran_order': False, "
+            r"'shape': \(([\d, ]*)\), \}", header)
+        if not match:
+            raise ValueError
+        byteorder, kind, itemsize, shape = match.groups()
+        itemsize = int(itemsize)
+        shape = tuple(int(size) for size in shape.split(',') if size.strip())
+
+        if kind == 'S':
+            return shape, [data[pos:pos + itemsize].rstrip(b'\0')
+                           for pos in range(0, len(data), itemsize)]
+
+        for typecode in ('BHILQ' if kind == 'u' else
+                         'bhilq' if kind == 'i' else 'fd'):
+            if array.array(typecode).itemsize == itemsize:
+                break
+        else:
+            raise ValueError
+
+        values = array.array(typecode)
+        values.frombytes(data)
+        if byteorder != '|' and \
+                byteorder != ('<' if sys.byteorder == 'little' else '>'):
+            values.byteswap()
+
+        return shape, values
+
+
+class EdidModeSet:
+    # Set of video modes (width, height, refresh rate) as a bitset over a
+    # fixed mode table, so sets of many displays can be combined with plain
+    # integer operations and the bits mean the same in every process. The
+    # table holds the established timings in bitmap order, common DMT and
+    # CTA-861 modes and the grid of all standard timing codes. Other modes
+    # get a bit in a bounded overflow table in the order they are first
+    # seen, these bits are only valid within one process. Once the overflow
+    # table is full, further modes are left out of mode sets and counted in
+    # numberOfDroppedModes.
+
+    ESTABLISHED_TIMINGS = (
+        (720, 400, 70), (720, 400, 88), (640, 480, 60), (640, 480, 67),
+        (640, 480, 72), (640, 480, 75), (800, 600, 56), (800, 600, 60),
+        (800, 600, 72), (800, 600, 75), (832, 624, 75), (1024, 768, 87),
+        (1024, 768, 60), (1024, 768, 70), (1024, 768, 75), (1280, 1024, 75),
+        (1152, 870, 75),
+    )
+    # 1024x768@87 is interlaced, fromEdid() leaves it out like interlaced
+    # detailed timings
+    INTERLACED_ESTABLISHED_TIMINGS = frozenset([(1024, 768, 87)])
+
+    # progressive VESA DMT and CTA-861 modes
+    COMMON_MODES = (
+        (640, 350, 85), (640, 400, 85), (720, 400, 85), (640, 480, 85),
+        (800, 600, 85), (848, 480, 60), (1024, 768, 85), (1152, 864, 75),
+        (1280, 768, 60), (1280, 768, 75), (1280, 768, 85), (1280, 800, 60),
+        (1280, 800, 75), (1280, 800, 85), (1280, 960, 60), (1280, 960, 85),
+        (1280, 1024, 60), (1280, 1024, 85), (1360, 768, 60),
+        (1366, 768, 60), (1400, 1050, 60), (1400, 1050, 75),
+        (1400, 1050, 85), (1440, 900, 60), (1440, 900, 75), (1440, 900, 85),
+        (1600, 900, 60), (1600, 1200, 60), (1600, 1200, 65),
+        (1600, 1200, 70), (1600, 1200, 75), (1600, 1200, 85),
+        (1680, 1050, 60), (1680, 1050, 75), (1680, 1050, 85),
+        (1792, 1344, 60), (1792, 1344, 75), (1856, 1392, 60),
+        (1856, 1392, 75), (1920, 1080, 60), (1920, 1200, 60),
+        (1920, 1200, 75), (1920, 1200, 85), (1920, 1440, 60),
+        (1920, 1440, 75), (2048, 1152, 60), (2560, 1600, 60),
+        (2560, 1600, 75), (2560, 1600, 85), (3840, 2400, 60),
+        (720, 480, 60), (720, 576, 50), (1280, 720, 24), (1280, 720, 25),
+        (1280, 720, 30), (1280, 720, 50), (1280, 720, 60), (1280, 720, 100),
+        (1280, 720, 120), (1920, 1080, 24), (1920, 1080, 25),
+        (1920, 1080, 30), (1920, 1080, 50), (1920, 1080, 100),
+        (1920, 1080, 120), (720, 480, 120), (720, 576, 100),
+        (2560, 1080, 60), (3840, 2160, 24), (3840, 2160, 25),
+        (3840, 2160, 30), (3840, 2160, 50), (3840, 2160, 60),
+        (3840, 2160, 100), (3840, 2160, 120), (4096, 2160, 24),
+        (4096, 2160, 25), (4096, 2160, 30), (4096, 2160, 50),
+        (4096, 2160, 60), (5120, 2160, 60), (7680, 4320, 30),
+        (7680, 4320, 60),
+        # common modes of current monitors outside DMT and CTA-861
+        (1920, 1080, 75), (1920, 1080, 144), (1920, 1080, 165),
+        (1920, 1080, 240), (1920, 1200, 120), (2560, 1080, 75),
+        (2560, 1080, 100), (2560, 1080, 144), (2560, 1440, 60),
+        (2560, 1440, 75), (2560, 1440, 120), (2560, 1440, 144),
+        (2560, 1440, 165), (2560, 1440, 240), (2560, 1600, 120),
+        (2880, 1800, 60), (3440, 1440, 60), (3440, 1440, 100),
+        (3440, 1440, 120), (3440, 1440, 144), (3440, 1440, 165),
+        (3840, 1600, 60), (3840, 1600, 144), (3840, 2160, 144),
+        (3840, 2160, 165), (3840, 2160, 240), (5120, 1440, 60),
+        (5120, 1440, 120), (5120, 1440, 240), (5120, 2880, 60),
+        (6016, 3384, 60), (7680, 2160, 120),
+    )
+
+    MODES = tuple(collections.OrderedDict.fromkeys(
+        ESTABLISHED_TIMINGS + COMMON_MODES))
+    _modeBits = {mode: bit for bit, mode in enumerate(MODES)}
+
+    # standard timing grid: 255 widths x 5 aspect ratios x 64 refresh
+    # rates, the bit is computed from the code
+    GRID_RATIOS = Edid.STANDARD_TIMING_RATIOS[True] + \
+        Edid.STANDARD_TIMING_RATIOS[False][:1]
+    GRID_OFFSET = len(MODES)
+    GRID_SIZE = 255 * len(GRID_RATIOS) * 64
+
+    OVERFLOW_OFFSET = GRID_OFFSET + GRID_SIZE
+    MAX_OVERFLOW_MODES = 4096
+    _overflowModes = []
+    _overflowBits = {}
+    _overflowLock = threading.Lock()
+    numberOfDroppedModes = 0
+
+    def __init__(self, bits=0):
+        if not isinstance(bits, int):
+            raise TypeError
+        if not (bits >= 0):
+            raise ValueError
+
+        self.bits = bits
+
+    def __reduce__(self):
+        # overflow bits differ between processes, such sets travel as modes
+        if self.bits >> self.OVERFLOW_OFFSET:
+            return self.fromModes, (list(self),)
+        return self.__class__, (self.bits,)
+
+    @classmethod
+    def _getGridBit(cls, mode):
+        width, height, refreshRate = mode
+        if not (isinstance(width, int) and width % 8 == 0 and
+                width >= 256 and width <= 2288 and
+                isinstance(refreshRate, int) and
+                refreshRate >= 60 and refreshRate < 124):
+            return None
+
+        for ratioIndex, ratio in enumerate(cls.GRID_RATIOS):
+            if int(round(width / ratio)) == height:
+                return cls.GRID_OFFSET + (
+                    (width // 8 - 32) * len(cls.GRID_RATIOS) +
+                    ratioIndex) * 64 + refreshRate - 60
+
+        return None
+
+    @classmethod
+    def _getGridMode(cls, bit):
+        index, refreshRate = divmod(bit - cls.GRID_OFFSET, 64)
+        high, ratioIndex = divmod(index, len(cls.GRID_RATIOS))
+        width = 8 * (32 + high)
+
+        return width, int(round(width / cls.GRID_RATIOS[ratioIndex])), \
+            60 + refreshRate
+
+    @classmethod
+    def getModeBit(cls, mode):
+        # None if the mode has no bit and the overflow table is full
+        bit = cls._modeBits.get(mode)
+        if bit is None:
+            bit = cls._getGridBit(mode)
+        if bit is None:
+            bit = cls._overflowBits.get(mode)
+        if bit is None:
+            with cls._overflowLock:
+                bit = cls._overflowBits.get(mode)
+                if bit is None:
+                    if len(cls._overflowModes) >= cls.MAX_OVERFLOW_MODES:
+                        cls.numberOfDroppedModes += 1
+                        return None
+                    bit = cls.OVERFLOW_OFFSET + len(cls._overflowModes)
+                    cls._overflowModes.append(mode)
+                    cls._overflowBits[mode] = bit
+
+        return bit
+
+    @classmethod
+    def getMode(cls, bit):
+        if bit < cls.GRID_OFFSET:
+            return cls.MODES[bit]
+        if bit < cls.OVERFLOW_OFFSET:
+            return cls._getGridMode(bit)
+
+        return cls._overflowModes[bit - cls.OVERFLOW_OFFSET]
+
+    @classmethod
+    def fromModes(cls, modes):
+        bits = 0
+        for mode in modes:
+            bit = cls.getModeBit(tuple(mode))
+            if bit is not None:
+                bits |= 1 << bit
+
+        return cls(bits)
+
+    @classmethod
+    def fromEdid(cls, edid):
+        # established timings map onto the first bits directly (the bitmap
+        # has bit 23 for the first mode, the seven manufacturer bits are
+        # not used)
+        establishedTimingBitmap = edid.getEstablishedTimingBitmap()
+        bits = 0
+        for bit, mode in enumerate(cls.ESTABLISHED_TIMINGS):
+            if establishedTimingBitmap & (1 << (23 - bit)) and \
+                    mode not in cls.INTERLACED_ESTABLISHED_TIMINGS:
+                bits |= 1 << bit
+
+        modes = []
+        for resolutionX, ratio, verticalFrequency in \
+                edid.getStandardTimingInformations():
+            if resolutionX is not None:
+                modes.append((resolutionX, int(round(resolutionX / ratio)),
+                              verticalFrequency))
+
+        descriptors = edid.getDescriptors()
+        for extension in edid.getExtensions():
+            if isinstance(extension, EdidCeaExtension):
+                descriptors += extension.getDetailedTimingDescriptors()
+            elif isinstance(extension, EdidDisplayIdExtension):
+                modes += [mode for mode, timing in zip(
+                    extension.getTimingModes(), extension.getTimings())
+                    if not timing[10]]
+        # interlaced timings are left out, their field based modes would
+        # mix with the progressive ones
+        for descriptor in descriptors:
+            with descriptor:
+                if descriptor.isDetailedTiming() and \
+                        not descriptor.isInterlaced():
+                    mode = descriptor.getDetailedTimingMode()
+                    if mode[2] is not None:
+                        modes.append(mode)
+
+        return cls(bits | cls.fromModes(modes).bits)
+
+    @classmethod
+    def intersection(cls, modeSets):
+        modeSets = iter(modeSets)
+        first = next(modeSets, None)
+        if first is None:
+            return cls()
+
+        bits = first.bits
+        for modeSet in modeSets:
+            bits &= modeSet.bits
+
+        return cls(bits)
+
+    @classmethod
+    def union(cls, modeSets):
+        bits = 0
+        for modeSet in modeSets:
+            bits |= modeSet.bits
+
+        return cls(bits)
+
+    def __and__(self, other):
+        return EdidModeSet(self.bits & other.bits)
+
+    def __or__(self, other):
+        return EdidModeSet(self.bits | other.bits)
+
+    def __eq__(self, other):
+        if not isinstance(other, EdidModeSet):
+            return NotImplemented
+
+        return self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __len__(self):
+        return bin(self.bits).count('1')
+
+    def __contains__(self, mode):
+        mode = tuple(mode)
+        bit = self._modeBits.get(mode)
+        if bit is None:
+            bit = self._getGridBit(mode)
+        if bit is None:
+            bit = self._overflowBits.get(mode)
+        return bit is not None and bool(self.bits & (1 << bit))
+
+    def __iter__(self):
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            yield self.getMode(lowest.bit_length() - 1)
+            bits ^= lowest
+
+    def getBestMode(self):
+        # largest resolution, highest refresh rate among those
+        return max(self, key=lambda mode: (mode[0] * mode[1], mode[2]),
+                   default=None)
+
+    @classmethod
+    def getBestCommonMode(cls, modeSets):
+        return cls.intersection(modeSets).getBestMode()
+
+
+class EdidWatcher:
+    # Watches the EDID files of all DRM connectors below root (one
+    # <connector>/edid file each) for changes. All files are read
+    # concurrently and compared by a cheap fingerprint (length and checksum
+    # bytes) and, if that matches, by their bytes; only changed ones are
+    # decoded. An empty or missing file means nothing is connected.
+
+    def __init__(self, root='/sys/class/drm', interval=1.0):
+        self.root = root
+        self.interval = interval
+        self._fingerprints = {}
+        # raw EDID by connector as of the last poll
+        self._datas = {}
+
+    @staticmethod
+    def getFingerprint(data):
+        return len(data), bytes(data[Edid.BLOCK_SIZE - 1::Edid.BLOCK_SIZE])
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return b''
+
+    def _getConnectors(self):
+        return sorted(
+            (os.path.basename(os.path.dirname(path)), path)
+            for path in glob.glob(os.path.join(self.root, '*', 'edid')))
+
+    async def poll(self):
+        # returns (connector, Edid or None) for every connector whose EDID
+        # changed since the last poll
+        connectors = self._getConnectors()
+        # get_running_loop() is new in Python 3.7
+        loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)()
+        datas = await asyncio.gather(
+            *[loop.run_in_executor(None, self._read, path)
+              for _, path in connectors])
+
+        noFingerprint = self.getFingerprint(b'')
+        events = []
+        for (connector, _), data in zip(connectors, datas):
+            fingerprint = self.getFingerprint(data)
+            if fingerprint == self._fingerprints.get(
+                    connector, noFingerprint) and \
+                    data == self._datas.get(connector, b''):
+                continue
+
+            self._fingerprints[connector] = fingerprint
+            self._datas[connector] = data
+            if len(data) >= Edid.BLOCK_SIZE:
+                events.append((connector, Edid(data=data)))
+            else:
+                events.append((connector, None))
+
+        current = set(connector for connector, _ in connectors)
+        for connector in sorted(set(self._fingerprints) - current):
+            self._datas.pop(connector)
+            if self._fingerprints.pop(connector) != noFingerprint:
+                events.append((connector, None))
+
+        return events
+
+    async def watch(self, callback):
+        # calls callback(connector, edid) for every change, forever
+        while True:
+            events = await self.poll()
+            for connector, edid in events:
+                callback(connector, edid)
+            await asyncio.sleep(self.interval)
+
+
+class EdidGenerator:
+    # Produces many EDIDs that differ from a template only in a few base
+    # block fields. The template is compiled once into a single struct that
+    # covers the varying bytes (unchanged bytes in between are packed as
+    # constants), so rendering an EDID is one pack_into into a preallocated
+    # buffer plus a checksum fix-up from the precomputed sum of the rest.
+
+    # field: (offset, struct format, value bias)
+    FIELDS = {
+        'manufacturerProductCode': (10, 'H', 0),
+        'serialNumber': (12, 'I', 0),
+        'weekOfManufacture': (16, 'B', 0),
+        'yearOfManufacture': (17, 'B', -1990),
+    }
+
+    def __init__(self, template, fields=('serialNumber',)):
+        if len(template) < Edid.BLOCK_SIZE or \
+                len(template) % Edid.BLOCK_SIZE != 0:
+            raise ValueError
+        if not fields:
+            raise ValueError
+        for field in fields:
+            if field not in self.FIELDS:
+                raise ValueError
+
+        self.template = bytes(template)
+        self.fields = tuple(fields)
+
+        # (constant, value index, bias) for every packed struct item
+        self._arguments = []
+        layout = sorted((self.FIELDS[field], index)
+                        for index, field in enumerate(self.fields))
+        self._spanStart = layout[0][0][0]
+        pos = self._spanStart
+        structFormat = '<'
+        for (offset, fieldFormat, bias), index in layout:
+            if offset > pos:
+                structFormat += '{}s'.format(offset - pos)
+                self._arguments.append((self.template[pos:offset], None, 0))
+            structFormat += fieldFormat
+            self._arguments.append((None, index, bias))
+            pos = offset + struct.calcsize('<' + fieldFormat)
+        self._spanEnd = pos
+        self._struct = struct.Struct(structFormat)
+
+        self._baseSum = Edid._sumBlock(
+            self.template[0:Edid.BLOCK_SIZE - 1]) - \
+            Edid._sumBlock(self.template[self._spanStart:self._spanEnd])
+
+    def __len__(self):
+        return len(self.template)
+
+    def _render(self, view, offset, values):
+        arguments = [
+            constant if constant is not None else values[index] + bias
+            for constant, index, bias in self._arguments]
+        try:
+            self._struct.pack_into(view, offset + self._spanStart, *arguments)
+        except struct.error:
+            raise ValueError
+
+        val = self._baseSum + Edid._sumBlock(
+            view[offset + self._spanStart:offset + self._spanEnd])
+        view[offset + Edid.BLOCK_SIZE - 1] = -val & 0xFF
+
+    def render(self, variants):
+        # variants is a sequence of value tuples in the order of fields,
+        # returns all EDIDs back to back
+        size = len(self.template)
+        buffer = bytearray(self.template) * len(variants)
+        with memoryview(buffer) as view:
+            for variant, values in enumerate(variants):
+                self._render(view, variant * size, values)
+
+        return buffer
+
+    def generate(self, variants, batchSize=4096):
+        # yields render() results for batches of batchSize variants
+        batch = []
+        for values in variants:
+            batch.append(values)
+            if len(batch) == batchSize:
+                yield self.render(batch)
+                batch = []
+
+        if batch:
+            yield self.render(batch)
+
+    def writeCorpus(self, filename, variants, batchSize=4096):
+        # writes an EdidCorpus, returns the number of EDIDs
+        size = len(self.template)
+        return EdidWriter(batchSize=batchSize, fsync=False) \
+            ._writeCorpusBatches(filename, (
+                (buffer, [size] * (len(buffer) // size))
+                for buffer in self.generate(variants, batchSize)))
+
+
+class EdidGamut:
+    # Gamut triangles in CIE 1931 xy coordinates: areas by the shoelace
+    # formula, overlaps by clipping one triangle against the other
+    # (Sutherland-Hodgman). Gamuts are given as (red, green, blue) primaries
+    # or as the name of one of the reference GAMUTS.
+
+    GAMUTS = collections.OrderedDict([
+        ('sRGB', ((0.640, 0.330), (0.300, 0.600), (0.150, 0.060))),
+        ('DCI-P3', ((0.680, 0.320), (0.265, 0.690), (0.150, 0.060))),
+        ('Rec.2020', ((0.708, 0.292), (0.170, 0.797), (0.131, 0.046))),
+    ])
+
+    @classmethod
+    def _getPrimaries(cls, gamut):
+        if isinstance(gamut, str):
+            return cls.GAMUTS[gamut]
+
+        return gamut
+
+    @staticmethod
+    def _getSignedArea(polygon):
+        area = 0.0
+        previousX, previousY = polygon[-1]
+        for x, y in polygon:
+            area += previousX * y - x * previousY
+            previousX, previousY = x, y
+
+        return area / 2
+
+    @classmethod
+    def getArea(cls, gamut):
+        polygon = cls._getPrimaries(gamut)
+        return abs(cls._getSignedArea(polygon)) if polygon else 0.0
+
+    @classmethod
+    def _clip(cls, polygon, clipPolygon):
+        # clipPolygon must be convex, polygon may have any orientation
+        if cls._getSignedArea(clipPolygon) < 0:
+            clipPolygon = clipPolygon[::-1]
+
+        previousEdge = clipPolygon[-1]
+        for edge in clipPolygon:
+            if not polygon:
+                break
+
+            (ax, ay), (bx, by) = previousEdge, edge
+            previousEdge = edge
+            dx = bx - ax
+            dy = by - ay
+
+            clipped = []
+            previous = polygon[-1]
+            previousSide = dx * (previous[1] - ay) - dy * (previous[0] - ax)
+            for point in polygon:
+                side = dx * (point[1] - ay) - dy * (point[0] - ax)
+                if (side >= 0) != (previousSide >= 0):
+                    # the edge crosses the clip line
+                    t = previousSide / (previousSide - side)
+                    clipped.append(
+                        (previous[0] + t * (point[0] - previous[0]),
+                         previous[1] + t * (point[1] - previous[1])))
+                if side >= 0:
+                    clipped.append(point)
+                previous = point
+                previousSide = side
+            polygon = clipped
+
+        return polygon
+
+    @classmethod
+    def getOverlapArea(cls, gamut, otherGamut):
+        primaries = cls._getPrimaries(otherGamut)
+        if cls._getSignedArea(primaries) == 0:
+            return 0.0
+
+        return cls.getArea(cls._clip(
+            list(cls._getPrimaries(gamut)), primaries))
+
+    @classmethod
+    def getCoverage(cls, gamut, referenceGamut='sRGB'):
+        # share of the reference gamut's area inside gamut
+        return cls.getOverlapArea(gamut, referenceGamut) / \
+            cls.getArea(referenceGamut)
+
+    @staticmethod
+    def getAreas(reds, greens, blues):
+        # reds, greens and blues are (x array, y array) pairs
+        (redX, redY), (greenX, greenY), (blueX, blueY) = reds, greens, blues
+        return array.array('d', [
+            abs((gx - rx) * (by - ry) - (bx - rx) * (gy - ry)) / 2
+            for rx, ry, gx, gy, bx, by in zip(
+                redX, redY, greenX, greenY, blueX, blueY)])
+
+    @classmethod
+    def getCoverages(cls, reds, greens, blues, referenceGamut='sRGB'):
+        (redX, redY), (greenX, greenY), (blueX, blueY) = reds, greens, blues
+        referencePrimaries = cls._getPrimaries(referenceGamut)
+        return array.array('d', [
+            cls.getCoverage((red, green, blue), referencePrimaries)
+            for red, green, blue in zip(zip(redX, redY), zip(greenX, greenY),
+                                        zip(blueX, blueY))])
+
+
+class EdidBatch:
+    # Column-wise access to many base blocks stored back to back in one
+    # buffer. Every getter returns one list with an entry per EDID and uses
+    # the same decoding as the corresponding Edid getter.
+
+    _MANUFACTURER_ID = struct.Struct('>8xH118x')
+    _MANUFACTURER_PRODUCT_CODE = struct.Struct('<10xH116x')
+    _SERIAL_NUMBER = struct.Struct('<12xI112x')
+
+    def __init__(self, data):
+        self.data = memoryview(data).cast('B')
+        if len(self.data) % Edid.BLOCK_SIZE != 0:
+            raise ValueError
+
+    def __len__(self):
+        return len(self.data) // Edid.BLOCK_SIZE
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            raise TypeError
+        if index < 0:
+            index += len(self)
+        if not (index >= 0 and index < len(self)):
+            raise IndexError
+
+        offset = index * Edid.BLOCK_SIZE
+        return Edid(data=self.data[offset:offset + Edid.BLOCK_SIZE])
+
+    def _getColumn(self, offset):
+        return self.data[offset::Edid.BLOCK_SIZE].tobytes()
+
+    def _unpackColumn(self, unpacker):
+        return [value for (value,) in unpacker.iter_unpack(self.data)]
+
+    def getManufacturerIDs(self):
+        decodeTable = Edid._getManufacturerIDTables()[0]
+        return [decodeTable[raw & 0x7FFF]
+                for raw in self._unpackColumn(self._MANUFACTURER_ID)]
+
+    def getManufacturerProductCodes(self):
+        return self._unpackColumn(self._MANUFACTURER_PRODUCT_CODE)
+
+    def getSerialNumbers(self):
+        return self._unpackColumn(self._SERIAL_NUMBER)
+
+    def getWeekOfManufactures(self):
+        return list(self._getColumn(16))
+
+    def getYearOfManufactures(self):
+        return [1990 + raw for raw in self._getColumn(17)]
+
+    def getEdidVersions(self):
+        return list(self._getColumn(18))
+
+    def getEdidRevisions(self):
+        return list(self._getColumn(19))
+
+    def getVersions(self):
+        return [Edid._decodeVersion(edidVersion, edidRevision)
+                for edidVersion, edidRevision in zip(
+                    self._getColumn(18), self._getColumn(19))]
+
+    def getVideoInputParametersBitmaps(self):
+        return list(self._getColumn(20))
+
+    def getMaximumHorizontalImageSizes(self):
+        return list(self._getColumn(21))
+
+    def getMaximumVerticalImageSizes(self):
+        return [raw * 100 for raw in self._getColumn(22)]
+
+    def getDisplayGammas(self):
+        return [Edid._decodeDisplayGamma(raw) for raw in self._getColumn(23)]
+
+    def getSupportedFeaturesBitmaps(self):
+        return list(self._getColumn(24))
+
+    def _getChromaticityArrays(self, colors):
+        # each coordinate is built from two strided columns through the
+        # decode table, columns shared by several colors are read once
+        table = Edid._CHROMATICITY_TABLE
+        columns = {}
+        arrays = collections.OrderedDict()
+        for color in colors:
+            coordinates = []
+            for high, low, shift in Edid.CHROMATICITY_LAYOUT[color]:
+                for offset in (high, low):
+                    if offset not in columns:
+                        columns[offset] = self._getColumn(offset)
+                coordinates.append(array.array('d', [
+                    table[(highRaw << 2) | ((lowRaw >> shift) & 0x03)]
+                    for highRaw, lowRaw in zip(columns[high], columns[low])]))
+            arrays[color] = tuple(coordinates)
+
+        return arrays
+
+    def getChromaticityArrays(self):
+        # color -> (x array, y array) for all four chromaticity coordinates
+        return self._getChromaticityArrays(('Red', 'Green', 'Blue', 'White'))
+
+    def _getChromaticityCoordinates(self, color):
+        return list(zip(*self._getChromaticityArrays((color,))[color]))
+
+    def getGamutAreas(self):
+        return EdidGamut.getAreas(*self._getChromaticityArrays(
+            ('Red', 'Green', 'Blue')).values())
+
+    def getGamutCoverages(self, gamut='sRGB'):
+        return EdidGamut.getCoverages(*self._getChromaticityArrays(
+            ('Red', 'Green', 'Blue')).values(), referenceGamut=gamut)
+
+    def getChromaticityCoordinatesReds(self):
+        return self._getChromaticityCoordinates('Red')
+
+    def getChromaticityCoordinatesGreens(self):
+        return self._getChromaticityCoordinates('Green')
+
+    def getChromaticityCoordinatesBlues(self):
+        return self._getChromaticityCoordinates('Blue')
+
+    def getChromaticityCoordinatesWhites(self):
+        return self._getChromaticityCoordinates('White')
+
+    def getNumbersOfExtensions(self):
+        return list(self._getColumn(126))
+
+    def findInvalidChecksums(self):
+        return Edid.findInvalidChecksums(self.data)
+
+
+def _iterateFile(path):
+    if os.path.isfile(path + EdidCorpus.INDEX_SUFFIX):
+        with EdidCorpus(path) as edidCorpus:
+            for index in range(0, len(edidCorpus)):
+                yield '{}:{}'.format(path, index), \
+                    edidCorpus.getRaw(index).tobytes()
+    else:
+        with open(path, 'rb') as f:
+            yield path, f.read()
+
+
+def _iterateSources(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, directories, filenames in os.walk(path):
+                directories.sort()
+                for filename in sorted(filenames):
+                    if filename.endswith(EdidCorpus.INDEX_SUFFIX):
+                        continue
+                    yield from _iterateFile(os.path.join(directory, filename))
+        else:
+            yield from _iterateFile(path)
+
+
+def _validate(item):
+    source, data = item
+    violations = EdidValidator.getDefault().validate(data)
+
+    # rules checked on several blocks name the block
+    errors = []
+    for violation in violations:
+        if EdidValidator.RULES[violation.rule][0] in (None, 'base'):
+            error = violation.rule
+        else:
+            error = '{}:{}'.format(violation.rule, violation.block)
+        if error not in errors:
+            errors.append(error)
+
+    return {'source': source, 'valid': not errors, 'errors': errors}
+
+
+def _imapBounded(pool, function, items, chunkSize, maxChunks):
+    # like pool.imap(), but items are only read as far as maxChunks chunks
+    # ahead of the results taken so far, so a slow consumer does not pile
+    # up a whole corpus in the task queue
+    items = iter(items)
+    pending = collections.deque()
+    while True:
+        while len(pending) < maxChunks:
+            chunk = list(itertools.islice(items, chunkSize))
+            if not chunk:
+                break
+            pending.append(pool.map_async(function, chunk, len(chunk)))
+
+        if not pending:
+            return
+        yield from pending.popleft().get()
 
-    edid.setManufacturerID('ABC')
-    print(edid.getManufacturerID())
 
-    edid.setManufacturerProductCode(12345)
-    print(edid.getManufacturerProductCode())
+def _report(results):
+    allValid = True
+    for result in results:
+        allValid &= result['valid']
+        print(json.dumps(result), flush=True)
 
-    edid.setSerialNumber(12345678)
-    print(edid.getSerialNumber())
+    return allValid
 
-    edid.setWeekOfManufacture(120)
-    print(edid.getWeekOfManufacture())
 
-    edid.setYearOfManufacture(2016)
-    print(edid.getYearOfManufacture())
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Validate EDIDs from files, directories or corpora.')
+    parser.add_argument(
+        'paths', nargs='+', metavar='PATH',
+        help='EDID file, directory of EDID files or EdidCorpus data file')
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=os.cpu_count(),
+        help='number of worker processes (default: number of CPUs)')
+    parser.add_argument(
+        '-c', '--chunk-size', type=int, default=256,
+        help='EDIDs sent to a worker at once (default: 256)')
+    args = parser.parse_args(argv)
 
-    edid.setDisplayGamma(2.2)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
 
-    edid.setStandardTimingInformation(0, 640, 4.0 / 3.0, 60)
+    items = _iterateSources(args.paths)
 
-    edid.setVideoInputParametersBitmap(0x80)
+    if args.jobs == 1:
+        allValid = _report(map(_validate, items))
+    else:
+        # two chunks per worker keep all of them busy
+        jobs = args.jobs or os.cpu_count() or 1
+        with multiprocessing.Pool(jobs) as pool:
+            allValid = _report(_imapBounded(
+                pool, _validate, items, args.chunk_size, 2 * jobs))
 
-    edid.calculateChecksum()
-    edid.writeToFile('edid.dat')
+    return 0 if allValid else 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,6 +1,22 @@
 import unittest
+import array
+import asyncio
+import contextlib
 import copy
-from edid import Edid, EdidDescriptor
+import gc
+import io
+import json
+import multiprocessing.dummy
+import os
+import pickle
+import tempfile
+import weakref
+from edid import Edid, EdidDescriptor, EdidBatch, EdidExtension, \
+    EdidCeaExtension, EdidDisplayIdExtension, EdidReader, EdidCorpus, \
+    EdidCache, EdidRecord, EdidRecordTable, EdidModeSet, EdidWatcher, \
+    EdidGenerator, EdidTiming, EdidTimingGenerator, \
+    EdidColumnWriter, EdidInstrumentation, EdidWriter, EdidGamut, \
+    EdidValidator, EdidViolation, main, _imapBounded
 
 
 class EdidTests(unittest.TestCase):
@@ -127,6 +143,132 @@ class EdidTests(unittest.TestCase):
         self.assertTrue(edid.checkChecksum())
         self.assertEqual(edid[127], 2)
 
+    def testCheckChecksumBlock(self):
+        edid = Edid(data=self.VALID_EDID_DATA[2])
+        for block in range(0, 3):
+            self.assertTrue(edid.checkChecksum(block))
+        edid[300] ^= 0xFF
+        self.assertTrue(edid.checkChecksum(0))
+        self.assertFalse(edid.checkChecksum(2))
+
+    def testCheckChecksumBlockOutOfRange(self):
+        edid = Edid(data=self.VALID_EDID_DATA[1])
+        with self.assertRaises(IndexError):
+            edid.checkChecksum(1)
+
+    def testCalculateChecksumBlock(self):
+        edid = Edid(data=self.VALID_EDID_DATA[0])
+        edid[200] ^= 0xFF
+        edid.calculateChecksum(1)
+        self.assertTrue(edid.checkChecksum(1))
+        self.assertEqual(edid[0:128], self.VALID_EDID_DATA[0][0:128])
+
+    def testGetNumberOfBlocks(self):
+        numberOfBlocks = [2, 1, 3, 2]
+        for key, data in enumerate(self.VALID_EDID_DATA):
+            edid = Edid(data=data)
+            self.assertEqual(edid.getNumberOfBlocks(), numberOfBlocks[key])
+
+    def testCheckChecksums(self):
+        edid = Edid(data=self.VALID_EDID_DATA[2])
+        self.assertEqual(edid.checkChecksums(), [True, True, True])
+        edid[130] = 0
+        self.assertEqual(edid.checkChecksums(), [True, False, True])
+
+    def testCalculateChecksums(self):
+        edid = Edid(data=self.VALID_EDID_DATA[2])
+        edid[1] = 0
+        edid[130] = 0
+        edid.calculateChecksums()
+        self.assertEqual(edid.checkChecksums(), [True, True, True])
+
+    def testFindInvalidChecksums(self):
+        data = bytearray(b''.join(self.VALID_EDID_DATA))
+        self.assertEqual(Edid.findInvalidChecksums(data), 0)
+        data[128 * 1 + 5] ^= 0x01
+        data[128 * 7 + 5] ^= 0x01
+        self.assertEqual(
+            Edid.findInvalidChecksums(data), (1 << 1) | (1 << 7))
+
+    def testFindInvalidChecksumsInvalidLength(self):
+        with self.assertRaises(ValueError):
+            Edid.findInvalidChecksums(bytearray(100))
+
+    def testAutoChecksum(self):
+        edid = Edid(version=1.3)
+        edid.setAutoChecksum(True)
+        self.assertTrue(edid.getAutoChecksum())
+        self.assertTrue(edid.checkChecksum())
+
+        edid.setManufacturerID('SAM')
+        edid.setSerialNumber(12345678)
+        edid.setDisplayGamma(2.2)
+        edid.setMonitorName('TEST')
+        edid.setStandardTimingInformation(0, 1920, 16.0 / 9.0, 60)
+        edid[-3] = 0xFF
+        self.assertTrue(edid.checkChecksum())
+
+        edid.setAutoChecksum(False)
+        edid[20] = 0x80
+        self.assertFalse(edid.checkChecksum())
+
+    def testAutoChecksumEnableFixes(self):
+        edid = Edid(data=self.VALID_EDID_DATA[2])
+        edid[1] = 0
+        edid[200] = 0
+        edid.setAutoChecksum(True)
+        self.assertEqual(edid.checkChecksums(), [True, True, True])
+
+    def testAutoChecksumSlices(self):
+        edid = Edid(data=self.VALID_EDID_DATA[2])
+        edid.setAutoChecksum(True)
+
+        # spanning blocks and checksum bytes
+        edid[100:300] = bytearray(range(200))
+        self.assertEqual(edid.checkChecksums(), [True, True, True])
+        self.assertEqual(edid[100:127], bytearray(range(27)))
+
+        # extended slice
+        edid[130:190:3] = bytearray(20)
+        self.assertEqual(edid.checkChecksums(), [True, True, True])
+
+        # through a descriptor
+        edid.getDescriptor(1)[2:6] = b'ABCD'
+        self.assertEqual(edid.checkChecksums(), [True, True, True])
+
+        # resizing
+        edid[0:0] = bytearray(128)
+        edid[0:8] = Edid.HEADER
+        self.assertEqual(edid.checkChecksums(), [True] * 4)
+
+    def testAutoChecksumChecksumByte(self):
+        for pos in [127, -1, -129, 255, 383, -257]:
+            edid = Edid(data=self.VALID_EDID_DATA[2])
+            edid.setAutoChecksum(True)
+            edid[pos] = 0
+            self.assertEqual(edid.checkChecksums(), [True, True, True])
+
+    def testAutoChecksumPlainWrites(self):
+        edid = Edid(version=1.3)
+        self.assertIs(type(edid).__setitem__, bytearray.__setitem__)
+        edid.setAutoChecksum(True)
+        self.assertIsInstance(edid, Edid)
+        edid.setAutoChecksum(False)
+        self.assertIs(type(edid).__setitem__, bytearray.__setitem__)
+
+    def testAutoChecksumInvalid(self):
+        edid = Edid(version=1.3)
+        with self.assertRaises(TypeError):
+            edid.setAutoChecksum(1)
+
+    def testAutoChecksumCopy(self):
+        edid = Edid(version=1.3)
+        edid.setAutoChecksum(True)
+        edidCopy = copy.copy(edid)
+        self.assertTrue(edidCopy.getAutoChecksum())
+        edidCopy[20] = 0x80
+        self.assertTrue(edidCopy.checkChecksum())
+
     def testCheckHeaderValid(self):
         for data in self.VALID_EDID_DATA:
             edid = Edid(data=data)
@@ -153,6 +295,42 @@ class EdidTests(unittest.TestCase):
             edid = Edid(data=data)
             self.assertEqual(edid.getManufacturerID(), manufacturerIDs[key])
 
+    def testSetManufacturerIDInvalid(self):
+        edid = Edid(data=bytearray(128))
+        with self.assertRaises(TypeError):
+            edid.setManufacturerID(0x4C2D)
+        for manufacturerID in ['', 'SA', 'SAMS', 'sam', 'S@M', 'S[M']:
+            with self.assertRaises(ValueError):
+                edid.setManufacturerID(manufacturerID)
+        self.assertEqual(edid[8:10], bytearray(2))
+
+    def testManufacturerIDTables(self):
+        for raw in range(0, 0x8000):
+            manufacturerID = Edid._decodeManufacturerID(raw)
+            self.assertEqual(Edid._encodeManufacturerID(manufacturerID), raw)
+
+    def testGetManufacturerName(self):
+        manufacturerNames = ['Samsung Electric Company', None,
+                             'Apple Computer Inc', 'Motorola UDS']
+        for key, data in enumerate(self.VALID_EDID_DATA):
+            edid = Edid(data=data)
+            self.assertEqual(edid.getManufacturerName(),
+                             manufacturerNames[key])
+
+    def testLoadManufacturerNames(self):
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                filename = os.path.join(directory, 'pnp.ids')
+                with open(filename, 'w') as f:
+                    f.write('# comment\n\nFTB\tFlip That Bit\n')
+                Edid.loadManufacturerNames(filename)
+            edid = Edid(data=self.VALID_EDID_DATA[1])
+            self.assertEqual(edid.getManufacturerName(), 'Flip That Bit')
+            self.assertEqual(Edid.getManufacturerNames(),
+                             {'FTB': 'Flip That Bit'})
+        finally:
+            Edid.loadManufacturerNames()
+
     def testSetManufacturerProductCode(self):
         edid = Edid(data=bytearray(128))
         edid.setManufacturerProductCode(956)
@@ -310,31 +488,59 @@ class EdidTests(unittest.TestCase):
     def testSetChromaticityCoordinatesRed(self):
         edid = Edid(data=bytearray(128))
         edid.setChromaticityCoordinatesRed(0.888, 0.777)
-        self.assertEqual(edid[25], 0x10)
+        self.assertEqual(edid[25], 0x40)
         self.assertEqual(edid[27], 0xE3)
         self.assertEqual(edid[28], 0xC7)
 
     def testSetChromaticityCoordinatesGreen(self):
         edid = Edid(data=bytearray(128))
         edid.setChromaticityCoordinatesGreen(0.888, 0.777)
-        self.assertEqual(edid[25], 0x01)
+        self.assertEqual(edid[25], 0x04)
         self.assertEqual(edid[29], 0xE3)
         self.assertEqual(edid[30], 0xC7)
 
     def testSetChromaticityCoordinatesBlue(self):
         edid = Edid(data=bytearray(128))
         edid.setChromaticityCoordinatesBlue(0.888, 0.777)
-        self.assertEqual(edid[26], 0x10)
+        self.assertEqual(edid[26], 0x40)
         self.assertEqual(edid[31], 0xE3)
         self.assertEqual(edid[32], 0xC7)
 
     def testSetChromaticityCoordinatesWhite(self):
         edid = Edid(data=bytearray(128))
         edid.setChromaticityCoordinatesWhite(0.888, 0.777)
-        self.assertEqual(edid[26], 0x01)
+        self.assertEqual(edid[26], 0x04)
         self.assertEqual(edid[33], 0xE3)
         self.assertEqual(edid[34], 0xC7)
 
+    def testSetChromaticityCoordinates(self):
+        edid = Edid(data=bytearray(128))
+        edid.setChromaticityCoordinatesRed(0.64, 0.33)
+        edid.setChromaticityCoordinatesGreen(0.3, 0.6)
+        edid.setChromaticityCoordinatesBlue(0.15, 0.06)
+        edid.setChromaticityCoordinatesWhite(0.3125, 0.329)
+        self.assertEqual(edid.getChromaticityCoordinatesRed(), (0.64, 0.33))
+        self.assertEqual(edid.getChromaticityCoordinatesGreen(), (0.3, 0.6))
+        self.assertEqual(edid.getChromaticityCoordinatesBlue(), (0.15, 0.06))
+        self.assertEqual(edid.getChromaticityCoordinatesWhite(),
+                         (0.312, 0.329))
+
+        edid.setChromaticityCoordinatesWhite(1.0, 0.0)
+        self.assertEqual(edid[26] & 0x0F, 0x0C)
+        self.assertEqual(edid[33:35], bytearray.fromhex('FF 00'))
+
+    def testSetChromaticityCoordinatesInvalid(self):
+        edid = Edid(data=bytearray(128))
+        with self.assertRaises(TypeError):
+            edid.setChromaticityCoordinatesRed(1, 0.5)
+        with self.assertRaises(ValueError):
+            edid.setChromaticityCoordinatesBlue(0.5, 1.5)
+
+    def testGetGamutCoverage(self):
+        edid = Edid(data=self.VALID_EDID_DATA[0])
+        self.assertAlmostEqual(edid.getGamutCoverage(), 1.0)
+        self.assertAlmostEqual(edid.getGamutCoverage('Rec.2020'), 0.5289, 4)
+
     def testGetChromaticityCoordinatesRed(self):
         chromaticityCoordinatesReds = [
             (0.640, 0.330), (0.0, 0.0), (0.655, 0.332), (0.573, 0.358)]
@@ -444,6 +650,54 @@ class EdidTests(unittest.TestCase):
                     standardTimingInformation[2],
                     correctStandardTimingInformation[2])
 
+    def testSetStandardTimingInformationInvalid(self):
+        edid = Edid(version=1.3)
+        with self.assertRaises(ValueError):
+            edid.setStandardTimingInformation(0, 640, 1.0, 60)
+        with self.assertRaises(ValueError):
+            edid.setStandardTimingInformation(0, 644, 4.0 / 3.0, 60)
+        with self.assertRaises(ValueError):
+            edid.setStandardTimingInformation(0, 640, 4.0 / 3.0, 124)
+        with self.assertRaises(ValueError):
+            edid.setStandardTimingInformation(0, 640, 2.0, 60)
+        with self.assertRaises(TypeError):
+            edid.setStandardTimingInformation(0, 640.0, 4.0 / 3.0, 60)
+        with self.assertRaises(IndexError):
+            edid.setStandardTimingInformation(8, 640, 4.0 / 3.0, 60)
+
+        edid = Edid(version=1.2)
+        with self.assertRaises(ValueError):
+            edid.setStandardTimingInformation(0, 640, 16.0 / 10.0, 60)
+
+    def testStandardTimingInformationAllCodes(self):
+        for version in [1.2, 1.3]:
+            edid = Edid(version=version)
+            ratios = [1.0 if version < 1.3 else 16.0 / 10.0,
+                      4.0 / 3.0, 5.0 / 4.0, 16.0 / 9.0]
+            for high in range(0, 256, 5):
+                for low in range(0, 256):
+                    edid[38] = high
+                    edid[39] = low
+                    if (high, low) == (1, 1):
+                        expected = (None, None, None)
+                    else:
+                        expected = (8 * (31 + high), ratios[low >> 6],
+                                    60 + (low & 0x3F))
+                    self.assertEqual(
+                        edid.getStandardTimingInformation(0), expected)
+
+                    if high > 0 and (high, low) != (1, 1):
+                        edid.setStandardTimingInformation(1, *expected)
+                        self.assertEqual(edid[40:42], bytearray([high, low]))
+
+    def testGetStandardTimingInformations(self):
+        for data in self.VALID_EDID_DATA:
+            edid = Edid(data=data)
+            self.assertEqual(
+                edid.getStandardTimingInformations(),
+                [edid.getStandardTimingInformation(index)
+                 for index in range(0, 8)])
+
     def testSetNumberOfExtensions(self):
         edid = Edid(version=1.3)
         edid.setNumberOfExtensions(2)
@@ -457,6 +711,127 @@ class EdidTests(unittest.TestCase):
                 edid.getNumberOfExtensions(),
                 numberOfExtensions[key])
 
+    def testGetDescriptorTags(self):
+        descriptorTags = [
+            [EdidDescriptor.DETAILED_TIMING, EdidDescriptor.DETAILED_TIMING,
+             EdidDescriptor.RANGE_LIMITS, EdidDescriptor.MONITOR_NAME],
+            [EdidDescriptor.MONITOR_NAME, 0x00, 0x00, 0x00],
+            [EdidDescriptor.DUMMY, EdidDescriptor.DUMMY,
+             EdidDescriptor.MONITOR_NAME, 0x00],
+            [EdidDescriptor.DETAILED_TIMING, EdidDescriptor.SERIAL_STRING,
+             EdidDescriptor.RANGE_LIMITS, EdidDescriptor.MONITOR_NAME],
+        ]
+        for key, data in enumerate(self.VALID_EDID_DATA):
+            edid = Edid(data=data)
+            self.assertEqual(edid.getDescriptorTags(), descriptorTags[key])
+
+    def testGetDescriptorIndexCached(self):
+        edid = Edid(data=self.VALID_EDID_DATA[0])
+        descriptorIndex = edid.getDescriptorIndex()
+        self.assertEqual(descriptorIndex[EdidDescriptor.DETAILED_TIMING],
+                         [0, 1])
+        edid[20] = 0
+        self.assertIs(edid.getDescriptorIndex(), descriptorIndex)
+        edid[90 + 3] = EdidDescriptor.SERIAL_STRING
+        self.assertIsNot(edid.getDescriptorIndex(), descriptorIndex)
+        self.assertEqual(
+            edid.getDescriptorIndex()[EdidDescriptor.SERIAL_STRING], [2])
+
+    def testGetDescriptorIndexBytearrayWrite(self):
+        edid = Edid(data=self.VALID_EDID_DATA[0])
+        descriptorIndex = edid.getDescriptorIndex()
+        bytearray.__setitem__(edid, 90 + 3, EdidDescriptor.SERIAL_STRING)
+        self.assertIsNot(edid.getDescriptorIndex(), descriptorIndex)
+        self.assertEqual(
+            edid.getDescriptorIndex()[EdidDescriptor.SERIAL_STRING], [2])
+
+    def testFindDescriptor(self):
+        edid = Edid(data=self.VALID_EDID_DATA[2])
+        descriptor = edid.findDescriptor(EdidDescriptor.MONITOR_NAME)
+        self.assertEqual(descriptor.offset, 90)
+        self.assertIsNone(edid.findDescriptor(EdidDescriptor.RANGE_LIMITS))
+
+    def testSetMonitorName(self):
+        edid = Edid(version=1.3)
+        edid.setMonitorName('TEST')
+        self.assertEqual(edid[108:113], bytearray.fromhex('00 00 00 FC 00'))
+        self.assertEqual(edid[113:126], b'TEST\x0a        ')
+        self.assertEqual(edid.getMonitorName(), 'TEST')
+
+    def testSetMonitorNameExisting(self):
+        edid = Edid(data=self.VALID_EDID_DATA[2])
+        edid.setMonitorName('ABCDEFGHIJKLMNOP')
+        self.assertEqual(edid[95:108], b'ABCDEFGHIJKLM')
+        self.assertEqual(edid[108:126], self.VALID_EDID_DATA[2][108:126])
+        self.assertEqual(edid.getMonitorName(), 'ABCDEFGHIJKLM')
+
+    def testSetMonitorNameDummy(self):
+        edid = Edid(version=1.3)
+        edid.getDescriptor(1).setDisplayDescriptorTag(EdidDescriptor.DUMMY)
+        for index in [2, 3]:
+            edid.getDescriptor(index).setDisplayDescriptorTag(
+                EdidDescriptor.SERIAL_STRING)
+        edid.setMonitorName('TEST')
+        self.assertEqual(edid.getDescriptorTags(), [
+            0x00, EdidDescriptor.MONITOR_NAME, EdidDescriptor.SERIAL_STRING,
+            EdidDescriptor.SERIAL_STRING])
+        self.assertEqual(edid.getMonitorName(), 'TEST')
+
+    def testSetMonitorNameNoFreeSlot(self):
+        edid = Edid(data=self.VALID_EDID_DATA[0])
+        edid.getDescriptor(3).setDisplayDescriptorTag(
+            EdidDescriptor.SERIAL_STRING)
+        data = bytes(edid)
+        with self.assertRaises(ValueError):
+            edid.setMonitorName('TEST')
+        self.assertEqual(edid, data)
+
+        # manufacturer specified data in a descriptor with tag 0x00
+        edid = Edid(version=1.3)
+        for index in range(0, 4):
+            edid.getDescriptor(index).setDisplayDescriptorTag(
+                EdidDescriptor.SERIAL_STRING)
+        edid.getDescriptor(2).setDisplayDescriptorTag(0x00)
+        edid[90 + 5] = 0x42
+        with self.assertRaises(ValueError):
+            edid.setMonitorName('TEST')
+
+    def testGetMonitorName(self):
+        monitorNames = ['SAMSUNG', 'flipthatbit01', 'iMac', 'MotoAttach']
+        for key, data in enumerate(self.VALID_EDID_DATA):
+            edid = Edid(data=data)
+            self.assertEqual(edid.getMonitorName(), monitorNames[key])
+
+        self.assertIsNone(Edid(version=1.3).getMonitorName())
+
+    def testGetSerialString(self):
+        serialStrings = [None, None, None, '000001']
+        for key, data in enumerate(self.VALID_EDID_DATA):
+            edid = Edid(data=data)
+            self.assertEqual(edid.getSerialString(), serialStrings[key])
+
+    def testGetRangeLimits(self):
+        rangeLimits = [(23, 61, 26, 76, 230), None,
+                       None, (50, 75, 30, 85, 150)]
+        for key, data in enumerate(self.VALID_EDID_DATA):
+            edid = Edid(data=data)
+            self.assertEqual(edid.getRangeLimits(), rangeLimits[key])
+
+    def testGetRangeLimitsOffsets(self):
+        edid = Edid(data=self.VALID_EDID_DATA[0])
+        edid[90 + 4] = 0x0F
+        self.assertEqual(edid.getRangeLimits(), (278, 316, 281, 331, 230))
+
+    def testGetFields(self):
+        for data in self.VALID_EDID_DATA:
+            edid = Edid(data=data)
+            fields = edid.getFields()
+            self.assertEqual(list(fields), list(Edid.FIELDS))
+            self.assertEqual(fields['manufacturerID'],
+                             edid.getManufacturerID())
+            self.assertEqual(fields['chromaticityCoordinatesWhite'],
+                             edid.getChromaticityCoordinatesWhite())
+
 
 class EdidDescriptorTests(unittest.TestCase):
     OFFSET = 10
@@ -541,3 +916,1707 @@ class EdidDescriptorTests(unittest.TestCase):
         self.assertEqual(
             self.edidDescriptor.getHeader(),
             bytearray.fromhex('01 02'))
+
+    def testGetItemInvalidKey(self):
+        with self.assertRaises(TypeError):
+            self.edidDescriptor['a']
+
+    def testGetItemSliceKeyIsView(self):
+        view = self.edidDescriptor[1:3]
+        self.assertIsInstance(view, memoryview)
+        self.parent[self.OFFSET + 1] = 42
+        self.assertEqual(view[0], 42)
+
+    def testSetItemIntKeyOutOfRange(self):
+        with self.assertRaises(IndexError):
+            self.edidDescriptor[self.SIZE] = 0
+
+    def testSetItemSliceKey(self):
+        self.edidDescriptor[2:4] = bytearray.fromhex('AA BB')
+        self.assertEqual(
+            self.parent[self.OFFSET + 2:self.OFFSET + 4],
+            bytearray.fromhex('AA BB'))
+
+    def testLen(self):
+        self.assertEqual(len(self.edidDescriptor), self.SIZE)
+
+    def testGetView(self):
+        view = self.edidDescriptor.getView()
+        self.assertEqual(len(view), self.SIZE)
+        view[0] = 99
+        self.assertEqual(self.parent[self.OFFSET], 99)
+
+    def testGetBytes(self):
+        self.assertEqual(
+            self.edidDescriptor.getBytes(),
+            bytes(self.parent[self.OFFSET:self.OFFSET + self.SIZE]))
+
+    def testRelease(self):
+        with EdidDescriptor(self.parent, self.OFFSET) as edidDescriptor:
+            self.assertEqual(edidDescriptor[0], self.OFFSET)
+        self.edidDescriptor.release()
+        self.parent.append(0)
+        self.assertEqual(len(self.parent), self.OFFSET + self.SIZE + 6)
+
+    def testSetItemInvalidatesDescriptorIndex(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        self.assertIsNone(edid.findDescriptor(EdidDescriptor.SERIAL_STRING))
+        edid.getDescriptor(2)[3] = EdidDescriptor.SERIAL_STRING
+        self.assertEqual(
+            edid.findDescriptor(EdidDescriptor.SERIAL_STRING).offset, 90)
+
+    def testSetItemSliceKeyParentEdid(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        descriptor = edid.getDescriptor(1)
+        descriptor[-2:] = bytearray.fromhex('AA BB')
+        self.assertEqual(edid[88:90], bytearray.fromhex('AA BB'))
+        with self.assertRaises(ValueError):
+            descriptor[0:2] = bytearray(3)
+        self.assertEqual(len(edid), 256)
+
+    def testGetTag(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[3])
+        self.assertTrue(edid.getDescriptor(0).isDetailedTiming())
+        self.assertEqual(edid.getDescriptor(0).getTag(),
+                         EdidDescriptor.DETAILED_TIMING)
+        self.assertFalse(edid.getDescriptor(1).isDetailedTiming())
+        self.assertEqual(edid.getDescriptor(1).getTag(),
+                         EdidDescriptor.SERIAL_STRING)
+
+    def testSetDisplayDescriptorTag(self):
+        self.edidDescriptor.setDisplayDescriptorTag(0xFE)
+        self.assertEqual(self.edidDescriptor[0:5],
+                         bytearray.fromhex('00 00 00 FE 00'))
+        with self.assertRaises(ValueError):
+            self.edidDescriptor.setDisplayDescriptorTag(0x100)
+
+    def testText(self):
+        self.edidDescriptor.setText('HELLO')
+        self.assertEqual(self.edidDescriptor[5:], b'HELLO\x0a       ')
+        self.assertEqual(self.edidDescriptor.getText(), 'HELLO')
+
+    def testGetDescriptors(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        descriptors = edid.getDescriptors()
+        self.assertEqual(len(descriptors), 4)
+        for index, offset in enumerate(Edid.DESCRIPTOR_OFFSETS):
+            self.assertEqual(descriptors[index].getBytes(),
+                             bytes(edid[offset:offset + self.SIZE]))
+            self.assertEqual(edid.getDescriptor(index).offset, offset)
+
+    def testGetDetailedTiming(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        with edid.getDescriptor(0) as descriptor:
+            self.assertEqual(descriptor.getDetailedTiming(), EdidTiming(
+                148500000, 1920, 280, 88, 44, 1080, 45, 4, 5, False, True,
+                True))
+            self.assertEqual(descriptor.getImageSize(), (160, 90))
+        with edid.getDescriptor(1) as descriptor:
+            timing = descriptor.getDetailedTiming()
+            self.assertEqual(timing.getMode(), (1360, 768, 60))
+            self.assertEqual(timing.getMode(),
+                             descriptor.getDetailedTimingMode())
+
+    def testSetDetailedTiming(self):
+        for data in EdidTests.VALID_EDID_DATA:
+            edid = Edid(data=data)
+            for descriptor in edid.getDescriptors():
+                with descriptor:
+                    if not descriptor.isDetailedTiming():
+                        continue
+                    raw = descriptor.getBytes()
+                    descriptor.setDetailedTiming(
+                        descriptor.getDetailedTiming(),
+                        *descriptor.getImageSize())
+                    self.assertEqual(descriptor.getBytes(), raw)
+
+    def testSetDetailedTimingInvalid(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        timing = EdidTimingGenerator.getCvtTiming(1920, 1080, 60)
+        with edid.getDescriptor(0) as descriptor:
+            with self.assertRaises(TypeError):
+                descriptor.setDetailedTiming(tuple(timing))
+            with self.assertRaises(ValueError):
+                descriptor.setDetailedTiming(
+                    timing._replace(pixelClock=700000000))
+            with self.assertRaises(ValueError):
+                descriptor.setDetailedTiming(
+                    timing._replace(verticalSyncOffset=64))
+            with self.assertRaises(ValueError):
+                descriptor.setDetailedTiming(timing, 4096, 0)
+
+
+class EdidTimingGeneratorTests(unittest.TestCase):
+
+    def assertModeline(self, timing, modeline):
+        # pixel clock in MHz and horizontal and vertical positions as in an
+        # X11 modeline
+        self.assertEqual(round(timing.pixelClock / 1000000.0, 2), modeline[0])
+        self.assertEqual((
+            timing.horizontalActive,
+            timing.horizontalActive + timing.horizontalSyncOffset,
+            timing.horizontalActive + timing.horizontalSyncOffset +
+            timing.horizontalSyncWidth,
+            timing.getHorizontalTotal(),
+            timing.verticalActive,
+            timing.verticalActive + timing.verticalSyncOffset,
+            timing.verticalActive + timing.verticalSyncOffset +
+            timing.verticalSyncWidth,
+            timing.getVerticalTotal()), modeline[1:])
+
+    def testCvt(self):
+        self.assertModeline(
+            EdidTimingGenerator.getCvtTiming(1920, 1080, 60),
+            (173.0, 1920, 2048, 2248, 2576, 1080, 1083, 1088, 1120))
+        self.assertModeline(
+            EdidTimingGenerator.getCvtTiming(1024, 768, 60),
+            (63.5, 1024, 1072, 1176, 1328, 768, 771, 775, 798))
+        self.assertModeline(
+            EdidTimingGenerator.getCvtTiming(1280, 1024, 75),
+            (138.75, 1280, 1368, 1504, 1728, 1024, 1027, 1034, 1072))
+
+        timing = EdidTimingGenerator.getCvtTiming(1920, 1080, 60)
+        self.assertFalse(timing.horizontalSyncPositive)
+        self.assertTrue(timing.verticalSyncPositive)
+
+    def testCvtReducedBlanking(self):
+        timing = EdidTimingGenerator.getCvtReducedBlankingTiming(
+            1920, 1080, 60)
+        self.assertModeline(
+            timing, (138.5, 1920, 1968, 2000, 2080, 1080, 1083, 1088, 1111))
+        self.assertTrue(timing.horizontalSyncPositive)
+        self.assertFalse(timing.verticalSyncPositive)
+
+    def testGtf(self):
+        self.assertModeline(
+            EdidTimingGenerator.getGtfTiming(1920, 1080, 60),
+            (172.8, 1920, 2040, 2248, 2576, 1080, 1081, 1084, 1118))
+
+    def testInvalid(self):
+        with self.assertRaises(TypeError):
+            EdidTimingGenerator.getCvtTiming(1920.0, 1080, 60)
+        with self.assertRaises(ValueError):
+            EdidTimingGenerator.getGtfTiming(1920, 1080, 0)
+
+    def testMemoized(self):
+        timing = EdidTimingGenerator.getCvtTiming(3840, 2160, 30)
+        self.assertIs(EdidTimingGenerator.getCvtTiming(3840, 2160, 30),
+                      timing)
+        self.assertGreater(
+            EdidTimingGenerator.getCvtTiming.cache_info().hits, 0)
+
+    def testTiming(self):
+        timing = EdidTimingGenerator.getCvtReducedBlankingTiming(
+            2560, 1440, 60)
+        self.assertAlmostEqual(timing.getRefreshRate(), 60, 1)
+        self.assertAlmostEqual(timing.getHorizontalFrequency(), 88787, 0)
+        self.assertEqual(timing.getMode(), (2560, 1440, 60))
+
+    def testSetDetailedTiming(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[3])
+        timing = EdidTimingGenerator.getCvtReducedBlankingTiming(
+            2560, 1440, 60)
+        edid.setDetailedTiming(1, timing)
+
+        self.assertEqual(edid.getDescriptorTags()[1],
+                         EdidDescriptor.DETAILED_TIMING)
+        self.assertEqual(edid.getDetailedTimings()[1], timing)
+        with edid.getDescriptor(1) as descriptor:
+            self.assertEqual(descriptor.getImageSize(),
+                             (edid[21] * 10, edid[22] * 10))
+
+        # standard timings take the mode of a generated timing
+        timing = EdidTimingGenerator.getCvtTiming(1920, 1080, 60)
+        edid.setStandardTimingInformation(
+            0, timing.horizontalActive, 16.0 / 9.0,
+            int(round(timing.getRefreshRate())))
+        self.assertEqual(edid.getStandardTimingInformation(0),
+                         (1920, 16.0 / 9.0, 60))
+
+
+class EdidBatchTests(unittest.TestCase):
+    GETTERS = [
+        ('getManufacturerIDs', 'getManufacturerID'),
+        ('getManufacturerProductCodes', 'getManufacturerProductCode'),
+        ('getSerialNumbers', 'getSerialNumber'),
+        ('getWeekOfManufactures', 'getWeekOfManufacture'),
+        ('getYearOfManufactures', 'getYearOfManufacture'),
+        ('getEdidVersions', 'getEdidVersion'),
+        ('getEdidRevisions', 'getEdidRevision'),
+        ('getVersions', 'getVersion'),
+        ('getVideoInputParametersBitmaps', 'getVideoInputParametersBitmap'),
+        ('getMaximumHorizontalImageSizes', 'getMaximumHorizontalImageSize'),
+        ('getMaximumVerticalImageSizes', 'getMaximumVerticalImageSize'),
+        ('getDisplayGammas', 'getDisplayGamma'),
+        ('getSupportedFeaturesBitmaps', 'getSupportedFeaturesBitmap'),
+        ('getChromaticityCoordinatesReds', 'getChromaticityCoordinatesRed'),
+        ('getChromaticityCoordinatesGreens',
+         'getChromaticityCoordinatesGreen'),
+        ('getChromaticityCoordinatesBlues', 'getChromaticityCoordinatesBlue'),
+        ('getChromaticityCoordinatesWhites',
+         'getChromaticityCoordinatesWhite'),
+        ('getNumbersOfExtensions', 'getNumberOfExtensions'),
+    ]
+
+    def setUp(self):
+        self.edids = [Edid(data=data[0:128])
+                      for data in EdidTests.VALID_EDID_DATA]
+        self.edidBatch = EdidBatch(b''.join(self.edids))
+
+    def testLen(self):
+        self.assertEqual(len(self.edidBatch), len(self.edids))
+
+    def testInvalidLength(self):
+        with self.assertRaises(ValueError):
+            EdidBatch(bytearray(129))
+
+    def testEmpty(self):
+        edidBatch = EdidBatch(b'')
+        self.assertEqual(len(edidBatch), 0)
+        self.assertEqual(edidBatch.getSerialNumbers(), [])
+
+    def testGetItem(self):
+        for key, edid in enumerate(self.edids):
+            self.assertEqual(self.edidBatch[key], edid)
+        self.assertEqual(self.edidBatch[-1], self.edids[-1])
+
+    def testGetItemOutOfRange(self):
+        with self.assertRaises(IndexError):
+            self.edidBatch[len(self.edids)]
+
+    def testFindInvalidChecksums(self):
+        self.assertEqual(self.edidBatch.findInvalidChecksums(), 0)
+        data = bytearray(b''.join(self.edids))
+        data[128 * 2] = 1
+        self.assertEqual(EdidBatch(data).findInvalidChecksums(), 1 << 2)
+
+    def testGettersMatchEdid(self):
+        for batchGetter, edidGetter in self.GETTERS:
+            self.assertEqual(
+                getattr(self.edidBatch, batchGetter)(),
+                [getattr(edid, edidGetter)() for edid in self.edids],
+                batchGetter)
+
+    def testGetChromaticityArrays(self):
+        arrays = self.edidBatch.getChromaticityArrays()
+        self.assertEqual(list(arrays), ['Red', 'Green', 'Blue', 'White'])
+        self.assertIsInstance(arrays['Red'][0], array.array)
+        self.assertEqual(list(zip(*arrays['Blue'])), [
+            edid.getChromaticityCoordinatesBlue() for edid in self.edids])
+
+    def testGetGamutAreas(self):
+        for area, edid in zip(self.edidBatch.getGamutAreas(), self.edids):
+            self.assertAlmostEqual(area, EdidGamut.getArea((
+                edid.getChromaticityCoordinatesRed(),
+                edid.getChromaticityCoordinatesGreen(),
+                edid.getChromaticityCoordinatesBlue())))
+
+    def testGetGamutCoverages(self):
+        for gamut in EdidGamut.GAMUTS:
+            for coverage, edid in zip(
+                    self.edidBatch.getGamutCoverages(gamut), self.edids):
+                self.assertAlmostEqual(coverage, edid.getGamutCoverage(gamut))
+
+
+class EdidGamutTests(unittest.TestCase):
+
+    def testGetArea(self):
+        self.assertAlmostEqual(EdidGamut.getArea('sRGB'), 0.11205)
+        self.assertAlmostEqual(EdidGamut.getArea('Rec.2020'), 0.2118665)
+        self.assertAlmostEqual(EdidGamut.getArea(
+            ((0.0, 0.0), (0.0, 1.0), (1.0, 0.0))), 0.5)
+        self.assertEqual(EdidGamut.getArea(((0.0, 0.0),) * 3), 0.0)
+
+    def testGetOverlapArea(self):
+        self.assertAlmostEqual(
+            EdidGamut.getOverlapArea('sRGB', 'Rec.2020'), 0.11205)
+        self.assertAlmostEqual(
+            EdidGamut.getOverlapArea('Rec.2020', 'sRGB'), 0.11205)
+        # clockwise and counter-clockwise unit triangles
+        self.assertAlmostEqual(EdidGamut.getOverlapArea(
+            ((0.0, 0.0), (1.0, 0.0), (0.0, 1.0)),
+            ((1.0, 1.0), (1.0, 0.0), (0.0, 1.0))), 0.0)
+        self.assertAlmostEqual(EdidGamut.getOverlapArea(
+            ((0.0, 0.0), (1.0, 0.0), (0.0, 1.0)),
+            ((0.0, 0.0), (0.5, 0.0), (0.0, 0.5))), 0.125)
+        self.assertEqual(EdidGamut.getOverlapArea(
+            'sRGB', ((0.0, 0.0),) * 3), 0.0)
+
+    def testGetCoverage(self):
+        self.assertAlmostEqual(EdidGamut.getCoverage('sRGB', 'sRGB'), 1.0)
+        self.assertAlmostEqual(EdidGamut.getCoverage('DCI-P3', 'Rec.2020'),
+                               0.7173, 4)
+        self.assertAlmostEqual(EdidGamut.getCoverage('sRGB', 'DCI-P3'),
+                               0.7372, 4)
+
+    def testGetCoverages(self):
+        reds = (array.array('d', [0.64, 0.708]),
+                array.array('d', [0.33, 0.292]))
+        greens = (array.array('d', [0.3, 0.17]),
+                  array.array('d', [0.6, 0.797]))
+        blues = (array.array('d', [0.15, 0.131]),
+                 array.array('d', [0.06, 0.046]))
+        coverages = EdidGamut.getCoverages(reds, greens, blues, 'DCI-P3')
+        self.assertAlmostEqual(coverages[0], 0.7372, 4)
+        # the P3 red primary lies just outside Rec.2020
+        self.assertAlmostEqual(coverages[1], 0.9998, 4)
+
+
+class EdidCeaExtensionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        self.extension = self.edid.getExtension(0)
+
+    def testGetExtension(self):
+        self.assertIsInstance(self.extension, EdidCeaExtension)
+        self.assertEqual(self.extension.block, 1)
+        self.assertEqual(self.extension.getTag(), 0x02)
+        self.assertEqual(self.extension.getRevision(), 3)
+        self.assertIs(self.edid.getExtension(0), self.extension)
+
+    def testGetExtensionOutOfRange(self):
+        with self.assertRaises(IndexError):
+            self.edid.getExtension(1)
+
+    def testGetExtensions(self):
+        tags = [[0x02], [], [0x02, 0x70], [0x02]]
+        for key, data in enumerate(EdidTests.VALID_EDID_DATA):
+            edid = Edid(data=data)
+            self.assertEqual(
+                [extension.getTag() for extension in edid.getExtensions()],
+                tags[key])
+
+    def testUnknownExtension(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[2])
+        edid[256] = 0x50
+        extension = edid.getExtension(1)
+        self.assertIs(type(extension), EdidExtension)
+        self.assertEqual(extension.getBytes(), bytes(edid[256:384]))
+
+    def testHeader(self):
+        self.assertEqual(self.extension.getDetailedTimingOffset(), 0x27)
+        self.assertEqual(self.extension.getSupportBitmap(), 0xF0)
+        self.assertEqual(self.extension.getNumberOfNativeDetailedTimings(), 1)
+
+    def testIndexIsLazy(self):
+        self.assertIsNone(self.extension._index)
+        self.extension.getDataBlockTags()
+        index = self.extension._index
+        self.extension.getVideoDataBlock()
+        self.assertIs(self.extension._index, index)
+
+    def testGetDataBlockTags(self):
+        self.assertEqual(self.extension.getDataBlockTags(), [
+            (EdidCeaExtension.VIDEO, None),
+            (EdidCeaExtension.AUDIO, None),
+            (EdidCeaExtension.SPEAKER_ALLOCATION, None),
+            (EdidCeaExtension.EXTENDED, EdidCeaExtension.VIDEO_CAPABILITY),
+            (EdidCeaExtension.EXTENDED, EdidCeaExtension.COLORIMETRY),
+            (EdidCeaExtension.VENDOR_SPECIFIC, None),
+        ])
+
+    def testGetDataBlock(self):
+        self.assertEqual(
+            self.extension.getDataBlock(
+                EdidCeaExtension.EXTENDED, EdidCeaExtension.COLORIMETRY),
+            bytearray.fromhex('03 01'))
+        self.assertIsNone(self.extension.getDataBlock(
+            EdidCeaExtension.VESA_DISPLAY_TRANSFER_CHARACTERISTIC))
+
+    def testGetVideoDataBlock(self):
+        self.assertEqual(self.extension.getVideoDataBlock(), [
+            (16, True), (31, False), (4, False), (19, False), (5, False),
+            (20, False), (3, False), (18, False), (32, False), (33, False),
+            (34, False)])
+
+    def testGetAudioDataBlock(self):
+        self.assertEqual(self.extension.getAudioDataBlock(), [
+            (1, 2, [32000, 44100, 48000], [16, 20, 24])])
+
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[3])
+        self.assertEqual(edid.getExtension(0).getAudioDataBlock(), [
+            (1, 2, [32000, 44100, 48000, 96000, 192000], [16, 20, 24])])
+
+    def testGetSpeakerAllocationDataBlock(self):
+        self.assertEqual(self.extension.getSpeakerAllocationDataBlock(), 1)
+
+    def testGetVendorSpecificDataBlocks(self):
+        self.assertEqual(self.extension.getVendorSpecificDataBlocks(), [
+            (0x000C03, bytearray.fromhex('20 00 b8 2d'))])
+
+    def testGetHdrStaticMetadataDataBlock(self):
+        self.assertIsNone(self.extension.getHdrStaticMetadataDataBlock())
+
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        # replace the colorimetry block by a HDR static metadata block
+        edid[128 + 27:128 + 31] = bytearray.fromhex('e3 06 05 01')
+        extension = edid.getExtension(0)
+        self.assertEqual(
+            extension.getHdrStaticMetadataDataBlock(),
+            (0x05, 0x01, None, None, None))
+
+    def testWriteInvalidatesExtension(self):
+        self.edid[0] = 0x00
+        self.assertIs(self.edid.getExtension(0), self.extension)
+        self.edid[128 + 4] = 0x42
+        extension = self.edid.getExtension(0)
+        self.assertIsNot(extension, self.extension)
+        self.assertEqual(extension.getDataBlockTags()[0],
+                         (EdidCeaExtension.VIDEO, None))
+        self.assertEqual(len(extension.getVideoDataBlock()), 2)
+
+    def testCopy(self):
+        edid = copy.copy(self.edid)
+        self.assertEqual(edid, self.edid)
+        self.assertIsNot(edid.getExtension(0), self.extension)
+        self.assertIs(edid.getExtension(0).parent, edid)
+
+    def testNoReferenceCycle(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        extension = edid.getExtension(0)
+        reference = weakref.ref(edid)
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            del edid
+            self.assertIsNone(reference())
+        finally:
+            if enabled:
+                gc.enable()
+
+        with self.assertRaises(ReferenceError):
+            extension.getTag()
+
+
+class EdidDisplayIdExtensionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.edid = Edid(data=EdidTests.VALID_EDID_DATA[2])
+        self.extension = self.edid.getExtension(1)
+
+    def _setSection(self, version, dataBlocks):
+        section = b''.join(bytes((tag, 0, len(payload))) + payload
+                           for tag, payload in dataBlocks)
+        self.edid[256:384] = bytes((0x70, version, len(section), 0, 0)) + \
+            section + bytes(123 - len(section))
+        extension = self.edid.getExtension(1)
+        extension.calculateSectionChecksum()
+        self.edid.calculateChecksum(2)
+
+        return extension
+
+    def testCreate(self):
+        self.assertIsInstance(self.extension, EdidDisplayIdExtension)
+
+    def testHeader(self):
+        self.assertEqual(self.extension.getDisplayIdVersion(), (1, 3))
+        self.assertEqual(self.extension.getSectionLength(), 121)
+        self.assertEqual(self.extension.getProductType(), 3)
+
+    def testSectionChecksum(self):
+        self.assertTrue(self.extension.checkSectionChecksum())
+        self.edid[256 + 30] = 1
+        self.assertFalse(self.extension.checkSectionChecksum())
+        self.extension.calculateSectionChecksum()
+        self.assertTrue(self.extension.checkSectionChecksum())
+        self.assertEqual(self.edid[256 + 126], 0xC6)
+
+        self.edid[256 + 2] = 0x7B
+        self.assertFalse(self.extension.checkSectionChecksum())
+
+    def testDataBlockTags(self):
+        self.assertEqual(self.extension.getDataBlockTags(),
+                         [EdidDisplayIdExtension.TYPE_I_TIMING])
+        self.assertEqual(len(self.extension.getDataBlock(
+            EdidDisplayIdExtension.TYPE_I_TIMING)), 20)
+        self.assertIsNone(self.extension.getDataBlock(
+            EdidDisplayIdExtension.DISPLAY_PARAMETERS))
+
+    def testTypeITimings(self):
+        self.assertEqual(self.extension.getTimings(), [
+            (938250000, 5120, 160, 48, 32, 2880, 82, 3, 5, True, False)])
+        self.assertEqual(self.extension.getTimingModes(), [(5120, 2880, 60)])
+        self.assertIn((5120, 2880, 60), EdidModeSet.fromEdid(self.edid))
+
+    def testTypeVIITimings(self):
+        extension = self._setSection(0x20, [
+            (EdidDisplayIdExtension.TYPE_VII_TIMING, bytes.fromhex(
+                '01 23 08 80 FF 0E 9F 00 2F 80 1F 00 '
+                '6F 08 3D 00 02 00 04 00')),
+        ])
+        self.assertEqual(extension.getDisplayIdVersion(), (2, 0))
+        self.assertTrue(extension.checkSectionChecksum())
+        self.assertEqual(extension.getTimings(), [
+            (533250000, 3840, 160, 48, 32, 2160, 62, 3, 5, True, False)])
+        self.assertEqual(extension.getTimingModes(), [(3840, 2160, 60)])
+
+    def testTiledDisplayTopology(self):
+        self.assertIsNone(self.extension.getTiledDisplayTopology())
+
+        extension = self._setSection(0x12, [
+            (EdidDisplayIdExtension.TILED_DISPLAY_TOPOLOGY, bytes.fromhex(
+                '80 10 10 00 FF 09 3F 0B') + bytes(14)),
+        ])
+        self.assertEqual(extension.getTiledDisplayTopology(),
+                         (2, 1, 1, 0, 2560, 2880))
+
+    def testTiledDisplayTopology2(self):
+        extension = self._setSection(0x20, [
+            (EdidDisplayIdExtension.CONTAINER_ID, bytes(range(16))),
+            (EdidDisplayIdExtension.TILED_DISPLAY_TOPOLOGY_2, bytes.fromhex(
+                '80 10 10 00 FF 09 3F 0B') + bytes(14)),
+        ])
+        self.assertEqual(extension.getDataBlockTags(), [
+            EdidDisplayIdExtension.CONTAINER_ID,
+            EdidDisplayIdExtension.TILED_DISPLAY_TOPOLOGY_2])
+        self.assertEqual(extension.getTiledDisplayTopology(),
+                         (2, 1, 1, 0, 2560, 2880))
+
+    def testDisplayParameters(self):
+        self.assertIsNone(self.extension.getDisplayParameters())
+
+        extension = self._setSection(0x12, [
+            (EdidDisplayIdExtension.DISPLAY_PARAMETERS, bytes.fromhex(
+                '48 17 16 0D 00 14 40 0B 00 78 4E 77')),
+        ])
+        self.assertEqual(extension.getDisplayParameters(),
+                         (596.0, 335.0, 5120, 2880, 2.2))
+
+    def testDisplayParameters2(self):
+        extension = self._setSection(0x20, [
+            (EdidDisplayIdExtension.DISPLAY_PARAMETERS_2, bytes.fromhex(
+                '48 17 16 0D 00 14 40 0B 00') + bytes(19) + b'\x78'),
+        ])
+        self.assertEqual(extension.getDisplayParameters(),
+                         (596.0, 335.0, 5120, 2880, 2.2))
+
+        # image size in 1 mm steps
+        self.edid[256 + 5 + 1] = 0x80
+        self.edid[256 + 5 + 3 + 28] = 0xFF
+        self.assertEqual(self.edid.getExtension(1).getDisplayParameters(),
+                         (5960, 3350, 5120, 2880, None))
+
+
+class EdidReaderTests(unittest.TestCase):
+
+    def testRead(self):
+        data = b''.join(EdidTests.VALID_EDID_DATA)
+        for chunkSize in [1, 7, 128, 65536]:
+            edids = list(EdidReader(io.BytesIO(data), chunkSize=chunkSize))
+            self.assertEqual(edids, EdidTests.VALID_EDID_DATA)
+            for edid in edids:
+                self.assertIsInstance(edid, Edid)
+
+    def testReadFile(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'edids.bin')
+            with open(filename, 'wb') as f:
+                f.write(b''.join(EdidTests.VALID_EDID_DATA))
+
+            self.assertEqual(list(EdidReader(filename)),
+                             EdidTests.VALID_EDID_DATA)
+
+    def testInvalidChunkSize(self):
+        with self.assertRaises(ValueError):
+            EdidReader(io.BytesIO(), chunkSize=0)
+
+    def testResynchronise(self):
+        corrupt = bytearray(EdidTests.VALID_EDID_DATA[0])
+        corrupt[20] ^= 0xFF
+        data = b'garbage' + EdidTests.VALID_EDID_DATA[1] + \
+            corrupt + b'\x00\xff\xff' + EdidTests.VALID_EDID_DATA[2] + \
+            EdidTests.VALID_EDID_DATA[3][0:200]
+
+        for chunkSize in [3, 100, 65536]:
+            edidReader = EdidReader(io.BytesIO(data), chunkSize=chunkSize)
+            self.assertEqual(list(edidReader), [
+                EdidTests.VALID_EDID_DATA[1], EdidTests.VALID_EDID_DATA[2]])
+            self.assertEqual(
+                edidReader.numberOfSkippedBytes,
+                len(data) - len(EdidTests.VALID_EDID_DATA[1]) -
+                len(EdidTests.VALID_EDID_DATA[2]))
+
+    def testTruncatedRecord(self):
+        # base block announcing an extension that is missing from the dump
+        data = EdidTests.VALID_EDID_DATA[0][0:128] + \
+            EdidTests.VALID_EDID_DATA[1] + EdidTests.VALID_EDID_DATA[3]
+
+        for checkChecksums in [True, False]:
+            for chunkSize in [3, 100, 65536]:
+                edidReader = EdidReader(io.BytesIO(data), chunkSize=chunkSize,
+                                        checkChecksums=checkChecksums)
+                self.assertEqual(list(edidReader), [
+                    EdidTests.VALID_EDID_DATA[1],
+                    EdidTests.VALID_EDID_DATA[3]])
+                self.assertEqual(edidReader.numberOfSkippedBytes, 128)
+
+    def testWithoutChecksums(self):
+        corrupt = bytearray(EdidTests.VALID_EDID_DATA[1])
+        corrupt[20] ^= 0xFF
+        edidReader = EdidReader(io.BytesIO(corrupt), checkChecksums=False)
+        self.assertEqual(list(edidReader), [corrupt])
+
+
+class EdidCorpusTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'corpus.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testWriteAndRead(self):
+        count = EdidCorpus.write(
+            self.filename,
+            [Edid(data=data) for data in EdidTests.VALID_EDID_DATA])
+        self.assertEqual(count, len(EdidTests.VALID_EDID_DATA))
+
+        with EdidCorpus(self.filename) as edidCorpus:
+            self.assertEqual(len(edidCorpus), count)
+            for key, data in enumerate(EdidTests.VALID_EDID_DATA):
+                self.assertIsInstance(edidCorpus[key], Edid)
+                self.assertEqual(edidCorpus[key], data)
+            self.assertEqual(edidCorpus[-1], EdidTests.VALID_EDID_DATA[-1])
+            self.assertEqual(list(edidCorpus), EdidTests.VALID_EDID_DATA)
+
+    def testGetRaw(self):
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA)
+        edidCorpus = EdidCorpus(self.filename)
+        raw = edidCorpus.getRaw(2)
+        self.assertIsInstance(raw, memoryview)
+        self.assertTrue(raw.readonly)
+        self.assertEqual(raw, EdidTests.VALID_EDID_DATA[2])
+        raw.release()
+        edidCorpus.close()
+
+    def testCloseWithViews(self):
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA)
+        with EdidCorpus(self.filename) as edidCorpus:
+            raw = edidCorpus.getRaw(1)
+        self.assertTrue(edidCorpus.closed)
+        self.assertEqual(raw, EdidTests.VALID_EDID_DATA[1])
+        raw.release()
+        with self.assertRaises(ValueError):
+            edidCorpus.getRaw(0)
+
+    def testCloseTwice(self):
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA)
+        with EdidCorpus(self.filename) as edidCorpus:
+            edidCorpus.close()
+        edidCorpus.close()
+        self.assertTrue(edidCorpus.closed)
+
+    def testGetItemOutOfRange(self):
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA)
+        with EdidCorpus(self.filename) as edidCorpus:
+            with self.assertRaises(IndexError):
+                edidCorpus[len(EdidTests.VALID_EDID_DATA)]
+
+    def testEmpty(self):
+        self.assertEqual(EdidCorpus.write(self.filename, []), 0)
+        with EdidCorpus(self.filename) as edidCorpus:
+            self.assertEqual(len(edidCorpus), 0)
+
+    def testReadableByEdidReader(self):
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA)
+        self.assertEqual(list(EdidReader(self.filename)),
+                         EdidTests.VALID_EDID_DATA)
+
+    def testInvalidIndex(self):
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA)
+        with open(self.filename + EdidCorpus.INDEX_SUFFIX, 'r+b') as f:
+            f.write(b'NOTINDEX')
+        with self.assertRaises(ValueError):
+            EdidCorpus(self.filename)
+
+    def testStaleIndex(self):
+        # the state between replacing the data file and the index
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA)
+        with open(self.filename + EdidCorpus.INDEX_SUFFIX, 'rb') as f:
+            index = f.read()
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA[::-1])
+        with open(self.filename + EdidCorpus.INDEX_SUFFIX, 'wb') as f:
+            f.write(index)
+
+        with self.assertRaises(ValueError):
+            EdidCorpus(self.filename)
+
+    def testRewrite(self):
+        EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA)
+        with EdidCorpus(self.filename) as edidCorpus:
+            EdidCorpus.write(self.filename, EdidTests.VALID_EDID_DATA[1:])
+            self.assertEqual(list(edidCorpus), EdidTests.VALID_EDID_DATA)
+
+        with EdidCorpus(self.filename) as edidCorpus:
+            self.assertEqual(list(edidCorpus), EdidTests.VALID_EDID_DATA[1:])
+
+
+class EdidCacheTests(unittest.TestCase):
+
+    def testGet(self):
+        edidCache = EdidCache()
+        fields = edidCache.get(EdidTests.VALID_EDID_DATA[0])
+        self.assertEqual(
+            fields, Edid(data=EdidTests.VALID_EDID_DATA[0]).getFields())
+        self.assertEqual((edidCache.hits, edidCache.misses), (0, 1))
+
+        self.assertIs(
+            edidCache.get(Edid(data=EdidTests.VALID_EDID_DATA[0])), fields)
+        self.assertEqual((edidCache.hits, edidCache.misses), (1, 1))
+        self.assertEqual(edidCache.getHitRate(), 0.5)
+
+    def testDecoder(self):
+        calls = []
+
+        def decoder(edid):
+            calls.append(edid)
+            return edid.getManufacturerID()
+
+        edidCache = EdidCache(decoder=decoder)
+        for i in range(0, 3):
+            for data in EdidTests.VALID_EDID_DATA:
+                edidCache.get(data)
+
+        self.assertEqual(edidCache.get(EdidTests.VALID_EDID_DATA[3]), 'MOT')
+        self.assertEqual(calls, EdidTests.VALID_EDID_DATA)
+        for edid in calls:
+            self.assertIsInstance(edid, Edid)
+
+    def testEviction(self):
+        edidCache = EdidCache(maxSize=2)
+        edidCache.get(EdidTests.VALID_EDID_DATA[0])
+        edidCache.get(EdidTests.VALID_EDID_DATA[1])
+        edidCache.get(EdidTests.VALID_EDID_DATA[0])
+        edidCache.get(EdidTests.VALID_EDID_DATA[2])
+
+        self.assertEqual(len(edidCache), 2)
+        self.assertEqual(edidCache.evictions, 1)
+        self.assertIn(EdidTests.VALID_EDID_DATA[0], edidCache)
+        self.assertNotIn(EdidTests.VALID_EDID_DATA[1], edidCache)
+        self.assertIn(EdidTests.VALID_EDID_DATA[2], edidCache)
+
+    def testClear(self):
+        edidCache = EdidCache()
+        edidCache.get(EdidTests.VALID_EDID_DATA[0])
+        edidCache.clear()
+        self.assertEqual(len(edidCache), 0)
+        self.assertEqual(edidCache.misses, 0)
+        self.assertEqual(edidCache.getHitRate(), 0.0)
+
+    def testInvalidMaxSize(self):
+        with self.assertRaises(TypeError):
+            EdidCache(maxSize=1.5)
+        with self.assertRaises(ValueError):
+            EdidCache(maxSize=0)
+
+
+class EdidRecordTests(unittest.TestCase):
+
+    def setUp(self):
+        self.edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        self.edidRecord = EdidRecord.fromEdid(self.edid)
+
+    def testFields(self):
+        for field, value in self.edid.getFields().items():
+            self.assertEqual(getattr(self.edidRecord, field), value)
+        self.assertEqual(self.edidRecord.getFields(), self.edid.getFields())
+
+    def testSlots(self):
+        self.assertFalse(hasattr(self.edidRecord, '__dict__'))
+
+    def testImmutable(self):
+        with self.assertRaises(AttributeError):
+            self.edidRecord.serialNumber = 1
+        with self.assertRaises(AttributeError):
+            del self.edidRecord.serialNumber
+        with self.assertRaises(AttributeError):
+            self.edidRecord.unknownField = 1
+
+    def testInvalidFields(self):
+        with self.assertRaises(TypeError):
+            EdidRecord(None)
+
+    def testEqualAndHash(self):
+        other = EdidRecord.fromEdid(Edid(data=EdidTests.VALID_EDID_DATA[0]))
+        self.assertEqual(self.edidRecord, other)
+        self.assertEqual(hash(self.edidRecord), hash(other))
+        self.assertNotEqual(
+            self.edidRecord,
+            EdidRecord.fromEdid(Edid(data=EdidTests.VALID_EDID_DATA[1])))
+
+    def testPickle(self):
+        self.assertEqual(
+            pickle.loads(pickle.dumps(self.edidRecord)), self.edidRecord)
+
+
+class EdidRecordTableTests(unittest.TestCase):
+
+    def setUp(self):
+        self.edids = [Edid(data=data) for data in EdidTests.VALID_EDID_DATA]
+        self.edidRecordTable = EdidRecordTable(self.edids)
+
+    def testLen(self):
+        self.assertEqual(len(self.edidRecordTable), len(self.edids))
+
+    def testGetItem(self):
+        for key, edid in enumerate(self.edids):
+            self.assertEqual(self.edidRecordTable[key],
+                             EdidRecord.fromEdid(edid))
+        self.assertEqual(list(self.edidRecordTable),
+                         [EdidRecord.fromEdid(edid) for edid in self.edids])
+
+    def testGetItemOutOfRange(self):
+        with self.assertRaises(IndexError):
+            self.edidRecordTable[len(self.edids)]
+
+    def testAppendRecord(self):
+        edidRecordTable = EdidRecordTable()
+        edidRecordTable.append(EdidRecord.fromEdid(self.edids[2]))
+        self.assertEqual(edidRecordTable[0],
+                         EdidRecord.fromEdid(self.edids[2]))
+
+    def testAppendInvalid(self):
+        with self.assertRaises(TypeError):
+            self.edidRecordTable.append({})
+
+    def testGetColumn(self):
+        for field in Edid.FIELDS:
+            self.assertEqual(
+                self.edidRecordTable.getColumn(field),
+                [edid.getFields()[field] for edid in self.edids])
+
+    def testColumnsAreArrays(self):
+        for column in self.edidRecordTable.columns.values():
+            self.assertIsInstance(column, array.array)
+
+
+class EdidValidatorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.edidValidator = EdidValidator()
+
+    def _getRules(self, data):
+        return [violation.rule
+                for violation in self.edidValidator.validate(data)]
+
+    def testValid(self):
+        for data in EdidTests.VALID_EDID_DATA:
+            self.assertEqual(self.edidValidator.validate(data), [])
+            self.assertTrue(self.edidValidator.isValid(data))
+
+    def testInvalidRules(self):
+        with self.assertRaises(ValueError):
+            EdidValidator(rules=['header', 'unknown'])
+
+    def testLength(self):
+        self.assertEqual(self.edidValidator.validate(b''), [
+            EdidViolation('length', None, None,
+                          'length is not a multiple of 128')])
+
+    def testViolations(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[0] = 1
+        data[16] = 60
+        data[129] ^= 0xFF
+
+        self.assertEqual(self.edidValidator.validate(data), [
+            EdidViolation('header', 0, 0, 'invalid header'),
+            EdidViolation('checksum', 0, 127, 'checksum mismatch'),
+            EdidViolation('checksum', 1, 255, 'checksum mismatch'),
+            EdidViolation('weekOfManufacture', 0, 16,
+                          'week of manufacture 60'),
+        ])
+
+    def testFailFast(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[0] = 1
+        data[16] = 60
+
+        edidValidator = EdidValidator(failFast=True)
+        self.assertEqual([violation.rule for violation in
+                          edidValidator.validate(data)], ['header'])
+        self.assertFalse(edidValidator.isValid(data))
+
+    def testRules(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[16] = 60
+        edidValidator = EdidValidator(rules=['header', 'checksum'])
+        self.assertEqual([violation.rule for violation in
+                          edidValidator.validate(data)], ['checksum'])
+
+    def testNumberOfExtensions(self):
+        data = EdidTests.VALID_EDID_DATA[0][0:128]
+        self.assertEqual(self._getRules(data), ['numberOfExtensions'])
+
+    def testManufacturerID(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[8] |= 0x80
+        self.assertIn('manufacturerID', self._getRules(data))
+
+    def testReservedBits(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[20] = 0x82
+        data[72 + 18 + 2] = 1
+        self.assertEqual(
+            [(violation.rule, violation.offset)
+             for violation in self.edidValidator.validate(data)
+             if violation.rule == 'reservedBits'],
+            [('reservedBits', 20), ('reservedBits', 90)])
+
+        # the range limit offsets are defined since 1.4
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[90 + 4] = 0x02
+        self.assertIn('reservedBits', self._getRules(data))
+        data[19] = 4
+        self.assertNotIn('reservedBits', self._getRules(data))
+
+    def testDescriptorOrder(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[54:72], data[108:126] = data[108:126], data[54:72]
+        self.assertEqual(
+            [violation.offset
+             for violation in self.edidValidator.validate(data)
+             if violation.rule == 'descriptorOrder'],
+            [54, 72, 108])
+
+    def testRequiredDescriptors(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[90 + 3] = EdidDescriptor.DUMMY
+        self.assertIn('requiredDescriptors', self._getRules(data))
+        data[19] = 4
+        self.assertNotIn('requiredDescriptors', self._getRules(data))
+
+    def testRangeLimits(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        # maximum vertical rate 50 Hz excludes both detailed timings
+        data[90 + 6] = 50
+        self.assertEqual(
+            [violation.offset
+             for violation in self.edidValidator.validate(data)
+             if violation.rule == 'rangeLimits'],
+            [54, 72])
+
+        data[90 + 5] = 51
+        self.assertIn('vertical rate range empty', [
+            violation.message
+            for violation in self.edidValidator.validate(data)])
+
+    def testStandardTimingAspectRatio(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[1])
+        data[39] = 0x00
+        self.assertIn('standardTimingAspectRatio', self._getRules(data))
+        data[19] = 3
+        self.assertNotIn('standardTimingAspectRatio', self._getRules(data))
+
+    def testCeaDetailedTimingOffset(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[130] = 2
+        violations = [violation
+                      for violation in self.edidValidator.validate(data)
+                      if violation.rule == 'ceaDetailedTimingOffset']
+        self.assertEqual([(violation.block, violation.offset)
+                          for violation in violations], [(1, 130)])
+
+    def testDisplayIdChecksum(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[2])
+        data[256 + 30] = 1
+        self.assertEqual(self._getRules(data),
+                         ['checksum', 'displayIdChecksum'])
+
+
+class MainTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _writeFile(self, filename, data):
+        path = os.path.join(self.directory.name, filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def _main(self, argv):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exitCode = main(argv)
+        return exitCode, [json.loads(line)
+                          for line in output.getvalue().splitlines()]
+
+    def testValidDirectory(self):
+        for key, data in enumerate(EdidTests.VALID_EDID_DATA):
+            self._writeFile('{}.bin'.format(key), data)
+
+        for jobs in ['1', '2']:
+            exitCode, results = self._main(
+                ['--jobs', jobs, '--chunk-size', '1', self.directory.name])
+            self.assertEqual(exitCode, 0)
+            self.assertEqual(
+                [os.path.basename(result['source']) for result in results],
+                ['0.bin', '1.bin', '2.bin', '3.bin'])
+            for result in results:
+                self.assertTrue(result['valid'])
+                self.assertEqual(result['errors'], [])
+
+    def testInvalid(self):
+        data = bytearray(EdidTests.VALID_EDID_DATA[0])
+        data[0] = 1
+        data[16] = 60
+        data[129] ^= 0xFF
+        path = self._writeFile('invalid.bin', data)
+        emptyPath = self._writeFile('empty.bin', b'')
+
+        exitCode, results = self._main(['--jobs', '1', path, emptyPath])
+        self.assertEqual(exitCode, 1)
+        self.assertEqual(results, [
+            {'source': path, 'valid': False, 'errors': [
+                'header', 'checksum:0', 'checksum:1', 'weekOfManufacture']},
+            {'source': emptyPath, 'valid': False, 'errors': ['length']}])
+
+    def testCorpus(self):
+        path = os.path.join(self.directory.name, 'corpus.bin')
+        EdidCorpus.write(path, EdidTests.VALID_EDID_DATA)
+
+        exitCode, results = self._main(['--jobs', '1', self.directory.name])
+        self.assertEqual(exitCode, 0)
+        self.assertEqual(
+            [result['source'] for result in results],
+            ['{}:{}'.format(path, index) for index in range(0, 4)])
+
+    def testImapBounded(self):
+        drawn = []
+
+        def getItems():
+            for item in range(0, 100):
+                drawn.append(item)
+                yield item
+
+        with multiprocessing.dummy.Pool(2) as pool:
+            results = _imapBounded(pool, abs, getItems(), 3, 4)
+            self.assertEqual(next(results), 0)
+            self.assertLessEqual(len(drawn), 4 * 3)
+            self.assertEqual(list(results), list(range(1, 100)))
+
+        with multiprocessing.dummy.Pool(2) as pool:
+            self.assertEqual(list(_imapBounded(pool, abs, [], 3, 4)), [])
+
+    def testInvalidJobs(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(['--jobs', '0', self.directory.name])
+
+
+class EdidModeSetTests(unittest.TestCase):
+
+    def testFromEdid(self):
+        modeSet = EdidModeSet.fromEdid(
+            Edid(data=EdidTests.VALID_EDID_DATA[0]))
+        self.assertEqual(set(modeSet), {
+            (640, 480, 60), (800, 600, 60), (1024, 768, 60),
+            (1280, 1024, 60), (1600, 1200, 60), (1920, 1080, 60),
+            (1360, 768, 60), (1280, 720, 60), (1280, 720, 50)})
+
+    def testGetDetailedTimingMode(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        descriptors = edid.getExtension(0).getDetailedTimingDescriptors()
+        self.assertEqual(
+            [(descriptor.getDetailedTimingMode(), descriptor.isInterlaced())
+             for descriptor in descriptors],
+            [((1280, 720, 60), False), ((1280, 720, 50), False),
+             ((1920, 1080, 60), True), ((1920, 1080, 50), True)])
+        for descriptor in descriptors:
+            self.assertEqual(descriptor.getDetailedTimingMode(),
+                             descriptor.getDetailedTiming().getMode())
+            descriptor.release()
+
+        edid = Edid(version=1.3)
+        with edid.getDescriptor(0) as descriptor:
+            descriptor[0:1] = b'\x01'
+            self.assertEqual(descriptor.getDetailedTimingMode(), (0, 0, None))
+
+    def testFromEdidEstablishedTimings(self):
+        edid = Edid(version=1.3)
+        edid.setEstablishedTimingBitmap(0xFFFFFF)
+        modeSet = EdidModeSet.fromEdid(edid)
+        self.assertEqual(set(modeSet),
+                         set(EdidModeSet.ESTABLISHED_TIMINGS) -
+                         {(1024, 768, 87)})
+
+    def testFromModes(self):
+        modeSet = EdidModeSet.fromModes([(640, 480, 60), (7680, 4320, 60)])
+        self.assertEqual(len(modeSet), 2)
+        self.assertIn((7680, 4320, 60), modeSet)
+        self.assertNotIn((800, 600, 60), modeSet)
+        self.assertEqual(EdidModeSet.fromModes([(7680, 4320, 60)]).bits,
+                         1 << EdidModeSet.getModeBit((7680, 4320, 60)))
+
+    def testModeBits(self):
+        self.assertEqual(EdidModeSet.getModeBit((720, 400, 70)), 0)
+        self.assertEqual(EdidModeSet.getModeBit((1920, 1080, 60)),
+                         EdidModeSet.MODES.index((1920, 1080, 60)))
+
+        # standard timing grid
+        for mode in [(256, 160, 60), (1920, 1080, 61), (2288, 2288, 123),
+                     (1000, 750, 90)]:
+            bit = EdidModeSet.getModeBit(mode)
+            self.assertGreaterEqual(bit, EdidModeSet.GRID_OFFSET)
+            self.assertLess(bit, EdidModeSet.OVERFLOW_OFFSET)
+            self.assertEqual(EdidModeSet.getMode(bit), mode)
+
+        edid = Edid(version=1.3)
+        edid.setStandardTimingInformation(0, 1920, 16.0 / 10.0, 75)
+        self.assertEqual(set(EdidModeSet.fromEdid(edid)), {(1920, 1200, 75)})
+        self.assertEqual(set(EdidModeSet.fromModes([(1920, 1200, 75)])),
+                         {(1920, 1200, 75)})
+
+    def testOverflowModes(self):
+        self.assertLess(EdidModeSet.getModeBit((2560, 1440, 60)),
+                        EdidModeSet.GRID_OFFSET)
+
+        mode = (2560, 1440, 59)
+        bit = EdidModeSet.getModeBit(mode)
+        self.assertGreaterEqual(bit, EdidModeSet.OVERFLOW_OFFSET)
+        self.assertEqual(EdidModeSet.getModeBit(mode), bit)
+        self.assertEqual(EdidModeSet.getMode(bit), mode)
+
+        class FullModeSet(EdidModeSet):
+            MAX_OVERFLOW_MODES = len(EdidModeSet._overflowModes)
+
+        self.assertIsNone(FullModeSet.getModeBit((2560, 1440, 58)))
+        self.assertEqual(FullModeSet.numberOfDroppedModes, 1)
+        modeSet = FullModeSet.fromModes([(640, 480, 60), (2560, 1440, 58),
+                                         mode])
+        self.assertEqual(set(modeSet), {(640, 480, 60), mode})
+        self.assertEqual(FullModeSet.numberOfDroppedModes, 2)
+
+    def testPickle(self):
+        modeSet = EdidModeSet.fromModes([(640, 480, 60), (1920, 1080, 61)])
+        self.assertEqual(modeSet.__reduce__(),
+                         (EdidModeSet, (modeSet.bits,)))
+        self.assertEqual(pickle.loads(pickle.dumps(modeSet)), modeSet)
+
+        modeSet = EdidModeSet.fromModes([(640, 480, 60), (2560, 1440, 59)])
+        self.assertEqual(modeSet.__reduce__()[1],
+                         ([(640, 480, 60), (2560, 1440, 59)],))
+        self.assertEqual(pickle.loads(pickle.dumps(modeSet)), modeSet)
+
+    def testIntersection(self):
+        modeSets = [EdidModeSet.fromEdid(Edid(data=data))
+                    for data in EdidTests.VALID_EDID_DATA]
+        self.assertEqual(
+            set(EdidModeSet.intersection(modeSets[0:2])), {(640, 480, 60)})
+        self.assertEqual(len(EdidModeSet.intersection(modeSets)), 0)
+        self.assertEqual(EdidModeSet.intersection([]), EdidModeSet())
+        self.assertEqual(modeSets[0] & modeSets[1],
+                         EdidModeSet.intersection(modeSets[0:2]))
+
+    def testUnion(self):
+        modeSets = [EdidModeSet.fromModes([(640, 480, 60)]),
+                    EdidModeSet.fromModes([(800, 600, 60)])]
+        self.assertEqual(set(EdidModeSet.union(modeSets)),
+                         {(640, 480, 60), (800, 600, 60)})
+        self.assertEqual(modeSets[0] | modeSets[1],
+                         EdidModeSet.union(modeSets))
+
+    def testGetBestCommonMode(self):
+        modeSets = [
+            EdidModeSet.fromModes([(1920, 1080, 60), (1920, 1080, 50),
+                                   (1280, 720, 60), (3840, 2160, 30)]),
+            EdidModeSet.fromModes([(1920, 1080, 60), (1920, 1080, 50),
+                                   (1280, 720, 60)]),
+            EdidModeSet.fromModes([(1920, 1080, 50), (1280, 720, 60)]),
+        ]
+        self.assertEqual(EdidModeSet.getBestCommonMode(modeSets[0:2]),
+                         (1920, 1080, 60))
+        self.assertEqual(EdidModeSet.getBestCommonMode(modeSets),
+                         (1920, 1080, 50))
+        self.assertIsNone(EdidModeSet().getBestMode())
+
+    def testInvalidBits(self):
+        with self.assertRaises(ValueError):
+            EdidModeSet(-1)
+
+
+class EdidWatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.loop = asyncio.new_event_loop()
+        self.edidWatcher = EdidWatcher(root=self.directory.name,
+                                       interval=0.001)
+
+    def tearDown(self):
+        self.loop.close()
+        self.directory.cleanup()
+
+    def _writeConnector(self, connector, data):
+        directory = os.path.join(self.directory.name, connector)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'edid'), 'wb') as f:
+            f.write(data)
+
+    def _poll(self):
+        return self.loop.run_until_complete(self.edidWatcher.poll())
+
+    def testPoll(self):
+        self._writeConnector('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[0])
+        self._writeConnector('card0-DP-1', b'')
+        os.makedirs(os.path.join(self.directory.name, 'version'))
+
+        events = self._poll()
+        self.assertEqual(events, [
+            ('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[0])])
+        self.assertIsInstance(events[0][1], Edid)
+
+        self.assertEqual(self._poll(), [])
+
+    def testChange(self):
+        self._writeConnector('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[0])
+        self._writeConnector('card0-DP-1', EdidTests.VALID_EDID_DATA[1])
+        self._poll()
+
+        self._writeConnector('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[3])
+        self._writeConnector('card0-DP-1', b'')
+        self.assertEqual(self._poll(), [
+            ('card0-DP-1', None),
+            ('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[3])])
+
+    def testChangeSameFingerprint(self):
+        self._writeConnector('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[0])
+        self._poll()
+
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        edid.setSerialNumber(edid.getSerialNumber() + 1)
+        edid.setWeekOfManufacture(edid.getWeekOfManufacture() - 1)
+        self.assertEqual(EdidWatcher.getFingerprint(edid),
+                         EdidWatcher.getFingerprint(
+                             EdidTests.VALID_EDID_DATA[0]))
+        self._writeConnector('card0-HDMI-A-1', edid)
+        self.assertEqual(self._poll(), [('card0-HDMI-A-1', edid)])
+        self.assertEqual(self._poll(), [])
+
+    def testConnectorRemoved(self):
+        self._writeConnector('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[0])
+        self._poll()
+
+        os.remove(os.path.join(self.directory.name, 'card0-HDMI-A-1', 'edid'))
+        self.assertEqual(self._poll(), [('card0-HDMI-A-1', None)])
+        self.assertEqual(self._poll(), [])
+
+    def testGetFingerprint(self):
+        self.assertEqual(
+            EdidWatcher.getFingerprint(EdidTests.VALID_EDID_DATA[2]),
+            (384, bytes([0xEA, 0x92, 0x90])))
+
+    def testWatch(self):
+        self._writeConnector('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[0])
+        events = []
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(asyncio.wait_for(
+                self.edidWatcher.watch(
+                    lambda connector, edid: events.append((connector, edid))),
+                0.05))
+
+        self.assertEqual(events, [
+            ('card0-HDMI-A-1', EdidTests.VALID_EDID_DATA[0])])
+
+
+class EdidGeneratorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.template = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _expected(self, serialNumber, yearOfManufacture=None):
+        edid = Edid(data=self.template)
+        edid.setSerialNumber(serialNumber)
+        if yearOfManufacture is not None:
+            edid.setYearOfManufacture(yearOfManufacture)
+        edid.calculateChecksum()
+        return edid
+
+    def testRender(self):
+        edidGenerator = EdidGenerator(self.template)
+        buffer = edidGenerator.render([(0,), (1,), (0xFFFFFFFF,)])
+        self.assertEqual(len(buffer), 3 * len(self.template))
+        for index, serialNumber in enumerate([0, 1, 0xFFFFFFFF]):
+            edid = Edid(data=buffer[index * 256:(index + 1) * 256])
+            self.assertEqual(edid, self._expected(serialNumber))
+            self.assertEqual(edid.checkChecksums(), [True, True])
+
+    def testRenderFields(self):
+        edidGenerator = EdidGenerator(
+            self.template, ('yearOfManufacture', 'serialNumber'))
+        buffer = edidGenerator.render([(2016, 42), (1990, 7)])
+        self.assertEqual(buffer[0:256], self._expected(42, 2016))
+        self.assertEqual(buffer[256:512], self._expected(7, 1990))
+        # byte 16 lies between the fields and must be kept
+        self.assertEqual(buffer[16], self.template[16])
+
+    def testRenderAllFields(self):
+        edidGenerator = EdidGenerator(self.template, (
+            'manufacturerProductCode', 'serialNumber',
+            'weekOfManufacture', 'yearOfManufacture'))
+        edid = Edid(data=edidGenerator.render([(1234, 5678, 12, 2020)]))
+        self.assertEqual(edid.getManufacturerProductCode(), 1234)
+        self.assertEqual(edid.getSerialNumber(), 5678)
+        self.assertEqual(edid.getWeekOfManufacture(), 12)
+        self.assertEqual(edid.getYearOfManufacture(), 2020)
+        self.assertTrue(edid.checkChecksum())
+
+    def testRenderInvalidValue(self):
+        edidGenerator = EdidGenerator(self.template, ('yearOfManufacture',))
+        with self.assertRaises(ValueError):
+            edidGenerator.render([(1989,)])
+
+    def testInvalidTemplate(self):
+        with self.assertRaises(ValueError):
+            EdidGenerator(bytearray(100))
+        with self.assertRaises(ValueError):
+            EdidGenerator(self.template, ('monitorName',))
+        with self.assertRaises(ValueError):
+            EdidGenerator(self.template, ())
+
+    def testGenerate(self):
+        edidGenerator = EdidGenerator(self.template)
+        buffers = list(edidGenerator.generate(
+            ((serialNumber,) for serialNumber in range(0, 5)), batchSize=2))
+        self.assertEqual([len(buffer) // 256 for buffer in buffers],
+                         [2, 2, 1])
+        self.assertEqual(buffers[2], self._expected(4))
+
+    def testWriteCorpus(self):
+        filename = os.path.join(self.directory.name, 'corpus.bin')
+        edidGenerator = EdidGenerator(self.template)
+        count = edidGenerator.writeCorpus(
+            filename, ((serialNumber,) for serialNumber in range(0, 10)),
+            batchSize=3)
+        self.assertEqual(count, 10)
+
+        with EdidCorpus(filename) as edidCorpus:
+            self.assertEqual(len(edidCorpus), 10)
+            for serialNumber in range(0, 10):
+                self.assertEqual(edidCorpus[serialNumber],
+                                 self._expected(serialNumber))
+
+
+class EdidDiffTests(unittest.TestCase):
+
+    def setUp(self):
+        self.edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+
+    def testDiffEqual(self):
+        self.assertEqual(self.edid.diff(Edid(data=self.edid)), {})
+
+    def testDiffInvalid(self):
+        with self.assertRaises(TypeError):
+            self.edid.diff(bytes(self.edid))
+
+    def testDiffFields(self):
+        other = Edid(data=self.edid)
+        other.setSerialNumber(42)
+        other.setStandardTimingInformation(7, 1920, 16.0 / 9.0, 60)
+        other.setDisplayGamma(1.0)
+        other.calculateChecksums()
+
+        differences = self.edid.diff(other)
+        self.assertEqual(list(differences), [
+            'serialNumber', 'displayGamma', 'standardTimingInformations'])
+        self.assertEqual(differences['serialNumber'],
+                         (self.edid.getSerialNumber(), 42))
+        self.assertEqual(differences['standardTimingInformations'][1][7],
+                         (1920, 16.0 / 9.0, 60))
+
+    def testDiffDescriptors(self):
+        other = Edid(data=self.edid)
+        other.setMonitorName('OTHER')
+
+        index = other.getDescriptorIndex()[EdidDescriptor.MONITOR_NAME][0]
+        self.assertEqual(self.edid.diff(other), {
+            'descriptor{}'.format(index): (
+                (EdidDescriptor.MONITOR_NAME, self.edid.getMonitorName()),
+                (EdidDescriptor.MONITOR_NAME, 'OTHER')),
+        })
+
+    def testDiffExtensions(self):
+        other = Edid(data=self.edid[0:128])
+        other.setNumberOfExtensions(0)
+
+        differences = self.edid.diff(other)
+        self.assertEqual(list(differences),
+                         ['numberOfExtensions', 'extension0'])
+        self.assertEqual(differences['extension0'],
+                         (self.edid.getExtension(0).getDiffValues(), None))
+        self.assertEqual(
+            differences['extension0'][0]['detailedTimingModes'],
+            [(1280, 720, 60), (1280, 720, 50), (1920, 1080, 60),
+             (1920, 1080, 50)])
+
+    def testDiffCeaExtension(self):
+        other = Edid(data=self.edid)
+        extension = other.getExtension(0)
+        tag, extendedTag, payload, length = extension._getIndex()[0]
+        self.assertEqual(tag, EdidCeaExtension.VIDEO)
+        other[payload] = 0x84
+
+        differences = self.edid.diff(other)
+        self.assertEqual(list(differences), ['extension0.videoDataBlock'])
+        self.assertEqual(differences['extension0.videoDataBlock'][1][0],
+                         (4, True))
+
+        # undecoded bytes
+        other = Edid(data=self.edid)
+        other[255] ^= 0xFF
+        self.assertEqual(list(self.edid.diff(other)), ['extension0.bytes'])
+
+    def testDiffDisplayIdExtension(self):
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[2])
+        other = Edid(data=edid)
+        # first type I timing: 5120x2880 -> 5120x2160
+        other[256 + 5 + 3 + 12] = 0x6F
+        other[256 + 5 + 3 + 13] = 0x08
+
+        differences = edid.diff(other)
+        self.assertEqual(list(differences), ['extension1.timings'])
+        self.assertEqual(differences['extension1.timings'][1][0][5], 2160)
+
+    def testDiffExtensionTypes(self):
+        other = Edid(data=self.edid)
+        other[128] = 0x50
+
+        differences = self.edid.diff(other)
+        self.assertEqual(list(differences), ['extension0'])
+        self.assertEqual(list(differences['extension0'][1]),
+                         ['tag', 'revision', 'bytes'])
+
+    def testDiffFleet(self):
+        changed = Edid(data=self.edid)
+        changed.setWeekOfManufacture(1)
+        previous = {
+            'card0-DP-1': bytes(self.edid),
+            'card0-DP-2': EdidTests.VALID_EDID_DATA[1],
+            'card0-HDMI-A-1': EdidTests.VALID_EDID_DATA[2],
+        }
+        current = {
+            'card0-DP-1': changed,
+            'card0-DP-2': Edid(data=EdidTests.VALID_EDID_DATA[1]),
+            'card0-DP-3': EdidTests.VALID_EDID_DATA[3],
+        }
+
+        self.assertEqual(Edid.diffFleet(previous, current), {
+            'added': ['card0-DP-3'],
+            'removed': ['card0-HDMI-A-1'],
+            'changed': {
+                'card0-DP-1': {
+                    'weekOfManufacture': (
+                        self.edid.getWeekOfManufacture(), 1),
+                },
+            },
+        })
+
+
+class EdidColumnWriterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.edids = [Edid(data=data) for data in EdidTests.VALID_EDID_DATA]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testAppendInvalid(self):
+        with self.assertRaises(TypeError):
+            EdidColumnWriter().append(EdidTests.VALID_EDID_DATA[0])
+
+    def testWrite(self):
+        edidColumnWriter = EdidColumnWriter(self.edids)
+        self.assertEqual(len(edidColumnWriter), 4)
+
+        filenames = edidColumnWriter.write(self.directory.name)
+        self.assertEqual(len(filenames), len(EdidRecordTable.COLUMNS) + 3)
+        for filename in filenames:
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read(6), b'\x93NUMPY')
+                f.seek(8)
+                headerSize = int.from_bytes(f.read(2), byteorder='little')
+                self.assertEqual((10 + headerSize) % 64, 0)
+
+    def testReadColumn(self):
+        EdidColumnWriter(self.edids).write(self.directory.name)
+
+        def readColumn(column):
+            return EdidColumnWriter.readColumn(
+                os.path.join(self.directory.name, column + '.npy'))
+
+        self.assertEqual(readColumn('manufacturerID'),
+                         ((4,), [b'SAM', b'FTB', b'APP', b'MOT']))
+
+        shape, values = readColumn('serialNumber')
+        self.assertEqual(shape, (4,))
+        self.assertEqual(values.tolist(),
+                         [edid.getSerialNumber() for edid in self.edids])
+
+        shape, values = readColumn('chromaticityCoordinatesRed')
+        self.assertEqual(shape, (4, 2))
+        self.assertEqual(
+            list(zip(values[0::2], values[1::2])),
+            [edid.getChromaticityCoordinatesRed() for edid in self.edids])
+
+        shape, values = readColumn('descriptorTags')
+        self.assertEqual(shape, (4, 4))
+        self.assertEqual(values.tolist(), [
+            tag for edid in self.edids for tag in edid.getDescriptorTags()])
+
+        self.assertEqual(readColumn('monitorName')[1], [
+            (edid.getMonitorName() or '').encode() for edid in self.edids])
+        self.assertEqual(readColumn('serialString')[1],
+                         [b'', b'', b'', b'000001'])
+
+    def testReadColumnInvalid(self):
+        filename = os.path.join(self.directory.name, 'invalid.npy')
+        with open(filename, 'wb') as f:
+            f.write(b'invalid')
+
+        with self.assertRaises(ValueError):
+            EdidColumnWriter.readColumn(filename)
+
+
+class EdidInstrumentationTests(unittest.TestCase):
+
+    def setUp(self):
+        EdidInstrumentation.reset()
+
+    def tearDown(self):
+        EdidInstrumentation.disable()
+        EdidInstrumentation.reset()
+
+    def testDisabled(self):
+        getSerialNumber = Edid.getSerialNumber
+        EdidInstrumentation.enable()
+        self.assertTrue(EdidInstrumentation.isEnabled())
+        self.assertIsNot(Edid.getSerialNumber, getSerialNumber)
+        EdidInstrumentation.disable()
+        self.assertFalse(EdidInstrumentation.isEnabled())
+        self.assertIs(Edid.getSerialNumber, getSerialNumber)
+
+        Edid(data=EdidTests.VALID_EDID_DATA[0]).getSerialNumber()
+        self.assertEqual(EdidInstrumentation.getSnapshot()['calls'], {})
+
+    def testCalls(self):
+        EdidInstrumentation.enable()
+        EdidInstrumentation.enable()
+        edid = Edid(data=EdidTests.VALID_EDID_DATA[0])
+        for _ in range(0, 3):
+            edid.getSerialNumber()
+        edid.setSerialNumber(1)
+        edid.calculateChecksums()
+        self.assertEqual(edid.getMonitorName(), 'SAMSUNG')
+
+        calls = EdidInstrumentation.getSnapshot()['calls']
+        self.assertEqual(calls['Edid.getSerialNumber']['count'], 3)
+        self.assertEqual(calls['Edid.setSerialNumber']['count'], 1)
+        self.assertEqual(calls['Edid.calculateChecksum']['count'], 2)
+        self.assertEqual(calls['EdidDescriptor.getText']['count'], 1)
+        self.assertGreaterEqual(
+            calls['Edid.calculateChecksums']['seconds'],
+            calls['Edid.calculateChecksum']['seconds'])
+
+    def testCaches(self):
+        edidCache = EdidCache(name='test')
+        edidCache.get(EdidTests.VALID_EDID_DATA[0])
+        edidCache.get(EdidTests.VALID_EDID_DATA[0])
+
+        self.assertEqual(EdidInstrumentation.getSnapshot()['caches']['test'], {
+            'entries': 1,
+            'maxSize': 4096,
+            'hits': 1,
+            'misses': 1,
+            'evictions': 0,
+            'hitRate': 0.5,
+        })
+
+    def testPrometheusText(self):
+        edidCache = EdidCache(name='test')
+        edidCache.get(EdidTests.VALID_EDID_DATA[0])
+        EdidInstrumentation.enable()
+        Edid(data=EdidTests.VALID_EDID_DATA[0]).getSerialNumber()
+
+        lines = EdidInstrumentation.getPrometheusText().splitlines()
+        self.assertIn('# TYPE edid_method_calls_total counter', lines)
+        self.assertIn(
+            'edid_method_calls_total{method="Edid.getSerialNumber"} 1',
+            lines)
+        self.assertIn('edid_cache_misses_total{cache="test"} 1', lines)
+        self.assertIn('edid_cache_hit_ratio{cache="test"} 0.0', lines)
+
+
+class EdidWriterTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.edids = [Edid(data=data) for data in EdidTests.VALID_EDID_DATA]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testInvalid(self):
+        with self.assertRaises(TypeError):
+            EdidWriter(batchSize=1.0)
+        with self.assertRaises(ValueError):
+            EdidWriter(jobs=0)
+
+    def testWriteCorpus(self):
+        filename = os.path.join(self.directory.name, 'corpus.bin')
+        edidWriter = EdidWriter(batchSize=3)
+        self.assertEqual(edidWriter.writeCorpus(filename, self.edids * 2), 8)
+        self.assertEqual(edidWriter.count, 8)
+        self.assertEqual(edidWriter.size,
+                         2 * sum(len(edid) for edid in self.edids))
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         ['corpus.bin', 'corpus.bin.idx'])
+
+        with EdidCorpus(filename) as edidCorpus:
+            self.assertEqual(list(edidCorpus), self.edids * 2)
+
+    def testWriteCorpusError(self):
+        filename = os.path.join(self.directory.name, 'corpus.bin')
+        with self.assertRaises(TypeError):
+            EdidWriter().writeCorpus(filename, [self.edids[0], None])
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def testWriteFiles(self):
+        edidWriter = EdidWriter(batchSize=3, jobs=2, fsync=False)
+        self.assertEqual(edidWriter.writeFiles(
+            self.directory.name, self.edids,
+            '{edid[8]:02X}/{index}/edid.bin'), 4)
+        self.assertEqual(edidWriter.size,
+                         sum(len(edid) for edid in self.edids))
+
+        for index, edid in enumerate(self.edids):
+            filename = os.path.join(self.directory.name, '{:02X}'.format(
+                edid[8]), str(index), 'edid.bin')
+            with open(filename, 'rb') as f:
+                self.assertEqual(f.read(), edid)
+
+    def testWriteFilesCallable(self):
+        EdidWriter().writeFiles(
+            self.directory.name, self.edids,
+            lambda index, edid: edid.getManufacturerID() + '.bin')
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         ['APP.bin', 'FTB.bin', 'MOT.bin', 'SAM.bin'])
+
+    def testThroughput(self):
+        edidWriter = EdidWriter()
+        self.assertEqual(edidWriter.getThroughput(), (0.0, 0.0))
+        edidWriter.writeFiles(self.directory.name, self.edids)
+        edidsPerSecond, bytesPerSecond = edidWriter.getThroughput()
+        self.assertGreater(edidsPerSecond, 0)
+        self.assertGreater(bytesPerSecond, edidsPerSecond)